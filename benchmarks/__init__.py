@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for the page-object layer and test harness
+
+Run from the project root, e.g.: python -m benchmarks.bench_auth_state
+"""
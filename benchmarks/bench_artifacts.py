@@ -0,0 +1,78 @@
+"""
+Benchmark: time a failing test spends on its artifacts, inline vs background writer
+
+Simulates N failures, each producing a screenshot, a DOM snapshot and a
+console log (synthetic bytes of realistic size, no browser needed). Inline
+compresses and writes in the test thread like page.screenshot(path=...) did;
+background hands the bytes to ArtifactWriter and only pays for submit().
+
+Usage: python -m benchmarks.bench_artifacts [--failures 50] [--workers 2]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from tests.pages.artifacts import ENCODERS, ArtifactWriter
+from tests.utils.action_timing import percentile
+
+
+def failure_artifacts(number: int):
+    """(name, bytes, kind) of one failure; every fifth failure repeats an earlier screenshot"""
+    screenshot = os.urandom(150_000) if number % 5 else b"same-error-page" * 10_000
+    dom = ("<div class='row'><span>item %d</span></div>" % number * 8_000).encode()
+    console = ("[error] Uncaught TypeError: cannot read properties of undefined\n" * 200).encode()
+    return [("page-0-screenshot", screenshot, "image"), ("page-0-dom.html", dom, "text"),
+            ("console.log", console, "text")]
+
+
+def inline(root: Path, failures: int):
+    latencies = []
+    for number in range(failures):
+        start = time.perf_counter()
+        for name, data, kind in failure_artifacts(number):
+            encoded, suffix = ENCODERS[kind](data)
+            path = root / f"test-{number}" / (name + suffix)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(encoded)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def background(root: Path, failures: int, workers: int):
+    writer = ArtifactWriter(root, budget_mb=1024, workers=workers)
+    latencies = []
+    artifacts = [failure_artifacts(number) for number in range(failures)]
+    for number, items in enumerate(artifacts):
+        start = time.perf_counter()
+        for name, data, kind in items:
+            writer.submit(f"test-{number}/{name}", data, kind)
+        latencies.append(time.perf_counter() - start)
+    flush_start = time.perf_counter()
+    writer.close()
+    return latencies, time.perf_counter() - flush_start, writer.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--failures", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as inline_dir, tempfile.TemporaryDirectory() as background_dir:
+        inline_latencies = inline(Path(inline_dir), args.failures)
+        background_latencies, drain, stats = background(Path(background_dir), args.failures, args.workers)
+
+    print(f"📊 {args.failures} failing tests, 3 artifacts each, {args.workers} writer thread(s)")
+    for label, latencies in (("inline", inline_latencies), ("background", background_latencies)):
+        print(f"  {label:<10}: test thread p50 {percentile(latencies, 50) * 1000:7.2f} ms, "
+              f"p95 {percentile(latencies, 95) * 1000:7.2f} ms, total {sum(latencies) * 1000:7.0f} ms")
+    print(f"  background drain after the last test: {drain * 1000:.0f} ms; "
+          f"{stats.raw_bytes / 1024 / 1024:.1f} MB captured -> {stats.written_bytes / 1024 / 1024:.1f} MB written, "
+          f"{stats.deduplicated} deduplicated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: N concurrent async login sessions vs N sequential sync tests
+
+Usage: python -m benchmarks.bench_async_pages [--sessions 20] [--slow-mo 0] [--headed]
+"""
+
+import argparse
+import asyncio
+import time
+
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright
+
+from practice_server import PracticeServer
+from tests.pages import AsyncPracticeLoginPage, PracticeLoginPage
+
+
+def run_sequential_sync(base_url, sessions, headless, slow_mo):
+    """What the suite does today: one test after the other"""
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=headless, slow_mo=slow_mo)
+        start = time.perf_counter()
+        for _ in range(sessions):
+            context = browser.new_context()
+            login_page = PracticeLoginPage(context.new_page())
+            login_page.base_url = base_url
+            login_page.navigate_to_login()
+            login_page.login_with_valid_credentials()
+            assert login_page.is_logged_in()
+            context.close()
+        elapsed = time.perf_counter() - start
+        browser.close()
+    return elapsed
+
+
+async def login_session(browser, base_url):
+    context = await browser.new_context()
+    login_page = AsyncPracticeLoginPage(await context.new_page())
+    login_page.base_url = base_url
+    await login_page.navigate_to_login()
+    await login_page.login_with_valid_credentials()
+    assert await login_page.is_logged_in()
+    await context.close()
+
+
+async def run_concurrent_async(base_url, sessions, headless, slow_mo):
+    """All sessions in one event loop, one context each"""
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless, slow_mo=slow_mo)
+        start = time.perf_counter()
+        await asyncio.gather(*(login_session(browser, base_url) for _ in range(sessions)))
+        elapsed = time.perf_counter() - start
+        await browser.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="Login sessions to run")
+    parser.add_argument("--slow-mo", type=int, default=0, help="slow_mo for both runs (ms)")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    with PracticeServer() as server:
+        sync_time = run_sequential_sync(server.url, args.sessions, not args.headed, args.slow_mo)
+        async_time = asyncio.run(run_concurrent_async(server.url, args.sessions, not args.headed, args.slow_mo))
+
+    print(f"📊 {args.sessions} login sessions against {server.url}")
+    print(f"  sequential sync : {sync_time:7.2f}s")
+    print(f"  concurrent async: {async_time:7.2f}s")
+    print(f"  speedup         : {sync_time / async_time:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: UI login per test vs cached storage_state
+
+Usage: python -m benchmarks.bench_auth_state [--tests 20] [--slow-mo 100] [--headed]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+from practice_server import PracticeServer
+from tests.pages.practice_pages import PracticeLoginPage
+from tests.utils.auth_state import AuthStateCache
+
+
+def run_ui_login(browser, base_url, tests):
+    """Every simulated test navigates to the form and logs in"""
+    start = time.perf_counter()
+    for _ in range(tests):
+        context = browser.new_context()
+        login_page = PracticeLoginPage(context.new_page())
+        login_page.base_url = base_url
+        login_page.navigate_to_login()
+        login_page.login_with_valid_credentials()
+        assert login_page.is_logged_in()
+        context.close()
+    return time.perf_counter() - start
+
+
+def run_cached_login(browser, base_url, tests, cache_dir):
+    """Log in once, then restore storage_state for every simulated test"""
+    def login(site, username, password, state_path):
+        context = browser.new_context()
+        login_page = PracticeLoginPage(context.new_page())
+        login_page.base_url = base_url
+        login_page.navigate_to_login()
+        login_page.login_with_credentials(username, password)
+        login_page.page.wait_for_url("**/logged-in-successfully/")
+        context.storage_state(path=state_path)
+        context.close()
+
+    cache = AuthStateCache(cache_dir, ttl=3600, login=login)
+    start = time.perf_counter()
+    for _ in range(tests):
+        context = browser.new_context(storage_state=str(cache.get("practice")))
+        login_page = PracticeLoginPage(context.new_page())
+        login_page.base_url = base_url
+        login_page.navigate_to_logged_in()
+        assert login_page.is_logged_in()
+        context.close()
+    return time.perf_counter() - start, cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tests", type=int, default=20, help="Simulated tests needing a logged-in user")
+    parser.add_argument("--slow-mo", type=int, default=100, help="slow_mo used by the suite (ms)")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    with PracticeServer() as server, sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=not args.headed, slow_mo=args.slow_mo)
+        ui_time = run_ui_login(browser, server.url, args.tests)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cached_time, cache = run_cached_login(browser, server.url, args.tests, Path(cache_dir))
+        browser.close()
+
+    print(f"📊 {args.tests} logged-in tests against {server.url} (slow_mo={args.slow_mo}ms)")
+    print(f"  UI login every test : {ui_time:7.2f}s ({ui_time / args.tests * 1000:.0f} ms/test)")
+    print(f"  cached storage_state: {cached_time:7.2f}s ({cached_time / args.tests * 1000:.0f} ms/test, "
+          f"{cache.logins} login, {cache.hits} hits)")
+    print(f"  speedup             : {ui_time / cached_time:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: import time of config / tests.pages and the cost of loading settings
+
+Runs `python -X importtime -c "import tests.pages"` in fresh interpreters
+(bytecode compiled first, so compilation isn't measured) and reports the
+median cumulative import time of `config` and `tests.pages`. --baseline REF
+measures the same on a git ref exported to a temporary directory, e.g. the
+commit before Config became lazy. Also times load_config() parsing .env and
+the environment vs loading the snapshot a parent process shares with workers,
+in fresh interpreters.
+
+Usage: python -m benchmarks.bench_config_import [--runs 15] [--baseline HEAD~1]
+"""
+
+import argparse
+import compileall
+import io
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+from config import PROJECT_DIR, SNAPSHOT_ENV, get_config
+
+MODULES = ("config", "tests.pages")
+
+
+def import_times(project_dir: Path, runs: int):
+    """{module: median cumulative import ms} over fresh interpreters"""
+    compileall.compile_dir(str(project_dir), quiet=1)
+    env = {**os.environ, "PYTHONPATH": str(project_dir)}
+    env.pop(SNAPSHOT_ENV, None)
+    samples = {module: [] for module in MODULES}
+    for _ in range(runs):
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import tests.pages"],
+                                cwd=project_dir, env=env, capture_output=True, text=True, check=True).stderr
+        for line in stderr.splitlines():
+            match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)$", line)
+            if match and match.group(2) in samples:
+                samples[match.group(2)].append(int(match.group(1)) / 1000)
+    return {module: statistics.median(values) for module, values in samples.items() if values}
+
+
+def export_ref(ref: str, directory: Path):
+    archive = subprocess.run(["git", "archive", "--format=tar", ref], capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+
+
+# First Config load in a fresh worker interpreter (import config included)
+LOAD_SCRIPT = """
+import sys, time
+from pathlib import Path
+start = time.perf_counter()
+import config
+config.load_config(env_file=Path(sys.argv[1]))
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def load_times(runs: int):
+    """Median ms for a fresh process to get its Config: parsing a .env + environment vs the shared snapshot"""
+    with tempfile.TemporaryDirectory() as directory:
+        env_file = Path(directory) / ".env"
+        env_file.write_text((PROJECT_DIR / ".env.example").read_text())
+        env = {key: value for key, value in os.environ.items() if key != SNAPSHOT_ENV}
+        medians = []
+        for worker_env in (env, {**env, SNAPSHOT_ENV: get_config().to_snapshot()}):
+            samples = [float(subprocess.run([sys.executable, "-c", LOAD_SCRIPT, str(env_file)], env=worker_env,
+                                            capture_output=True, text=True, check=True).stdout)
+                       for _ in range(runs)]
+            medians.append(statistics.median(samples))
+    return medians
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--baseline", help="git ref to compare against")
+    args = parser.parse_args()
+
+    results = {"current": import_times(Path.cwd(), args.runs)}
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as directory:
+            export_ref(args.baseline, Path(directory))
+            results[args.baseline] = import_times(Path(directory), args.runs)
+
+    print(f"📊 median cumulative import time over {args.runs} fresh interpreters")
+    for label, times in results.items():
+        print(f"  {label:<12}: " + ", ".join(f"{module} {ms:6.1f} ms" for module, ms in times.items()))
+    parsed, snapshot = load_times(args.runs)
+    print(f"  worker load : {parsed:.1f} ms parsing .env + environment, {snapshot:.1f} ms from the shared snapshot")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: login via per-field fill/click vs one fill_form() round-trip
+
+Runs the login flow against the local login server three ways - the old
+fill_field/fill_field/click_element path, fill_form() and fill_form() with
+real typing - and reports per-login latency. slow_mo is charged per driver
+call, so --slow-mo makes the round-trip difference obvious.
+
+Usage: python -m benchmarks.bench_fill_form [--logins 30] [--slow-mo 0] [--headed]
+"""
+
+import argparse
+import statistics
+import time
+
+from playwright.sync_api import sync_playwright
+
+from practice_server import PracticeServer
+from tests.pages import PracticeLoginPage
+from tests.utils.action_timing import percentile
+
+
+def per_field(login_page):
+    """What login_with_credentials did before fill_form()"""
+    login_page.fill_field(login_page.username_input, "student")
+    login_page.fill_field(login_page.password_input, "Password123")
+    login_page.click_element(login_page.login_button)
+
+
+def batched(login_page):
+    login_page.login_with_valid_credentials()
+
+
+def real_typing(login_page):
+    login_page.fill_form({login_page.username_input: "student", login_page.password_input: "Password123"},
+                         submit=login_page.login_button, real_typing=True)
+
+
+def measure(browser, base_url, login, logins):
+    """Latency of the login step only (navigation excluded)"""
+    context = browser.new_context()
+    login_page = PracticeLoginPage(context.new_page())
+    login_page.base_url = base_url
+    samples = []
+    for _ in range(logins):
+        context.clear_cookies()
+        login_page.navigate_to_login()
+        start = time.perf_counter()
+        login(login_page)
+        samples.append(time.perf_counter() - start)
+        assert login_page.is_logged_in()
+    context.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=30, help="Logins per approach")
+    parser.add_argument("--slow-mo", type=int, default=0, help="slow_mo for every run (ms)")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    with PracticeServer() as server, sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=not args.headed, slow_mo=args.slow_mo)
+        print(f"📊 {args.logins} logins each (slow_mo={args.slow_mo} ms)")
+        baseline = None
+        for label, login in (("per-field fill + click", per_field),
+                             ("fill_form", batched),
+                             ("fill_form real_typing", real_typing)):
+            samples = measure(browser, server.url, login, args.logins)
+            median = statistics.median(samples)
+            baseline = baseline or median
+            print(f"  {label:<24} median {median * 1000:8.1f} ms  p95 {percentile(samples, 95) * 1000:8.1f} ms"
+                  f"  ({baseline / median:.1f}x vs per-field)")
+        browser.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: how much of the suite test-impact selection runs per change
+
+Replays the last N commits as if each were a PR: diffs it against its parent,
+selects affected tests and compares test count and (where .test_durations.json
+has history) run time with the full suite. The map comes from the current
+tree, so older commits are an approximation.
+
+Usage: python -m benchmarks.bench_impact [--commits 20]
+"""
+
+import argparse
+import subprocess
+import time
+
+from config import config
+from tests.utils.impact import (
+    ImpactMap,
+    SymbolIndex,
+    build_static_map,
+    changes_from_diff,
+    git_changes,
+    select,
+)
+from tests.utils.sharding import load_durations
+
+# Used for tests without recorded durations
+DEFAULT_DURATION = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = SymbolIndex.build()
+    impact_map = ImpactMap.load(config.IMPACT_MAP_FILE)
+    impact_map.static = build_static_map(index)
+    build_seconds = time.perf_counter() - start
+
+    durations = load_durations(config.TEST_DURATIONS_FILE)
+    nodeids = sorted(set(impact_map.static) | set(impact_map.runtime))
+    full = sum(durations.get(nodeid, DEFAULT_DURATION) for nodeid in nodeids)
+
+    commits = subprocess.run(["git", "log", "--format=%h %s", f"-{args.commits}", "--no-merges"],
+                             capture_output=True, text=True, check=True).stdout.splitlines()
+    print(f"📊 {len(nodeids)} tests, {len(index.symbols)} symbols, map built in {build_seconds * 1000:.0f} ms")
+    print(f"{'commit':<9} {'tests':>9} {'time':>7}  subject")
+    fractions = []
+    for line in commits:
+        commit, _, subject = line.partition(" ")
+        try:
+            changes = changes_from_diff(index, *git_changes(f"{commit}^", head=commit))
+        except subprocess.CalledProcessError:
+            continue  # root commit
+        selected = select(impact_map, nodeids, changes)
+        selected_time = sum(durations.get(nodeid, DEFAULT_DURATION) for nodeid in selected)
+        fractions.append(selected_time / full if full else 1.0)
+        print(f"{commit:<9} {len(selected):>4}/{len(nodeids):<4} {fractions[-1]:>6.0%}  {subject[:60]}")
+    if fractions:
+        print(f"  mean share of suite time run: {sum(fractions) / len(fractions):.0%}")
+
+
+if __name__ == "__main__":
+    main()
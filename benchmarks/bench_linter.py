@@ -0,0 +1,126 @@
+"""
+Benchmark: playwright_linter.py on a generated corpus of test files
+
+Compares serial cold, parallel cold and warm-cache runs, then checks that
+single-pass rule dispatch keeps throughput flat as rules are added.
+
+Usage: python -m benchmarks.bench_linter [--files 3000] [--jobs 0]
+"""
+
+import argparse
+import ast
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import playwright_linter
+from playwright_linter import LintCache, PlaywrightLinter, Rule, collect_files, lint_paths
+
+TEMPLATE = '''"""Generated test module {index}"""
+import time
+from tests.pages.practice_pages import PracticeLoginPage, PracticeExceptionsPage
+
+
+class TestGenerated{index}:
+{tests}
+'''
+
+TEST_BODIES = [
+    '''    def test_login_{n}(self, page):
+        login_page = PracticeLoginPage(page)
+        login_page.navigate_to_login()
+        login_page.login_with_valid_credentials()
+        assert login_page.is_logged_in()
+''',
+    '''    def test_rows_{n}(self, page):
+        exceptions_page = PracticeExceptionsPage(page)
+        exceptions_page.navigate_to_exceptions()
+        exceptions_page.click_add_button()
+        exceptions_page.wait_for_second_row()
+''',
+    '''    def test_raw_{n}(self, page):
+        page.goto("https://practicetestautomation.com/practice-test-login/")
+        page.fill("#username", "student")
+        time.sleep(1)
+        page.click("#submit")
+''',
+]
+
+
+def generate_corpus(root: Path, files: int, seed: int = 7):
+    rng = random.Random(seed)
+    for index in range(files):
+        tests = "".join(rng.choice(TEST_BODIES).format(n=n) for n in range(rng.randint(3, 12)))
+        (root / f"test_generated_{index:05d}.py").write_text(TEMPLATE.format(index=index, tests=tests))
+
+
+def timed(label, paths, jobs, cache):
+    start = time.perf_counter()
+    results = lint_paths(paths, jobs=jobs, cache=cache)
+    elapsed = time.perf_counter() - start
+    cached = sum(result['cached'] for result in results)
+    print(f"  {label:<22} {elapsed:7.2f}s  ({len(paths) / elapsed:8.0f} files/s, {cached} from cache)")
+    return elapsed
+
+
+class RareNodeRule(Rule):
+    """Stand-in for a rule that only cares about an uncommon node type"""
+
+    node_types = (ast.Global,)
+
+    def __init__(self, index):
+        self.id = f"dummy-{index}"
+
+    def check(self, node, linter):
+        linter.report(node, self.id, "global statement")
+
+
+def rule_scaling(paths, dummy_rules: int = 20):
+    """Time one rule vs all rules vs all rules plus dummies, on pre-parsed trees"""
+    trees = [ast.parse(path.read_text()) for path in paths]
+    rule_sets = [
+        ("1 rule", playwright_linter.RULES[:1]),
+        (f"{len(playwright_linter.RULES)} rules", playwright_linter.RULES),
+        (f"{len(playwright_linter.RULES) + dummy_rules} rules",
+         playwright_linter.RULES + [RareNodeRule(index) for index in range(dummy_rules)]),
+    ]
+    print("📊 Rule scaling (single traversal, parse time excluded)")
+    baseline = None
+    for label, rules in rule_sets:
+        start = time.perf_counter()
+        for tree in trees:
+            PlaywrightLinter(rules=rules).visit(tree)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"  {label:<22} {elapsed:7.2f}s  ({len(trees) / elapsed:8.0f} files/s, {elapsed / baseline:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=3000)
+    parser.add_argument("--jobs", type=int, default=0, help="Workers for the parallel run (0 = one per CPU)")
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / "corpus"
+        corpus.mkdir()
+        generate_corpus(corpus, args.files)
+        paths = collect_files(corpus)
+        cache_file = Path(tmp) / "lint-cache.json"
+
+        print(f"📊 Linting {len(paths)} generated files ({jobs} jobs for parallel runs)")
+        serial = timed("cold, serial", paths, 1, None)
+        timed(f"cold, {jobs} jobs", paths, jobs, None)
+        cache = LintCache(cache_file)
+        timed("cold + fill cache", paths, jobs, cache)
+        cache.save()
+        warm = timed("warm cache", paths, jobs, LintCache(cache_file))
+        print(f"  warm cache speedup vs cold serial: {serial / warm:.1f}x")
+        rule_scaling(paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: per-selector Locator calls vs one batched query_elements() round-trip
+
+Builds a page object with --elements registered selectors over a set_content()
+page and reads visibility + text of all of them both ways.
+
+Usage: python -m benchmarks.bench_locators [--elements 60] [--repeat 20] [--headed]
+"""
+
+import argparse
+import time
+
+from playwright.sync_api import sync_playwright
+
+from tests.pages import BasePage
+from tests.pages.selectors import Selector, SelectorRegistry
+
+
+def build_page_object(elements: int):
+    """A page object class with one registered selector per generated element"""
+    attributes = {f"item_{index}": Selector(f"#item-{index}") for index in range(elements)}
+    attributes["hidden_note"] = Selector("#note")
+    selectors = type("GeneratedSelectors", (SelectorRegistry,), attributes)
+    return type("GeneratedPage", (selectors, BasePage), {})
+
+
+def build_html(elements: int) -> str:
+    items = "".join(f'<li id="item-{index}">Item {index}</li>' for index in range(elements))
+    return f'<ul>{items}</ul><p id="note" style="visibility:hidden">note</p>'
+
+
+def per_selector(page_object):
+    return {selector: (page_object.is_element_visible(selector), page_object.get_element_text(selector))
+            for selector in page_object.selector_registry.values()}
+
+
+def timed(label, function, repeat, round_trips):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<28} {elapsed * 1000:8.2f} ms/read  ({round_trips} round-trips)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--elements", type=int, default=60, help="Registered selectors on the page object")
+    parser.add_argument("--repeat", type=int, default=20, help="Reads per approach")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    page_class = build_page_object(args.elements)
+    selectors = len(page_class.selector_registry)
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=not args.headed)
+        page = browser.new_page()
+        page.set_content(build_html(args.elements))
+        page_object = page_class(page)
+
+        assert {selector: tuple(state) for selector, state in page_object.query_elements().items()} == per_selector(page_object)
+
+        print(f"📊 Reading visibility + text of {selectors} selectors")
+        slow = timed("locator per selector", lambda: per_selector(page_object), args.repeat, 2 * selectors)
+        fast = timed("query_elements (batched)", page_object.query_elements, args.repeat, 1)
+        print(f"  round-trips saved per read: {2 * selectors - 1}, speedup: {slow / fast:.1f}x")
+        print(f"  locator cache: {page_object.locators.hits} hits, {page_object.locators.misses} misses")
+        browser.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: practice_server.py requests per second
+
+Starts the server in a subprocess and hammers one page with keep-alive
+client processes, so server and clients don't share a GIL.
+
+Usage: python -m benchmarks.bench_practice_server [--clients 4] [--seconds 5] [--workers 1] [--path /practice-test-login/]
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import socket
+import subprocess
+import sys
+import time
+
+from tests.utils.action_timing import percentile
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_listening(port: int, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"practice_server did not start on port {port}")
+
+
+def client(port: int, path: str, seconds: float):
+    """One keep-alive connection sending requests back to back; returns latencies"""
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        connection.request("GET", path)
+        connection.getresponse().read()
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=4, help="Client processes")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="Server processes (practice_server --workers)")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Injected server latency")
+    parser.add_argument("--path", default="/practice-test-login/")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "practice_server.py", "--port", str(port), "--workers", str(args.workers),
+         "--latency-ms", str(args.latency_ms)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_listening(port)
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.starmap(client, [(port, args.path, args.seconds)] * args.clients)
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = [latency for result in results for latency in result]
+    print(f"📊 {args.path} with {args.clients} keep-alive clients, {args.workers} server worker(s), "
+          f"{args.latency_ms} ms injected latency")
+    print(f"  requests : {len(latencies)} in {args.seconds:.0f}s ({len(latencies) / args.seconds:,.0f} req/s)")
+    print(f"  latency  : p50 {percentile(latencies, 50) * 1000:.2f} ms, p99 {percentile(latencies, 99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: whole-suite wall time per run profile
+
+Runs the pytest suite once per profile in a subprocess and compares against
+the first one (demo = the previous hard-coded defaults).
+
+Usage: python -m benchmarks.bench_run_profiles [--profiles demo ci-fast] [--repeat 1] [-- extra pytest args]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from config import RUN_PROFILES
+
+
+def run_suite(profile, pytest_args):
+    env = {**os.environ, "RUN_PROFILE": profile}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *pytest_args],
+        env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - start
+    summary = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else result.stderr.strip()[-200:]
+    return elapsed, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", default=["demo", "ci-fast"], choices=list(RUN_PROFILES))
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per profile (best time is kept)")
+    parser.add_argument("pytest_args", nargs="*", default=["tests/test_practice_sites.py"],
+                        help="Arguments passed to pytest (after --)")
+    args = parser.parse_args()
+
+    results = {}
+    for profile in args.profiles:
+        times = []
+        for _ in range(args.repeat):
+            elapsed, summary = run_suite(profile, args.pytest_args)
+            times.append(elapsed)
+        results[profile] = min(times)
+        print(f"  {profile:<8} {results[profile]:7.2f}s  ({summary})")
+
+    baseline = args.profiles[0]
+    print(f"\n📊 Suite wall time vs {baseline}:")
+    for profile, elapsed in results.items():
+        print(f"  {profile:<8} {elapsed:7.2f}s  speedup {results[baseline] / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
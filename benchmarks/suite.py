@@ -0,0 +1,405 @@
+"""
+Benchmark suite: overhead of the page objects and the test harness, with a regression gate
+
+Every case measures one piece of our own code against practice_server.py:
+navigation, fill/click, visibility queries, context creation (fresh and
+pooled), the per-test cost of the conftest.py fixtures, pytest collection,
+BasePage bookkeeping on a fake page, and playwright_linter.py throughput.
+Each case runs --rounds times after a warm-up; its median (seconds per
+operation) is compared with the baseline saved by --save, and the run exits
+with status 1 when a case got slower than the baseline by more than
+--threshold. Browser cases are skipped when chromium can't be launched; a
+baseline case that wasn't measured fails the run too, unless --allow-skip.
+Without a baseline file nothing is measured and the run exits with status 2.
+Baselines are machine specific and not committed (see the README for CI).
+
+Usage: python -m benchmarks.suite [--save] [--threshold 0.25] [--rounds 5] [-k navigate] [--json out.json]
+                                  [--allow-skip]
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config import PROJECT_DIR
+
+DEFAULT_BASELINE = PROJECT_DIR / ".benchmark-baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+# Per-test fixture cost = (run with `page` - run without) / tests
+FIXTURE_TESTS = 20
+FIXTURE_TEST_FILE = '''
+import pytest
+
+
+@pytest.mark.parametrize("n", range({tests}))
+def test_with_page(n, {fixture}):
+    pass
+'''
+
+
+@dataclass
+class BenchEnv:
+    """What the cases run against; browser is None when it couldn't be launched"""
+
+    tmp: Path
+    base_url: str = ""
+    browser: object = None
+
+
+@dataclass
+class Case:
+    name: str
+    function: Callable[[BenchEnv], float]
+    browser: bool
+    description: str
+
+
+CASES: Dict[str, Case] = {}
+
+
+def benchmark(name: str, browser: bool = False):
+    """Register a case; the function returns seconds per operation"""
+    def register(function):
+        CASES[name] = Case(name, function, browser, (function.__doc__ or "").strip())
+        return function
+    return register
+
+
+def per_call(function: Callable[[], object], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    return (time.perf_counter() - start) / number
+
+
+# --- harness (no browser) ---
+
+
+@benchmark("harness.page_object_calls")
+def page_object_calls(env: BenchEnv) -> float:
+    """fill_form + query_elements + click_element on a fake page (pure BasePage bookkeeping)"""
+    from tests.fakes import FakePage
+    from tests.pages import PracticeLoginPage
+    login_page = PracticeLoginPage(FakePage())
+    fields = {login_page.username_input: "student", login_page.password_input: "Password123"}
+
+    def calls():
+        login_page.fill_form(fields)
+        login_page.query_elements()
+        login_page.click_element(login_page.login_button)
+    return per_call(calls, 2000)
+
+
+@benchmark("harness.collect")
+def collect(env: BenchEnv) -> float:
+    """pytest --collect-only of tests/ (plugin and conftest import, collection hooks)"""
+    start = time.perf_counter()
+    _pytest(["--collect-only", "-q", "tests/"], env, cwd=PROJECT_DIR)
+    return time.perf_counter() - start
+
+
+@benchmark("linter.per_file")
+def linter_per_file(env: BenchEnv) -> float:
+    """playwright_linter.py on 200 generated test files, serial and uncached"""
+    from benchmarks.bench_linter import generate_corpus
+    from playwright_linter import collect_files, lint_paths
+    corpus = env.tmp / "lint-corpus"
+    if not corpus.exists():
+        corpus.mkdir()
+        generate_corpus(corpus, 200)
+    paths = collect_files(corpus)
+    start = time.perf_counter()
+    lint_paths(paths, jobs=1, cache=None)
+    return (time.perf_counter() - start) / len(paths)
+
+
+# --- page objects in a real browser ---
+
+def _login_page(env: BenchEnv, context):
+    from tests.pages import PracticeLoginPage
+    login_page = PracticeLoginPage(context.new_page())
+    login_page.base_url = env.base_url
+    login_page.navigate_to_login()
+    return login_page
+
+
+def _on_login_page(env: BenchEnv, action, number: int) -> float:
+    context = env.browser.new_context()
+    try:
+        login_page = _login_page(env, context)
+        return per_call(lambda: action(login_page), number)
+    finally:
+        context.close()
+
+
+@benchmark("page.navigate", browser=True)
+def navigate(env: BenchEnv) -> float:
+    """navigate_to_login() with the configured readiness strategy"""
+    return _on_login_page(env, lambda login_page: login_page.navigate_to_login(), 10)
+
+
+@benchmark("page.fill_form", browser=True)
+def fill_form(env: BenchEnv) -> float:
+    """fill_form() of the login fields, no submit"""
+    def fill(login_page):
+        login_page.fill_form({login_page.username_input: "student", login_page.password_input: "Password123"})
+    return _on_login_page(env, fill, 50)
+
+
+@benchmark("page.click", browser=True)
+def click(env: BenchEnv) -> float:
+    """click_element() on a field (no navigation)"""
+    return _on_login_page(env, lambda login_page: login_page.click_element(login_page.username_input), 50)
+
+
+@benchmark("page.is_element_visible", browser=True)
+def is_element_visible(env: BenchEnv) -> float:
+    """is_element_visible() of one selector"""
+    return _on_login_page(env, lambda login_page: login_page.is_element_visible(login_page.login_button), 100)
+
+
+@benchmark("page.query_elements", browser=True)
+def query_elements(env: BenchEnv) -> float:
+    """query_elements() of the whole selector registry in one round-trip"""
+    return _on_login_page(env, lambda login_page: login_page.query_elements(), 100)
+
+
+@benchmark("context.new", browser=True)
+def new_context(env: BenchEnv) -> float:
+    """browser.new_context() + new_page() + close(), what every unpooled test pays"""
+    def cycle():
+        context = env.browser.new_context()
+        context.new_page()
+        context.close()
+    return per_call(cycle, 10)
+
+
+@benchmark("context.pooled", browser=True)
+def pooled_context(env: BenchEnv) -> float:
+    """ContextPool acquire() + new_page() + release() (reset and leak check)"""
+    from tests.utils.context_pool import ContextPool
+    pool = ContextPool(env.browser, {}, size=1)
+    pool.warm()
+
+    def cycle():
+        context = pool.acquire()
+        context.new_page()
+        pool.release(context)
+    try:
+        return per_call(cycle, 10)
+    finally:
+        pool.close()
+
+
+@benchmark("fixture.page", browser=True)
+def page_fixture(env: BenchEnv) -> float:
+    """Per-test setup + teardown of the conftest.py `page` fixture chain, in a real pytest run"""
+    seconds = {}
+    for fixture in ("page", "request"):
+        test_file = env.tmp / f"test_fixture_{fixture}.py"
+        test_file.write_text(FIXTURE_TEST_FILE.format(tests=FIXTURE_TESTS, fixture=fixture))
+        start = time.perf_counter()
+        _pytest(["-p", "tests.conftest", "-c", os.devnull, "--rootdir", str(env.tmp), "--run-profile",
+                 "ci-fast", "--flaky-reruns", "0", "--no-test-history", "-q", str(test_file)], env, cwd=env.tmp)
+        seconds[fixture] = time.perf_counter() - start
+    return (seconds["page"] - seconds["request"]) / FIXTURE_TESTS
+
+
+def _pytest(args: List[str], env: BenchEnv, cwd: Path):
+    """A pytest subprocess that leaves the project's durations, wait stats and artifacts alone"""
+    variables = {**os.environ, "PYTHONPATH": str(PROJECT_DIR),
+                 "TEST_DURATIONS_FILE": str(env.tmp / "durations.json"),
+                 "TEST_HISTORY_DB": str(env.tmp / "history.sqlite"),
+                 "WAIT_STATS_FILE": str(env.tmp / "wait_stats.json"),
+                 "ARTIFACTS_DIR": str(env.tmp / "artifacts")}
+    variables.pop("PRACTICE_CONFIG_SNAPSHOT", None)
+    if env.base_url:
+        # Page fixtures of the run go to the suite's local practice server
+        variables["LOCAL_SITE_URL"] = env.base_url
+    result = subprocess.run([sys.executable, "-m", "pytest", "-p", "no:cacheprovider", *args],
+                            cwd=cwd, env=variables, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"pytest exited with {result.returncode}: {result.stdout[-500:]}")
+
+
+# --- measuring and comparing ---
+
+def measure(case: Case, env: BenchEnv, rounds: int) -> dict:
+    """Median and spread of `rounds` runs after one warm-up run"""
+    case.function(env)
+    samples = [case.function(env) for _ in range(rounds)]
+    return {'median': statistics.median(samples), 'min': min(samples), 'max': max(samples), 'rounds': rounds}
+
+
+def machine_info() -> dict:
+    return {'host': platform.node(), 'python': platform.python_version(), 'platform': platform.platform(),
+            'cpus': os.cpu_count()}
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float,
+            selected: Iterable[str] = ()) -> List[dict]:
+    """One row per case: ratio to the baseline median and a verdict (regressed / faster / ok / new)
+
+    Selected cases that have a baseline but no result (skipped) get a 'missing' row.
+    """
+    rows = [{'case': name, 'median': None, 'baseline': baseline[name]['median'], 'ratio': None,
+             'verdict': 'missing'}
+            for name in selected if name in baseline and name not in results]
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            rows.append({'case': name, 'median': result['median'], 'baseline': None, 'ratio': None,
+                         'verdict': 'new'})
+            continue
+        ratio = result['median'] / reference['median'] if reference['median'] else float("inf")
+        verdict = 'regressed' if ratio > 1 + threshold else 'faster' if ratio < 1 / (1 + threshold) else 'ok'
+        rows.append({'case': name, 'median': result['median'], 'baseline': reference['median'], 'ratio': ratio,
+                     'verdict': verdict})
+    return rows
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def format_rows(rows: List[dict]) -> List[str]:
+    lines = [f"{'case':<28} {'median':>10} {'baseline':>10} {'ratio':>6}"]
+    for row in rows:
+        baseline = format_seconds(row['baseline']) if row['baseline'] is not None else "-"
+        ratio = f"{row['ratio']:.2f}x" if row['ratio'] is not None else "-"
+        median = format_seconds(row['median']) if row['median'] is not None else "-"
+        marker = {"regressed": "  ❌ regressed", "faster": "  ✅ faster", "new": "  (no baseline)",
+                  "missing": "  (not measured)"}.get(row['verdict'], "")
+        lines.append(f"{row['case']:<28} {median:>10} {baseline:>10} {ratio:>6}{marker}")
+    return lines
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {'machine': None, 'results': {}}
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, results: Dict[str, dict]):
+    """Merge into the existing baseline (a -k run only replaces its own cases); atomic write"""
+    baseline = load_baseline(path)
+    baseline['machine'] = machine_info()
+    baseline['results'] = {**baseline['results'], **results}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def select(pattern: Optional[str]) -> List[Case]:
+    return [case for name, case in CASES.items() if not pattern or re.search(pattern, name)]
+
+
+def run_cases(cases: List[Case], rounds: int, headed: bool = False) -> Dict[str, dict]:
+    """Measure every case; browser cases share one chromium and one local practice server"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = BenchEnv(Path(tmp))
+        for case in (case for case in cases if not case.browser):
+            results[case.name] = measure(case, env, rounds)
+            print(f"  {case.name:<28} {format_seconds(results[case.name]['median']):>10}  {case.description}")
+        browser_cases = [case for case in cases if case.browser]
+        if browser_cases:
+            results.update(_run_browser_cases(browser_cases, env, rounds, headed))
+    return results
+
+
+def _run_browser_cases(cases: List[Case], env: BenchEnv, rounds: int, headed: bool) -> Dict[str, dict]:
+    from playwright.sync_api import Error as PlaywrightError, sync_playwright
+    from practice_server import PracticeServer, ServerOptions
+
+    results = {}
+    with PracticeServer(options=ServerOptions(row2_delay_ms=0)) as server, sync_playwright() as playwright:
+        try:
+            env.browser = playwright.chromium.launch(headless=not headed)
+        except PlaywrightError as error:
+            print(f"  ⚠️  skipping {len(cases)} browser cases, chromium didn't launch: "
+                  f"{str(error).splitlines()[0]}")
+            return results
+        env.base_url = server.url
+        try:
+            for case in cases:
+                results[case.name] = measure(case, env, rounds)
+                print(f"  {case.name:<28} {format_seconds(results[case.name]['median']):>10}  {case.description}")
+        finally:
+            env.browser.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", help="Only cases whose name matches this regex")
+    parser.add_argument("--rounds", type=int, default=5, help="Measured rounds per case (median is kept)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown vs the baseline median (0.25 = 25%%)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Store this run as the baseline instead of comparing")
+    parser.add_argument("--json", type=Path, help="Also write results and comparison to this file")
+    parser.add_argument("--allow-skip", action="store_true",
+                        help="Don't fail when baseline cases were skipped (e.g. no browser installed)")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    args = parser.parse_args(argv)
+
+    cases = select(args.pattern)
+    if args.list or not cases:
+        for case in cases or CASES.values():
+            print(f"  {case.name:<28} {'browser' if case.browser else '       '}  {case.description}")
+        return 0 if cases else 2
+
+    if not args.save and not args.baseline.exists():
+        # Comparing against nothing would pass every case as "new"
+        print(f"❌ No baseline at {args.baseline}; record one on this machine with --save "
+              f"(or point --baseline at the one CI restored)")
+        return 2
+
+    print(f"⏱️  {len(cases)} cases, {args.rounds} rounds each (median)")
+    results = run_cases(cases, args.rounds, args.headed)
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"💾 Baseline for {len(results)} cases saved to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline['machine'] and baseline['machine']['host'] != platform.node():
+        print(f"⚠️  Baseline was recorded on {baseline['machine']['host']}; timings may not be comparable")
+    rows = compare(results, baseline['results'], args.threshold, [case.name for case in cases])
+    print(f"📊 vs {args.baseline} (threshold +{args.threshold:.0%})")
+    for line in format_rows(rows):
+        print(f"  {line}")
+    if args.json:
+        args.json.write_text(json.dumps({'machine': machine_info(), 'results': results, 'comparison': rows},
+                                        indent=2))
+    regressed = [row['case'] for row in rows if row['verdict'] == 'regressed']
+    missing = [row['case'] for row in rows if row['verdict'] == 'missing']
+    if regressed:
+        print(f"❌ {len(regressed)} regressed: {', '.join(regressed)}")
+    if missing:
+        print(f"{'⚠️ ' if args.allow_skip else '❌'} {len(missing)} not measured: {', '.join(missing)}")
+    if regressed or (missing and not args.allow_skip):
+        return 1
+    print("✅ no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
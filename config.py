@@ -1,74 +1,322 @@
 """
 Configuration module for Practice Playwright automation
 Simple configuration for practice websites - no sensitive credentials needed!
+
+Config is a typed, immutable NamedTuple loaded lazily, once per process,
+from layered sources: field defaults < .env < environment < overrides (e.g.
+the --run-profile given on the command line, see configure()). `config` is a
+proxy to the current instance, so importing it costs nothing and code that
+did `from config import config` sees later configure() calls.
+share_with_workers() exports the loaded settings as a JSON snapshot that
+spawned worker processes load instead of parsing .env and the environment.
 """
 
+import json
 import os
-from dotenv import load_dotenv
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+PROJECT_DIR = Path(__file__).parent
+ENV_FILE = PROJECT_DIR / '.env'
+# Serialized Config inherited by worker processes (see share_with_workers)
+SNAPSHOT_ENV = 'PRACTICE_CONFIG_SNAPSHOT'
+# Snapshot entry holding the parent's environment variables for Config fields
+SNAPSHOT_ENVIRON_KEY = '__environ__'
+
+
+# Run profiles: slow_mo, headless, video, screenshots and tracing chosen together.
+# headless None leaves it to --headed; tracing "lazy" records in memory and only
+# writes trace.zip for failing tests.
+RUN_PROFILES = {
+    'demo': {
+        'slow_mo': 100,
+        'headless': None,
+        'video': 'retain-on-failure',
+        # Failure screenshots come from the artifacts plugin (written off the test thread)
+        'screenshot': 'off',
+        'tracing': 'off',
+    },
+    'debug': {
+        'slow_mo': 250,
+        'headless': False,
+        'video': 'on',
+        'screenshot': 'on',
+        'tracing': 'on',
+    },
+    'ci-fast': {
+        'slow_mo': 0,
+        'headless': True,
+        'video': 'off',
+        'screenshot': 'off',
+        'tracing': 'lazy',
+    },
+}
+
+
+class Config(NamedTuple):
+    """Configuration for practice automation; every field can be set by an env variable of the same name"""
+
+    # Practice Site URLs (public sites, no credentials needed)
+    # LOCAL_SITE_URL points all of them at practice_server.py instead
+    LOCAL_SITE_URL: Optional[str] = None
+    PLAYWRIGHT_DEMO_URL: str = "https://demo.playwright.dev/"
+    # Injected latency / #row2 delay for the in-process server started by pytest --local-site
+    LOCAL_SITE_LATENCY_MS: int = 0
+    LOCAL_SITE_ROW2_DELAY_MS: int = 5000
+    # Signs the in-process server's session cookies; fixed so cached logins survive a restart
+    LOCAL_SITE_SECRET: str = 'practice-local-site'
+
+    # Test Configuration
+    DEFAULT_TIMEOUT: int = 10000
+    HEADLESS_MODE: bool = False
+    # demo (default, matches the old hard-coded settings), debug or ci-fast
+    RUN_PROFILE: str = 'demo'
+
+    # Page readiness after navigation: networkidle, load, domcontentloaded or selector
+    READINESS_STRATEGY: str = 'networkidle'
+    # URL glob patterns networkidle should not wait for (comma separated)
+    NETWORK_IDLE_IGNORE: Tuple[str, ...] = ()
+
+    # Network interception (block third-party assets, serve static assets from disk)
+    NETWORK_INTERCEPT: bool = False
+    NETWORK_CACHE_DIR: Path = PROJECT_DIR / '.network-cache'
+    NETWORK_CACHE_MAX_MB: int = 200
+    NETWORK_HAR_PATH: Optional[str] = None
+    BLOCKED_RESOURCE_TYPES: Tuple[str, ...] = ('media',)
+    BLOCKED_DOMAINS: Tuple[str, ...] = (
+        'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com', 'facebook.net'
+    )
+
+    # Per-test traffic archives for --record / --replay
+    RECORDINGS_DIR: Path = PROJECT_DIR / 'recordings'
+    # Delay before each replayed response: 'recorded' (the latency seen while recording) or fixed ms
+    REPLAY_LATENCY: str = '0'
+
+    # Authenticated session cache (storage_state files reused between tests)
+    AUTH_STATE_DIR: Path = PROJECT_DIR / '.auth'
+    AUTH_STATE_TTL: int = 1800  # seconds
+
+    # Learned appearance times of dynamic elements (BasePage.wait_adaptively)
+    WAIT_STATS_FILE: Path = PROJECT_DIR / '.wait_stats.json'
+
+    # Test -> page object / selector / Config dependency map for --impact-since
+    IMPACT_MAP_FILE: Path = PROJECT_DIR / '.impact_map.json'
+
+    # Failure artifacts (screenshot, DOM, console) written by a background pool
+    ARTIFACTS: str = 'on-failure'  # on-failure | off
+    ARTIFACTS_DIR: Path = PROJECT_DIR / 'artifacts'
+    ARTIFACTS_BUDGET_MB: float = 200  # per run, split across workers
+    ARTIFACTS_WORKERS: int = 2
+
+    # Time every page-object action and report the slowest steps (same as --action-timing)
+    ACTION_TIMING: bool = False
+
+    # Parallel execution (duration history drives shard balancing)
+    TEST_DURATIONS_FILE: Path = PROJECT_DIR / '.test_durations.json'
+    # Attempts, verdicts (passed/flaky/broken) and durations of every test, kept across runs
+    TEST_HISTORY_DB: Path = PROJECT_DIR / '.test_history.sqlite'
+    FLAKY_RERUNS: int = 2  # reruns of a failed test in a fresh context (0 disables)
+    CONTEXT_POOL_SIZE: int = 0  # 0 = new context per test
+
+    # Practice site credentials (public knowledge - no security risk; class attributes, not settings)
+    PRACTICE_CREDENTIALS = MappingProxyType({
+        'valid_username': 'student',
+        'valid_password': 'Password123',
+        'invalid_username': 'incorrectUser',
+        'invalid_password': 'wrongPassword'
+    })
+
+    SAUCE_DEMO_CREDENTIALS = MappingProxyType({
+        'standard_user': 'secret_sauce',
+        'locked_out_user': 'secret_sauce',
+        'problem_user': 'secret_sauce'
+    })
+
+    THE_INTERNET_CREDENTIALS = MappingProxyType({
+        'username': 'tomsmith',
+        'password': 'SuperSecretPassword!'
+    })
+
+    @property
+    def PRACTICE_BASE_URL(self) -> str:
+        return self.LOCAL_SITE_URL or "https://practicetestautomation.com"
+
+    @property
+    def PRACTICE_LOGIN_URL(self) -> str:
+        return f"{self.PRACTICE_BASE_URL}/practice-test-login/"
+
+    @property
+    def PRACTICE_EXCEPTIONS_URL(self) -> str:
+        return f"{self.PRACTICE_BASE_URL}/practice-test-exceptions/"
+
+    @property
+    def THE_INTERNET_URL(self) -> str:
+        return f"{self.LOCAL_SITE_URL}/" if self.LOCAL_SITE_URL else "https://the-internet.herokuapp.com/"
+
+    @property
+    def SAUCE_DEMO_URL(self) -> str:
+        return f"{self.LOCAL_SITE_URL}/" if self.LOCAL_SITE_URL else "https://www.saucedemo.com/"
 
-class Config:
-    """Configuration class for practice automation"""
-    
-    def __init__(self):
-        # Load environment variables from .env file (optional for practice)
-        env_path = Path(__file__).parent / '.env'
-        if env_path.exists():
-            load_dotenv(dotenv_path=env_path)
-        
-        # Practice Site URLs (public sites, no credentials needed)
-        self.PRACTICE_LOGIN_URL = "https://practicetestautomation.com/practice-test-login/"
-        self.PRACTICE_EXCEPTIONS_URL = "https://practicetestautomation.com/practice-test-exceptions/"
-        self.THE_INTERNET_URL = "https://the-internet.herokuapp.com/"
-        self.SAUCE_DEMO_URL = "https://www.saucedemo.com/"
-        self.PLAYWRIGHT_DEMO_URL = "https://demo.playwright.dev/"
-        
-        # Test Configuration
-        self.DEFAULT_TIMEOUT = int(os.getenv('DEFAULT_TIMEOUT', '10000'))
-        self.HEADLESS_MODE = os.getenv('HEADLESS_MODE', 'false').lower() == 'true'
-        
-        # Practice site credentials (public knowledge - no security risk)
-        self.PRACTICE_CREDENTIALS = {
-            'valid_username': 'student',
-            'valid_password': 'Password123',
-            'invalid_username': 'incorrectUser',
-            'invalid_password': 'wrongPassword'
-        }
-        
-        self.SAUCE_DEMO_CREDENTIALS = {
-            'standard_user': 'secret_sauce',
-            'locked_out_user': 'secret_sauce',
-            'problem_user': 'secret_sauce'
-        }
-        
-        self.THE_INTERNET_CREDENTIALS = {
-            'username': 'tomsmith',
-            'password': 'SuperSecretPassword!'
-        }
-    
     def get_practice_credentials(self, credential_type='valid'):
         """Get practice site credentials"""
         if credential_type == 'valid':
-            return (self.PRACTICE_CREDENTIALS['valid_username'], 
+            return (self.PRACTICE_CREDENTIALS['valid_username'],
                    self.PRACTICE_CREDENTIALS['valid_password'])
         elif credential_type == 'invalid':
             return (self.PRACTICE_CREDENTIALS['invalid_username'],
                    self.PRACTICE_CREDENTIALS['valid_password'])
         else:
             raise ValueError(f"Unknown credential type: {credential_type}")
-    
+
     def get_sauce_demo_credentials(self, user_type='standard_user'):
         """Get Sauce Demo credentials"""
         return (user_type, self.SAUCE_DEMO_CREDENTIALS[user_type])
-    
+
     def get_the_internet_credentials(self):
         """Get The Internet credentials"""
         return (self.THE_INTERNET_CREDENTIALS['username'],
                self.THE_INTERNET_CREDENTIALS['password'])
-    
+
+    def get_run_profile(self, name=None):
+        """Get run profile settings (defaults to RUN_PROFILE)"""
+        name = name or self.RUN_PROFILE
+        if name not in RUN_PROFILES:
+            raise ValueError(f"Unknown run profile: {name} (choose from {', '.join(RUN_PROFILES)})")
+        return dict(RUN_PROFILES[name])
+
     def get_login_url(self):
         """Get login URL for practice automation"""
         return self.PRACTICE_LOGIN_URL
 
+    def to_snapshot(self, environ: Optional[Mapping[str, str]] = None) -> str:
+        """JSON of every field, loadable with from_snapshot()
+
+        With environ, its values for Config fields are stored too, so a process
+        loading the snapshot can tell which variables were changed for it.
+        """
+        values = {name: str(value) if isinstance(value, Path) else value for name, value in self._asdict().items()}
+        if environ is not None:
+            values[SNAPSHOT_ENVIRON_KEY] = {name: environ[name] for name in self._fields if name in environ}
+        return json.dumps(values)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: str) -> 'Config':
+        values = {}
+        for name, value in json.loads(snapshot).items():
+            if name not in cls._fields:
+                continue  # written by an older/newer Config
+            if cls.__annotations__[name] is Path:
+                value = Path(value)
+            elif isinstance(value, list):
+                value = tuple(value)
+            values[name] = value
+        return cls(**values)
+
+
+def _validated(settings: Config) -> Config:
+    if settings.RUN_PROFILE not in RUN_PROFILES:
+        raise ValueError(f"Unknown run profile: {settings.RUN_PROFILE} (choose from {', '.join(RUN_PROFILES)})")
+    if settings.LOCAL_SITE_URL and settings.LOCAL_SITE_URL.endswith('/'):
+        settings = settings._replace(LOCAL_SITE_URL=settings.LOCAL_SITE_URL.rstrip('/'))
+    return settings
+
+
+def _parse(kind, raw: str):
+    """Convert an env/.env string to a field's type"""
+    if kind is bool:
+        return raw.strip().lower() == 'true'
+    if kind in (int, float, str):
+        return kind(raw)
+    if kind is Path:
+        return Path(raw)
+    if kind == Optional[str]:
+        return raw or None
+    if kind == Tuple[str, ...]:
+        return tuple(item.strip() for item in raw.split(',') if item.strip())
+    raise TypeError(f"No parser for {kind}")
+
+
+def load_config(overrides: Optional[Dict[str, object]] = None, env_file: Path = ENV_FILE,
+                environ: Optional[Mapping[str, str]] = None) -> Config:
+    """Build a Config from the layered sources, or from the snapshot a parent process shared"""
+    environ = os.environ if environ is None else environ
+    snapshot = environ.get(SNAPSHOT_ENV)
+    if snapshot:
+        loaded = Config.from_snapshot(snapshot)
+        inherited = json.loads(snapshot).get(SNAPSHOT_ENVIRON_KEY)
+        if inherited is not None:
+            # e.g. `RUN_PROFILE=ci-fast pytest ...` started from a process that shared its Config
+            loaded = loaded._replace(**{
+                name: _parse(kind, environ[name]) for name, kind in Config.__annotations__.items()
+                if name in environ and environ[name] != inherited.get(name)
+            })
+    else:
+        raw = {}
+        if env_file.exists():
+            from dotenv import dotenv_values  # only paid for when there is a .env
+            raw.update({name: value for name, value in dotenv_values(env_file).items() if value is not None})
+        raw.update(environ)
+        loaded = Config(**{
+            name: _parse(kind, raw[name]) for name, kind in Config.__annotations__.items() if name in raw
+        })
+    return _validated(loaded._replace(**overrides) if overrides else loaded)
+
+
+_config: Optional[Config] = None
+
+
+def get_config() -> Config:
+    """The process-wide Config, loaded on first use"""
+    global _config
+    if _config is None:
+        _config = load_config()
+    return _config
+
+
+def configure(**overrides) -> Config:
+    """Replace the process-wide Config with a copy carrying overrides (the CLI layer)
+
+    A snapshot already exported by share_with_workers() is refreshed, so workers
+    started afterwards see the change too.
+    """
+    global _config
+    _config = _validated(get_config()._replace(**overrides))
+    if SNAPSHOT_ENV in os.environ:
+        share_with_workers()
+    return _config
+
+
+def share_with_workers():
+    """Export the current Config so spawned processes load it instead of parsing again"""
+    os.environ[SNAPSHOT_ENV] = get_config().to_snapshot(os.environ)
+
+
+def reset_config():
+    """Forget the loaded Config; the next access loads it again"""
+    global _config
+    _config = None
+
+
+class _ConfigProxy:
+    """What `from config import config` returns: reads go to get_config(), writes are refused"""
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(get_config(), name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Config is immutable; use configure({name}=...)")
+
+    def __repr__(self):
+        return repr(get_config())
+
+
 # Global config instance
-config = Config()
\ No newline at end of file
+config = _ConfigProxy()
+
+
+if __name__ == "__main__":
+    # `export PRACTICE_CONFIG_SNAPSHOT="$(python config.py)"` before starting workers
+    print(get_config().to_snapshot(os.environ))
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Synthetic-user load on the practice sites, driven by the page objects
+
+Virtual users loop over the login and add/remove-row flows of
+AsyncPracticeLoginPage / AsyncPracticeExceptionsPage for --duration seconds.
+Users are spread over --processes worker processes (one browser and event
+loop each, one context per user) and started evenly over --ramp-up seconds.
+Every page-object step goes into a log-bucket latency histogram; histograms
+from all workers are merged and the run reports iterations/second, p50/p95/p99
+per step and error rates. --scale doubles the users stage by stage until
+throughput stops growing (CPU-bound) or errors exceed --max-error-rate.
+
+Without --url an in-process practice_server.py is the target (with #row2
+appearing after --row2-delay-ms). Adaptive waits don't learn here: every wait
+gets the page object's default timeout, so stages and runs stay comparable
+whatever .wait_stats.json holds, and the file is never written.
+
+Usage: python load_runner.py [--users 10] [--duration 30] [--ramp-up 5] [--processes 2]
+                             [--scenario login --scenario add-remove] [--url http://127.0.0.1:8000]
+                             [--scale --max-users 160] [--json load-results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from playwright.async_api import async_playwright
+
+from config import configure, share_with_workers
+from practice_server import PracticeServer, ServerOptions
+from tests.pages import AsyncPracticeExceptionsPage, AsyncPracticeLoginPage
+from tests.pages.wait_stats import wait_stats
+
+# Histogram buckets grow by 5% from 0.1 ms, so percentiles are within 5%
+BUCKET_GROWTH = 1.05
+BUCKET_FLOOR_MS = 0.1
+# --scale stops once doubling the users adds less than this much throughput
+MIN_SCALE_GAIN = 0.10
+
+
+class LatencyHistogram:
+    """Sparse log-bucket histogram; histograms from different processes merge by adding counts"""
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = Counter()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @staticmethod
+    def bucket_of(ms: float) -> int:
+        if ms <= BUCKET_FLOOR_MS:
+            return 0
+        return math.ceil(math.log(ms / BUCKET_FLOOR_MS) / math.log(BUCKET_GROWTH))
+
+    @staticmethod
+    def upper_bound(bucket: int) -> float:
+        return BUCKET_FLOOR_MS * BUCKET_GROWTH ** bucket
+
+    def record(self, ms: float):
+        self.buckets[self.bucket_of(ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other: 'LatencyHistogram'):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile (upper edge of its bucket, never above the max seen)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.upper_bound(bucket), self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {'buckets': {str(bucket): count for bucket, count in sorted(self.buckets.items())},
+                'count': self.count, 'total_ms': self.total_ms, 'max_ms': self.max_ms}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LatencyHistogram':
+        histogram = cls()
+        histogram.buckets.update({int(bucket): count for bucket, count in data['buckets'].items()})
+        histogram.count, histogram.total_ms, histogram.max_ms = data['count'], data['total_ms'], data['max_ms']
+        return histogram
+
+
+class LoadResults:
+    """Step latencies, step errors and finished iterations of one worker, or of all merged"""
+
+    def __init__(self):
+        self.steps: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)  # step -> exception type -> count
+        self.iterations: Counter = Counter()  # scenario -> passed
+        self.failures: Counter = Counter()  # scenario -> failed
+        self.timeline: Dict[int, List[int]] = defaultdict(lambda: [0, 0])  # second -> [passed, failed]
+
+    def record_step(self, step: str, ms: float):
+        self.steps[step].record(ms)
+
+    def record_error(self, step: str, error: BaseException):
+        self.errors[step][type(error).__name__] += 1
+
+    def record_iteration(self, scenario: str, passed: bool, second: int):
+        (self.iterations if passed else self.failures)[scenario] += 1
+        self.timeline[second][0 if passed else 1] += 1
+
+    def merge(self, other: 'LoadResults'):
+        for step, histogram in other.steps.items():
+            self.steps[step].merge(histogram)
+        for step, errors in other.errors.items():
+            self.errors[step].update(errors)
+        self.iterations.update(other.iterations)
+        self.failures.update(other.failures)
+        for second, (passed, failed) in other.timeline.items():
+            self.timeline[second][0] += passed
+            self.timeline[second][1] += failed
+
+    def to_dict(self) -> dict:
+        return {'steps': {step: histogram.to_dict() for step, histogram in self.steps.items()},
+                'errors': {step: dict(errors) for step, errors in self.errors.items()},
+                'iterations': dict(self.iterations), 'failures': dict(self.failures),
+                'timeline': {str(second): counts for second, counts in sorted(self.timeline.items())}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LoadResults':
+        results = cls()
+        for step, histogram in data['steps'].items():
+            results.steps[step] = LatencyHistogram.from_dict(histogram)
+        for step, errors in data['errors'].items():
+            results.errors[step].update(errors)
+        results.iterations.update(data['iterations'])
+        results.failures.update(data['failures'])
+        for second, counts in data['timeline'].items():
+            results.timeline[int(second)] = list(counts)
+        return results
+
+    def summary(self, wall: float, ramp_up: float, duration: float) -> dict:
+        """Throughput over the wall time and after ramp-up (until the deadline), per-step latency and errors"""
+        passed, failed = sum(self.iterations.values()), sum(self.failures.values())
+        steady = range(int(ramp_up), int(duration)) if duration - ramp_up >= 1 else range(max(int(duration), 1))
+        steady_passed = sum(self.timeline[second][0] for second in steady if second in self.timeline)
+        steps = {}
+        for step in sorted(set(self.steps) | set(self.errors)):  # a step may only ever have failed
+            histogram = self.steps.get(step) or LatencyHistogram()
+            errors = sum(self.errors[step].values()) if step in self.errors else 0
+            attempts = histogram.count + errors
+            steps[step] = {
+                'count': histogram.count, 'errors': errors, 'error_rate': errors / attempts if attempts else 0.0,
+                'error_types': dict(self.errors.get(step, {})),
+                'mean_ms': histogram.total_ms / histogram.count if histogram.count else 0.0,
+                'p50_ms': histogram.percentile(50), 'p95_ms': histogram.percentile(95),
+                'p99_ms': histogram.percentile(99), 'max_ms': histogram.max_ms,
+                'histogram': histogram.to_dict(),
+            }
+        return {
+            'iterations': passed, 'failed_iterations': failed,
+            'error_rate': failed / (passed + failed) if passed + failed else 0.0,
+            'throughput': (passed + failed) / wall if wall else 0.0,
+            'steady_throughput': steady_passed / max(len(steady), 1),
+            'scenarios': {scenario: {'passed': self.iterations[scenario], 'failed': self.failures[scenario]}
+                          for scenario in sorted(set(self.iterations) | set(self.failures))},
+            'steps': steps,
+            'timeline': [{'second': second, 'passed': counts[0], 'failed': counts[1]}
+                         for second, counts in sorted(self.timeline.items())],
+        }
+
+
+@dataclass
+class LoadPlan:
+    """What every worker process needs to run its share of the users"""
+
+    base_url: str
+    users: int
+    duration: float
+    ramp_up: float
+    scenarios: Tuple[str, ...]
+    start_at: float = 0.0  # time.time() when user 0 starts, the same in every worker
+    think_ms: int = 0
+    headless: bool = True
+    user_ids: List[int] = field(default_factory=list)
+
+    def start_of(self, user_id: int) -> float:
+        """Users start evenly over the ramp-up"""
+        return self.start_at + self.ramp_up * user_id / self.users
+
+    def split(self, processes: int) -> List['LoadPlan']:
+        """One plan per worker process, users dealt round-robin so each ramps up evenly"""
+        plans = [LoadPlan(**{**asdict(self), 'user_ids': list(range(index, self.users, processes))})
+                 for index in range(processes)]
+        return [plan for plan in plans if plan.user_ids]
+
+
+class StepFailed(Exception):
+    """A step raised or a check failed; the error is already recorded against the step"""
+
+
+class VirtualUser:
+    """One synthetic user: a browser context with a page and the page objects on it"""
+
+    def __init__(self, page, base_url: str, results: LoadResults):
+        self.page = page
+        self.base_url = base_url
+        self.results = results
+        self._page_objects = {}
+
+    def page_object(self, page_class):
+        if page_class not in self._page_objects:
+            page_object = page_class(self.page)
+            page_object.base_url = self.base_url
+            self._page_objects[page_class] = page_object
+        return self._page_objects[page_class]
+
+    async def step(self, name: str, action: Awaitable, check: Optional[Callable] = None):
+        """Await one page-object call and time it; check(result) False counts as an error"""
+        start = time.perf_counter()
+        try:
+            result = await action
+            if check is not None and not check(result):
+                raise AssertionError(f"{name}: unexpected result {result!r}")
+        except Exception as error:
+            self.results.record_error(name, error)
+            raise StepFailed(name) from error
+        self.results.record_step(name, (time.perf_counter() - start) * 1000)
+        return result
+
+
+async def login_scenario(user: VirtualUser):
+    """Open the login page, log in, check the success message, log out"""
+    login_page = user.page_object(AsyncPracticeLoginPage)
+    await user.step("login.open", login_page.navigate_to_login())
+    await user.step("login.submit", login_page.login_with_valid_credentials())
+    await user.step("login.verify", login_page.is_logged_in(), check=bool)
+    await user.step("login.logout", login_page.logout())
+
+
+async def add_remove_scenario(user: VirtualUser):
+    """Add a row, wait for it, remove it and wait for the confirmation"""
+    exceptions_page = user.page_object(AsyncPracticeExceptionsPage)
+    await user.step("exceptions.open", exceptions_page.navigate_to_exceptions())
+    await user.step("exceptions.add", exceptions_page.click_add_button())
+    await user.step("exceptions.row2", exceptions_page.wait_for_second_row())
+    await user.step("exceptions.remove", exceptions_page.click_remove_button())
+    await user.step("exceptions.confirmation", exceptions_page.get_confirmation_message(),
+                    check=lambda text: "removed" in text)
+
+
+SCENARIOS: Dict[str, Callable[[VirtualUser], Awaitable]] = {
+    'login': login_scenario,
+    'add-remove': add_remove_scenario,
+}
+
+
+async def _sleep_until(moment: float):
+    delay = moment - time.time()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+async def _run_user(browser, plan: LoadPlan, user_id: int, results: LoadResults):
+    """Loop over the scenarios (each user starts at a different one) until the deadline"""
+    await _sleep_until(plan.start_of(user_id))
+    context = await browser.new_context()
+    user = VirtualUser(await context.new_page(), plan.base_url, results)
+    deadline = plan.start_at + plan.duration
+    iteration = user_id
+    try:
+        while time.time() < deadline:
+            scenario = plan.scenarios[iteration % len(plan.scenarios)]
+            try:
+                await SCENARIOS[scenario](user)
+                passed = True
+            except StepFailed:
+                passed = False
+            results.record_iteration(scenario, passed, int(time.time() - plan.start_at))
+            await context.clear_cookies()  # next iteration is a new visitor
+            iteration += 1
+            if plan.think_ms:
+                await asyncio.sleep(plan.think_ms / 1000)
+    finally:
+        await context.close()
+
+
+async def run_users(plan: LoadPlan) -> LoadResults:
+    """This process's users on one browser"""
+    results = LoadResults()
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=plan.headless)
+        try:
+            await asyncio.gather(*(_run_user(browser, plan, user_id, results) for user_id in plan.user_ids))
+        finally:
+            await browser.close()
+    return results
+
+
+def _worker(plan: LoadPlan, queue):
+    # A learned budget would follow this run's own latencies (and earlier functional runs)
+    wait_stats.learning = False
+    try:
+        queue.put(asyncio.run(run_users(plan)).to_dict())
+    except Exception as error:  # reported by the parent, which is waiting on the queue
+        queue.put({'error': f"{type(error).__name__}: {error}"})
+
+
+def run_stage(plan: LoadPlan, processes: int, startup_s: float = 5.0) -> Tuple[LoadResults, float, float]:
+    """Run plan over worker processes; returns merged results, wall seconds and CPU busy share
+
+    Workers are spawned (no fork with the server thread running) and get the
+    Config snapshot instead of re-reading .env. The clock starts startup_s
+    later so browser launches don't count as load.
+    """
+    share_with_workers()
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    plan.start_at = time.time() + startup_s
+    workers = [context.Process(target=_worker, args=(worker_plan, queue), daemon=True)
+               for worker_plan in plan.split(processes)]
+    cpu_before = os.times()
+    for worker in workers:
+        worker.start()
+    merged = LoadResults()
+    failures = []
+    for _ in workers:
+        payload = queue.get()  # before join(), so a full pipe can't deadlock
+        if 'error' in payload:
+            failures.append(payload['error'])
+        else:
+            merged.merge(LoadResults.from_dict(payload))
+    for worker in workers:
+        worker.join()
+    wall = max(time.time() - plan.start_at, 1e-9)
+    cpu_after = os.times()
+    # This process (the in-process server) plus the workers and their browsers once reaped
+    cpu = sum(after - before for after, before in zip(cpu_after[:4], cpu_before[:4]))
+    if failures:
+        raise RuntimeError(f"{len(failures)} worker(s) failed: {failures[0]}")
+    return merged, wall, cpu / ((wall + startup_s) * (os.cpu_count() or 1))
+
+
+def print_stage(users: int, summary: dict):
+    print(f"👥 {users} users: {summary['throughput']:.1f} iterations/s "
+          f"({summary['steady_throughput']:.1f}/s after ramp-up), {summary['iterations']} passed, "
+          f"{summary['failed_iterations']} failed ({summary['error_rate']:.1%}), CPU {summary['cpu_busy']:.0%}")
+    print(f"  {'step':<26} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    for step, row in summary['steps'].items():
+        print(f"  {step:<26} {row['count']:>7} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+              f"{row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} {row['error_rate']:>7.1%}")
+        for error_type, count in row['error_types'].items():
+            print(f"    {count} x {error_type}")
+
+
+def run(args, base_url: str) -> List[dict]:
+    """One stage, or doubling stages with --scale; returns their summaries"""
+    stages = []
+    users = args.users
+    while True:
+        plan = LoadPlan(base_url=base_url, users=users, duration=args.duration, ramp_up=args.ramp_up,
+                        scenarios=tuple(args.scenario or SCENARIOS), think_ms=args.think_ms,
+                        headless=not args.headed)
+        results, wall, cpu_busy = run_stage(plan, min(args.processes, users))
+        summary = {'users': users, 'wall_s': wall, 'cpu_busy': cpu_busy, **results.summary(wall, args.ramp_up, args.duration)}
+        stages.append(summary)
+        print_stage(users, summary)
+        if not args.scale or users * 2 > args.max_users:
+            break
+        if summary['error_rate'] > args.max_error_rate:
+            print(f"🛑 error rate above {args.max_error_rate:.0%}, stopping")
+            break
+        if len(stages) > 1 and summary['steady_throughput'] < stages[-2]['steady_throughput'] * (1 + MIN_SCALE_GAIN):
+            print(f"🛑 throughput grew less than {MIN_SCALE_GAIN:.0%} - saturated at ~{stages[-2]['users']} users")
+            break
+        users *= 2
+    return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Virtual users (first stage with --scale)")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per stage, ramp-up included")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Seconds over which users start")
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Worker processes, one browser each")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default all; users alternate between them)")
+    parser.add_argument("--think-ms", type=int, default=0, help="Pause between a user's iterations")
+    parser.add_argument("--url", help="Already running server (default: start practice_server.py in-process)")
+    parser.add_argument("--latency-ms", type=int, default=0, help="In-process server: delay added to responses")
+    parser.add_argument("--row2-delay-ms", type=int, default=500, help="In-process server: how long Add takes")
+    parser.add_argument("--scale", action="store_true", help="Double the users until throughput stops growing")
+    parser.add_argument("--max-users", type=int, default=160, help="Upper bound for --scale")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="--scale stops above this error rate")
+    parser.add_argument("--json", type=Path, help="Write plan, stage summaries and histograms here")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        server = PracticeServer(options=ServerOptions(latency_ms=args.latency_ms,
+                                                      row2_delay_ms=args.row2_delay_ms)).start()
+        base_url = server.url
+    configure(LOCAL_SITE_URL=base_url)
+    print(f"🚦 Load on {base_url}: {args.processes} process(es), {args.duration:.0f}s per stage, "
+          f"{args.ramp_up:.0f}s ramp-up, scenarios {', '.join(args.scenario or SCENARIOS)}")
+    try:
+        stages = run(args, base_url)
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        plan = {key: value for key, value in vars(args).items() if key != 'json'}
+        args.json.write_text(json.dumps({'plan': {**plan, 'url': base_url}, 'stages': stages}, indent=2))
+        print(f"Results: {args.json}")
+    # With --scale the last stage is expected to hit a limit; only a failing first stage is an error
+    return 1 if stages[0]['error_rate'] > args.max_error_rate else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,98 +2,413 @@
 """
 Custom Playwright Python linting rules
 Similar to eslint-plugin-playwright but for Python
+
+Usage: python playwright_linter.py <file_or_directory> [--jobs N] [--format text|json|sarif] [--no-cache]
+
+Files are linted in a process pool with --jobs, and results are cached by
+file content hash + RULES_VERSION so unchanged files are skipped next run.
+Exit code is 0 when every file passes and 1 otherwise, in every format.
 """
 
+import argparse
 import ast
+import hashlib
+import json
+import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-class PlaywrightLinter(ast.NodeVisitor):
-    """Custom linter for Playwright Python best practices"""
-    
-    def __init__(self):
-        self.errors = []
-        self.line_number = 0
-    
-    def visit_Call(self, node):
-        """Check function calls for Playwright anti-patterns"""
-        
-        # Check for time.sleep() usage (should use Playwright waits)
-        if (hasattr(node.func, 'attr') and 
-            node.func.attr == 'sleep' and
-            hasattr(node.func.value, 'id') and 
+# Bump whenever a rule changes so cached results are thrown away
+RULES_VERSION = "3"
+
+DEFAULT_CACHE_FILE = ".playwright_lint_cache.json"
+
+# Actions that already auto-wait for the element to be visible and enabled
+AUTO_WAITING_ACTIONS = {'click', 'dblclick', 'fill', 'type', 'press', 'check', 'uncheck',
+                        'select_option', 'hover', 'tap', 'set_input_files', 'press_sequentially'}
+
+# Playwright async API calls that do nothing unless awaited. close() is left out:
+# asyncio's StreamWriter.close() and Server.close() are synchronous.
+ASYNC_PLAYWRIGHT_METHODS = AUTO_WAITING_ACTIONS | {
+    'goto', 'reload', 'go_back', 'go_forward', 'screenshot', 'wait_for_selector',
+    'wait_for_load_state', 'wait_for_url', 'wait_for_timeout', 'wait_for_function',
+    'text_content', 'inner_text', 'is_visible', 'evaluate', 'new_page', 'new_context',
+}
+
+LOOP_TYPES = (ast.For, ast.AsyncFor, ast.While)
+FUNCTION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+RULES = []
+
+def register(rule_class):
+    """Class decorator adding a rule instance to the default rule set"""
+    RULES.append(rule_class())
+    return rule_class
+
+def _method_name(node):
+    """'click' for page.click(...), None for plain function calls"""
+    return node.func.attr if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) else None
+
+def _string_args(node):
+    return [arg.value for arg in list(node.args) + [kw.value for kw in node.keywords]
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str)]
+
+class Rule:
+    """A lint rule: declares the AST node types it wants and checks one node at a time"""
+
+    id = ""
+    node_types = ()
+
+    def check(self, node, linter):
+        raise NotImplementedError
+
+@register
+class NoTimeSleep(Rule):
+    """time.sleep() instead of Playwright waits"""
+
+    id = 'no-time-sleep'
+    node_types = (ast.Call,)
+
+    def check(self, node, linter):
+        if (_method_name(node) == 'sleep' and
+            isinstance(node.func.value, ast.Name) and
             node.func.value.id == 'time'):
-            self.errors.append(
-                f"Line {node.lineno}: Avoid time.sleep(). Use page.wait_for_*() methods instead"
+            linter.report(node, self.id,
+                "Avoid time.sleep(). Use page.wait_for_*() methods instead"
             )
-        
-        # Check for hardcoded selectors (should be in page objects)
-        if (hasattr(node.func, 'attr') and 
-            node.func.attr in ['click', 'fill', 'locator'] and
-            node.args):
+
+@register
+class NoHardcodedSelector(Rule):
+    """Selector literals outside page objects"""
+
+    id = 'no-hardcoded-selector'
+    node_types = (ast.Call,)
+
+    def check(self, node, linter):
+        if _method_name(node) in ('click', 'fill', 'locator') and node.args:
             first_arg = node.args[0]
-            if (hasattr(first_arg, 's') and 
-                isinstance(first_arg.s, str) and
-                ('#' in first_arg.s or '.' in first_arg.s)):
-                self.errors.append(
-                    f"Line {node.lineno}: Consider moving selector '{first_arg.s[:20]}...' to page object"
+            if (isinstance(first_arg, ast.Constant) and
+                isinstance(first_arg.value, str) and
+                ('#' in first_arg.value or '.' in first_arg.value)):
+                linter.report(node, self.id,
+                    f"Consider moving selector '{first_arg.value[:20]}...' to page object"
                 )
-        
-        self.generic_visit(node)
-    
-    def visit_Await(self, node):
-        """Check await patterns"""
-        # Could add checks for missing awaits on async Playwright methods
-        self.generic_visit(node)
+
+@register
+class NoWaitForTimeout(Rule):
+    """Fixed sleeps through page.wait_for_timeout()"""
+
+    id = 'no-wait-for-timeout'
+    node_types = (ast.Call,)
+
+    def check(self, node, linter):
+        if _method_name(node) == 'wait_for_timeout':
+            linter.report(node, self.id,
+                "Avoid wait_for_timeout(). Wait for a selector, URL or expect() condition instead"
+            )
+
+@register
+class NoNetworkIdleInLoop(Rule):
+    """networkidle waits repeated inside a loop"""
+
+    id = 'no-networkidle-in-loop'
+    node_types = (ast.Call,)
+
+    def check(self, node, linter):
+        if (linter.loop_depth and
+            _method_name(node) == 'wait_for_load_state' and
+            'networkidle' in _string_args(node)):
+            linter.report(node, self.id,
+                "wait_for_load_state('networkidle') inside a loop costs 500 ms+ per iteration"
+            )
+
+@register
+class NoRedundantVisibilityCheck(Rule):
+    """expect(x).to_be_visible() right before an action on x that auto-waits anyway"""
+
+    id = 'no-redundant-visibility-check'
+    node_types = (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.For, ast.AsyncFor,
+                  ast.While, ast.If, ast.With, ast.AsyncWith, ast.Try, ast.ExceptHandler)
+
+    @staticmethod
+    def _call(statement):
+        value = statement.value if isinstance(statement, ast.Expr) else None
+        return value.value if isinstance(value, ast.Await) else value
+
+    @staticmethod
+    def _visibility_target(call):
+        """ast.dump of x for expect(x).to_be_visible(), else None"""
+        if _method_name(call) != 'to_be_visible' or call.args or call.keywords:
+            return None
+        expect_call = call.func.value
+        if (isinstance(expect_call, ast.Call) and isinstance(expect_call.func, ast.Name) and
+            expect_call.func.id == 'expect' and len(expect_call.args) == 1):
+            return ast.dump(expect_call.args[0])
+        return None
+
+    def check(self, node, linter):
+        for field in ('body', 'orelse', 'finalbody'):
+            statements = getattr(node, field, None)
+            if not isinstance(statements, list):
+                continue
+            for current, following in zip(statements, statements[1:]):
+                target = self._visibility_target(self._call(current))
+                action = self._call(following)
+                if (target and _method_name(action) in AUTO_WAITING_ACTIONS and
+                    ast.dump(action.func.value) == target):
+                    linter.report(current, self.id,
+                        f"Redundant visibility check: {action.func.attr}() already waits for the element"
+                    )
+
+@register
+class MissingAwait(Rule):
+    """Async Playwright call used as a statement without await"""
+
+    id = 'missing-await'
+    node_types = (ast.Expr,)
+
+    def check(self, node, linter):
+        if (linter.in_async_function and
+            _method_name(node.value) in ASYNC_PLAYWRIGHT_METHODS):
+            linter.report(node, self.id,
+                f"{node.value.func.attr}() is not awaited inside an async function"
+            )
+
+class PlaywrightLinter(ast.NodeVisitor):
+    """Custom linter for Playwright Python best practices
+
+    Walks the tree once and hands each node only to the rules registered for its type,
+    so adding a rule doesn't add another traversal. Still an ast.NodeVisitor with a list
+    of 'Line N: message' strings in .errors, but visit_<Node> methods of subclasses are
+    no longer called: write a Rule instead.
+    """
+
+    def __init__(self, rules=None):
+        self.issues = []
+        self.errors = []
+        self.loop_depth = 0
+        self._function_stack = []
+        self._dispatch = {}
+        for rule in RULES if rules is None else rules:
+            for node_type in rule.node_types:
+                self._dispatch.setdefault(node_type, []).append(rule)
+
+    @property
+    def in_async_function(self):
+        return bool(self._function_stack) and isinstance(self._function_stack[-1][0], ast.AsyncFunctionDef)
+
+    def report(self, node, rule, message):
+        self.issues.append({'line': node.lineno, 'rule': rule, 'message': message})
+        self.errors.append(f"Line {node.lineno}: {message}")
+
+    def visit(self, node):
+        """Dispatch node to interested rules, then walk its children"""
+        for rule in self._dispatch.get(type(node), ()):
+            rule.check(node, self)
+
+        is_loop = isinstance(node, LOOP_TYPES)
+        is_function = isinstance(node, FUNCTION_TYPES)
+        if is_function:
+            # A function body defined in a loop doesn't run per iteration of that loop
+            self._function_stack.append((node, self.loop_depth))
+            self.loop_depth = 0
+        elif is_loop:
+            self.loop_depth += 1
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+        if is_function:
+            _, self.loop_depth = self._function_stack.pop()
+        elif is_loop:
+            self.loop_depth -= 1
+
+def lint_source(content, filename="<string>"):
+    """Lint Python source text, returning a list of issue dicts"""
+    tree = ast.parse(content, filename=filename)
+    linter = PlaywrightLinter()
+    linter.visit(tree)
+    return sorted(linter.issues, key=lambda issue: issue['line'])
+
+def _lint_job(job):
+    """Process-pool worker: (path, content) -> (path, issues, error)"""
+    path, content = job
+    try:
+        return path, lint_source(content, path), None
+    except Exception as e:
+        return path, [], str(e)
+
+class LintCache:
+    """Results per file keyed by content hash; dropped wholesale when rules change"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.files = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get('rules_version') == RULES_VERSION:
+                self.files = data.get('files', {})
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def get(self, path, digest):
+        entry = self.files.get(path)
+        if entry and entry['sha256'] == digest:
+            return entry['issues']
+        return None
+
+    def put(self, path, digest, issues):
+        self.files[path] = {'sha256': digest, 'issues': issues}
+        self.dirty = True
+
+    def save(self):
+        if self.dirty:
+            payload = {'rules_version': RULES_VERSION, 'files': self.files}
+            self.path.write_text(json.dumps(payload))
+
+def collect_files(target):
+    """Python files to lint for a file or directory target"""
+    target = Path(target)
+    if target.is_file():
+        return [target] if target.suffix == '.py' else []
+    if target.is_dir():
+        return sorted(target.rglob("*.py"))
+    return []
+
+def lint_paths(paths, jobs=1, cache=None):
+    """Lint files (in parallel when jobs > 1), reusing cached results for unchanged files
+
+    Returns a list of {'path', 'issues', 'error', 'cached'} dicts in path order.
+    """
+    results = {}
+    pending = []
+    digests = {}
+    for path in map(str, paths):
+        try:
+            raw = Path(path).read_bytes()
+        except OSError as e:
+            results[path] = {'path': path, 'issues': [], 'error': str(e), 'cached': False}
+            continue
+        digest = hashlib.sha256(raw).hexdigest()
+        cached = cache.get(path, digest) if cache else None
+        if cached is not None:
+            results[path] = {'path': path, 'issues': cached, 'error': None, 'cached': True}
+            continue
+        digests[path] = digest
+        pending.append((path, raw.decode('utf-8', errors='replace')))
+
+    if jobs > 1 and len(pending) > 1:
+        chunksize = max(1, len(pending) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outcomes = list(pool.map(_lint_job, pending, chunksize=chunksize))
+    else:
+        outcomes = [_lint_job(job) for job in pending]
+
+    for path, issues, error in outcomes:
+        results[path] = {'path': path, 'issues': issues, 'error': error, 'cached': False}
+        if cache and error is None:
+            cache.put(path, digests[path], issues)
+    return [results[path] for path in sorted(results)]
 
 def check_file(file_path):
     """Check a Python file for Playwright best practices"""
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        # Parse the AST
-        tree = ast.parse(content)
-        linter = PlaywrightLinter()
-        linter.visit(tree)
-        
-        if linter.errors:
-            print(f"\n❌ Playwright issues in {file_path}:")
-            for error in linter.errors:
-                print(f"  {error}")
-            return False
+    result = lint_paths([file_path])[0]
+    print_text([result])
+    return not result['issues'] and not result['error']
+
+def print_text(results):
+    """Human-readable report (the original linter output)"""
+    for result in results:
+        if result['error']:
+            print(f"Error checking {result['path']}: {result['error']}")
+        elif result['issues']:
+            print(f"\n❌ Playwright issues in {result['path']}:")
+            for issue in result['issues']:
+                print(f"  Line {issue['line']}: {issue['message']}")
         else:
-            print(f"✅ {file_path} - No Playwright issues found")
-            return True
-            
-    except Exception as e:
-        print(f"Error checking {file_path}: {e}")
-        return False
+            print(f"✅ {result['path']} - No Playwright issues found")
+
+def to_json(results):
+    return json.dumps({'rules_version': RULES_VERSION, 'files': results}, indent=2)
+
+def to_sarif(results):
+    """SARIF 2.1.0 log for code-scanning UIs"""
+    sarif_results = []
+    rule_ids = set()
+    for result in results:
+        for issue in result['issues']:
+            rule_ids.add(issue['rule'])
+            sarif_results.append({
+                'ruleId': issue['rule'],
+                'level': 'warning',
+                'message': {'text': issue['message']},
+                'locations': [{
+                    'physicalLocation': {
+                        'artifactLocation': {'uri': Path(result['path']).as_posix()},
+                        'region': {'startLine': issue['line']},
+                    }
+                }],
+            })
+        if result['error']:
+            sarif_results.append({
+                'ruleId': 'parse-error',
+                'level': 'error',
+                'message': {'text': result['error']},
+                'locations': [{'physicalLocation': {'artifactLocation': {'uri': Path(result['path']).as_posix()}}}],
+            })
+            rule_ids.add('parse-error')
+    log = {
+        '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {'driver': {
+                'name': 'playwright_linter',
+                'version': RULES_VERSION,
+                'rules': [{'id': rule_id} for rule_id in sorted(rule_ids)],
+            }},
+            'results': sarif_results,
+        }],
+    }
+    return json.dumps(log, indent=2)
+
+def run(argv):
+    """Run the linter CLI and return the exit code"""
+    parser = argparse.ArgumentParser(description="Playwright Python best-practice linter")
+    parser.add_argument("target", help="File or directory to lint")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--format", choices=["text", "json", "sarif"], default="text")
+    parser.add_argument("--cache-file", default=DEFAULT_CACHE_FILE,
+                        help="Where to keep results of unchanged files")
+    parser.add_argument("--no-cache", action="store_true", help="Lint every file from scratch")
+    args = parser.parse_args(argv)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    cache = None if args.no_cache else LintCache(args.cache_file)
+    results = lint_paths(collect_files(args.target), jobs=jobs, cache=cache)
+    if cache:
+        cache.save()
+    all_good = not any(result['issues'] or result['error'] for result in results)
+
+    if args.format == "json":
+        print(to_json(results))
+    elif args.format == "sarif":
+        print(to_sarif(results))
+    else:
+        print_text(results)
+        if all_good:
+            print("\n🎉 All files pass Playwright best practices!")
+        else:
+            print("\n💡 Fix the issues above for better Playwright code!")
+    return 0 if all_good else 1
 
 def main():
     """Main linter function"""
     if len(sys.argv) < 2:
-        print("Usage: python playwright_linter.py <file_or_directory>")
-        sys.exit(1)
-    
-    target = Path(sys.argv[1])
-    all_good = True
-    
-    if target.is_file():
-        if target.suffix == '.py':
-            all_good = check_file(target)
-    elif target.is_dir():
-        for py_file in target.rglob("*.py"):
-            if not check_file(py_file):
-                all_good = False
-    
-    if all_good:
-        print("\n🎉 All files pass Playwright best practices!")
-        sys.exit(0)
-    else:
-        print("\n💡 Fix the issues above for better Playwright code!")
+        print("Usage: python playwright_linter.py <file_or_directory> [--jobs N] [--format text|json|sarif] [--no-cache]")
         sys.exit(1)
+    sys.exit(run(sys.argv[1:]))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the practice sites used by the test suite
+
+Serves the pages tests/test_practice_sites.py exercises, all from one origin:
+    /practice-test-login/         Practice Test Automation login + error messages
+    /logged-in-successfully/      its landing page (cookie session)
+    /practice-test-exceptions/    Add -> delayed #row2, Remove -> #confirmation
+    /login, /secure               The Internet login flow
+    /, /inventory.html            Sauce Demo login and cart badge
+
+Point the suite at it with LOCAL_SITE_URL (or pytest --local-site, which starts
+one in-process). asyncio + HTTP/1.1 keep-alive, so a single process serves
+thousands of requests per second; --workers N forks N processes on one port.
+
+Usage: python practice_server.py [--port 8000] [--latency-ms 0] [--slow PATH=MS] [--row2-delay-ms 5000] [--workers 1]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import multiprocessing
+import secrets
+import sys
+import threading
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from config import config
+
+PRACTICE_LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Test Login | Practice Test Automation</title></head>
+<body>
+  <section id="login">
+    <h2>Test login</h2>
+    <form method="post" action="/practice-test-login/">
+      <label for="username">Username</label><input id="username" name="username" type="text">
+      <label for="password">Password</label><input id="password" name="password" type="password">
+      <button id="submit" class="btn" type="submit">Submit</button>
+    </form>
+    {error}
+  </section>
+</body></html>"""
+
+PRACTICE_LOGGED_IN_PAGE = """<!DOCTYPE html>
+<html><head><title>Logged In Successfully | Practice Test Automation</title></head>
+<body>
+  <h1 class="post-title">Logged In Successfully</h1>
+  <p><strong>Congratulations {username}. You successfully logged in!</strong></p>
+  <a class="wp-block-button__link" href="/practice-test-login/">Log out</a>
+</body></html>"""
+
+PRACTICE_EXCEPTIONS_PAGE = """<!DOCTYPE html>
+<html><head><title>Test Exceptions | Practice Test Automation</title></head>
+<body>
+  <div id="rows">
+    <div id="row1" class="row">
+      <label>Row 1</label>
+      <input type="text" class="input-field" value="Pizza" disabled>
+      <button id="edit_btn" type="button">Edit</button>
+      <button id="add_btn" type="button">Add</button>
+    </div>
+  </div>
+  <div id="confirmation" style="display: none"></div>
+  <script>
+    document.getElementById("add_btn").addEventListener("click", () => {{
+      setTimeout(() => {{
+        const row = document.createElement("div");
+        row.id = "row2";
+        row.className = "row";
+        row.innerHTML = '<label>Row 2</label><input type="text" class="input-field">' +
+          '<button id="save_btn" type="button">Save</button><button id="remove_btn" type="button">Remove</button>';
+        row.querySelector("#remove_btn").addEventListener("click", () => {{
+          row.remove();
+          const confirmation = document.getElementById("confirmation");
+          confirmation.textContent = "Row 2 was removed";
+          confirmation.style.display = "block";
+        }});
+        document.getElementById("rows").appendChild(row);
+      }}, {row2_delay_ms});
+    }});
+  </script>
+</body></html>"""
+
+THE_INTERNET_LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>The Internet</title></head>
+<body>
+  {flash}
+  <h2>Login Page</h2>
+  <form id="login" method="post" action="/authenticate">
+    <input id="username" name="username" type="text">
+    <input id="password" name="password" type="password">
+    <button class="radius" type="submit">Login</button>
+  </form>
+</body></html>"""
+
+THE_INTERNET_SECURE_PAGE = """<!DOCTYPE html>
+<html><head><title>The Internet</title></head>
+<body>
+  <div id="flash" class="flash success">You logged into a secure area!</div>
+  <h2>Secure Area</h2>
+  <a class="button secondary radius" href="/login">Logout</a>
+</body></html>"""
+
+SAUCE_DEMO_LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Swag Labs</title></head>
+<body>
+  <form method="post" action="/">
+    <input id="user-name" name="user-name" data-test="username" type="text">
+    <input id="password" name="password" data-test="password" type="password">
+    {error}
+    <input id="login-button" data-test="login-button" type="submit" value="Login">
+  </form>
+</body></html>"""
+
+SAUCE_DEMO_INVENTORY_PAGE = """<!DOCTYPE html>
+<html><head><title>Swag Labs</title></head>
+<body>
+  <div id="shopping_cart_container"><a class="shopping_cart_link" href="#"></a></div>
+  <div class="inventory_item">
+    <div class="inventory_item_name">Sauce Labs Backpack</div>
+    <button id="add-to-cart-sauce-labs-backpack" data-test="add-to-cart-sauce-labs-backpack">Add to cart</button>
+  </div>
+  <script>
+    let items = 0;
+    document.querySelector("[data-test='add-to-cart-sauce-labs-backpack']").addEventListener("click", () => {
+      items += 1;
+      let badge = document.querySelector(".shopping_cart_badge");
+      if (!badge) {
+        badge = document.createElement("span");
+        badge.className = "shopping_cart_badge";
+        document.querySelector(".shopping_cart_link").appendChild(badge);
+      }
+      badge.textContent = String(items);
+    });
+  </script>
+</body></html>"""
+
+SAUCE_DEMO_LOCKED_OUT = ('locked_out_user',)
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def redirect(cls, location: str, **headers) -> 'Response':
+        return cls(302, headers={'Location': location, **headers})
+
+
+@dataclass
+class ServerOptions:
+    """Behaviour knobs shared by every worker process"""
+
+    latency_ms: int = 0
+    # Path prefix -> extra latency, e.g. {'/practice-test-exceptions/': 2000}
+    slow_paths: Dict[str, int] = field(default_factory=dict)
+    row2_delay_ms: int = 5000
+    # Signs session cookies, so forked workers accept each other's sessions
+    secret: bytes = field(default_factory=lambda: secrets.token_bytes(16))
+
+    def latency_for(self, path: str) -> int:
+        extra = max((ms for prefix, ms in self.slow_paths.items() if path.startswith(prefix)), default=0)
+        return self.latency_ms + extra
+
+
+def _sign(options: ServerOptions, user: str) -> str:
+    signature = hmac.new(options.secret, user.encode(), hashlib.sha256).hexdigest()[:32]
+    return f"{user}.{signature}"
+
+
+def _session_user(options: ServerOptions, cookies: Dict[str, str], name: str) -> Optional[str]:
+    user, _, _ = cookies.get(name, "").rpartition(".")
+    if user and hmac.compare_digest(_sign(options, user), cookies[name]):
+        return user
+    return None
+
+
+def _cookie(name: str, value: str) -> str:
+    return f"{name}={value}; Path=/; HttpOnly"
+
+
+def handle(options: ServerOptions, method: str, path: str, cookies: Dict[str, str],
+           form: Dict[str, str]) -> Response:
+    """Route one request to the matching fake page"""
+    if path == "/practice-test-login/":
+        if method == "POST":
+            username, password = form.get("username", ""), form.get("password", "")
+            if username != config.PRACTICE_CREDENTIALS['valid_username']:
+                error = "Your username is invalid!"
+            elif password != config.PRACTICE_CREDENTIALS['valid_password']:
+                error = "Your password is invalid!"
+            else:
+                return Response.redirect("/logged-in-successfully/",
+                                         **{'Set-Cookie': _cookie("practice_session", _sign(options, username))})
+            return Response(body=PRACTICE_LOGIN_PAGE.format(error=f'<div id="error" class="show">{error}</div>'))
+        return Response(body=PRACTICE_LOGIN_PAGE.format(error='<div id="error"></div>'))
+
+    if path == "/logged-in-successfully/":
+        user = _session_user(options, cookies, "practice_session")
+        if not user:
+            return Response.redirect("/practice-test-login/")
+        return Response(body=PRACTICE_LOGGED_IN_PAGE.format(username=user))
+
+    if path == "/practice-test-exceptions/":
+        return Response(body=PRACTICE_EXCEPTIONS_PAGE.format(row2_delay_ms=options.row2_delay_ms))
+
+    if path == "/login":
+        return Response(body=THE_INTERNET_LOGIN_PAGE.format(flash=""))
+
+    if path == "/authenticate" and method == "POST":
+        username, password = config.get_the_internet_credentials()
+        if form.get("username") != username:
+            flash = '<div id="flash" class="flash error">Your username is invalid!</div>'
+        elif form.get("password") != password:
+            flash = '<div id="flash" class="flash error">Your password is invalid!</div>'
+        else:
+            return Response.redirect("/secure", **{'Set-Cookie': _cookie("internet_session", _sign(options, username))})
+        return Response(body=THE_INTERNET_LOGIN_PAGE.format(flash=flash))
+
+    if path == "/secure":
+        if not _session_user(options, cookies, "internet_session"):
+            return Response.redirect("/login")
+        return Response(body=THE_INTERNET_SECURE_PAGE)
+
+    if path == "/":
+        if method == "POST":
+            username, password = form.get("user-name", ""), form.get("password", "")
+            if username in SAUCE_DEMO_LOCKED_OUT:
+                error = "Epic sadface: Sorry, this user has been locked out."
+            elif config.SAUCE_DEMO_CREDENTIALS.get(username) != password:
+                error = "Epic sadface: Username and password do not match any user in this service"
+            else:
+                return Response.redirect("/inventory.html",
+                                         **{'Set-Cookie': _cookie("sauce_session", _sign(options, username))})
+            return Response(body=SAUCE_DEMO_LOGIN_PAGE.format(error=f'<h3 data-test="error">{error}</h3>'))
+        return Response(body=SAUCE_DEMO_LOGIN_PAGE.format(error=""))
+
+    if path == "/inventory.html":
+        if not _session_user(options, cookies, "sauce_session"):
+            return Response.redirect("/")
+        return Response(body=SAUCE_DEMO_INVENTORY_PAGE)
+
+    if path == "/favicon.ico":
+        return Response(204)
+    return Response(404, "Not found")
+
+
+def _parse_cookies(header: str) -> Dict[str, str]:
+    cookies = {}
+    for cookie in header.split(";"):
+        name, _, value = cookie.strip().partition("=")
+        if name:
+            cookies[name] = value
+    return cookies
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    """(method, target, version, headers, body), or None when the client closed the connection"""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, target, version = request_line.decode("latin-1").split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0"))
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+
+async def _serve_connection(options: ServerOptions, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            request = await _read_request(reader)
+            if request is None:
+                break
+            method, target, version, headers, body = request
+            path = urlsplit(target).path
+            form = {name: values[0] for name, values in parse_qs(body.decode()).items()} if body else {}
+            response = handle(options, method, path, _parse_cookies(headers.get("cookie", "")), form)
+            delay = options.latency_for(path)
+            if delay:
+                await asyncio.sleep(delay / 1000)
+
+            keep_alive = (headers.get("connection", "").lower() != "close" and
+                          (version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive"))
+            payload = response.body.encode()
+            head = [f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}",
+                    "Content-Type: text/html; charset=utf-8",
+                    f"Content-Length: {len(payload)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+            head.extend(f"{name}: {value}" for name, value in response.headers.items())
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + (b"" if method == "HEAD" else payload))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _start(options: ServerOptions, host: str, port: int, reuse_port: bool = False) -> asyncio.AbstractServer:
+    return await asyncio.start_server(lambda reader, writer: _serve_connection(options, reader, writer),
+                                      host, port, reuse_port=reuse_port or None, backlog=1024)
+
+
+def _serve_forever(options: ServerOptions, host: str, port: int, reuse_port: bool):
+    async def main():
+        server = await _start(options, host, port, reuse_port)
+        async with server:
+            await server.serve_forever()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+class PracticeServer:
+    """Runs the server on an event loop in a background thread (port 0 = any free port)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, options: Optional[ServerOptions] = None):
+        self.host = host
+        self.port = port
+        self.options = options or ServerOptions()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> 'PracticeServer':
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(
+            _start(self.options, self.host, self.port), self.loop
+        ).result()
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    def stop(self):
+        async def close():
+            self.server.close()
+            await self.server.wait_closed()
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _parse_slow(value: str) -> Tuple[str, int]:
+    path, _, ms = value.partition("=")
+    if not path.startswith("/") or not ms.isdigit():
+        raise argparse.ArgumentTypeError(f"expected PATH=MS, got '{value}'")
+    return path, int(ms)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every response")
+    parser.add_argument("--slow", type=_parse_slow, action="append", default=[], metavar="PATH=MS",
+                        help="Extra delay for paths starting with PATH (repeatable)")
+    parser.add_argument("--row2-delay-ms", type=int, default=5000, help="How long Add takes to show #row2")
+    parser.add_argument("--workers", type=int, default=1, help="Processes sharing the port (SO_REUSEPORT)")
+    args = parser.parse_args(argv)
+
+    # A fixed secret: sessions cached under .auth/ stay valid when the server restarts
+    options = ServerOptions(latency_ms=args.latency_ms, slow_paths=dict(args.slow), row2_delay_ms=args.row2_delay_ms,
+                            secret=config.LOCAL_SITE_SECRET.encode())
+    print(f"🌐 Practice sites on http://{args.host}:{args.port} ({args.workers} worker(s)) - "
+          f"run the suite with LOCAL_SITE_URL=http://{args.host}:{args.port}")
+    if args.workers == 1:
+        _serve_forever(options, args.host, args.port, reuse_port=False)
+        return 0
+    workers = [multiprocessing.Process(target=_serve_forever, args=(options, args.host, args.port, True))
+               for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
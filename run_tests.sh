@@ -6,8 +6,8 @@
 PROJECT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 TESTS_DIR="${PROJECT_DIR}/tests"
 
-# Export PYTHONPATH to include tests directory
-export PYTHONPATH="${TESTS_DIR}"
+# Export PYTHONPATH to include the project root (config.py) and tests directory
+export PYTHONPATH="${PROJECT_DIR}:${TESTS_DIR}"
 
 # Activate virtual environment if it exists
 if [[ -f "${PROJECT_DIR}/venv/bin/activate" ]]; then
@@ -28,11 +28,96 @@ echo "🚀 Running Practice Playwright tests..."
 echo "📂 Project directory: ${PROJECT_DIR}"
 echo "🐍 Python path: ${PYTHONPATH}"
 
+# Pull out --workers N (parallel mode) and --browsers LIST (matrix mode);
+# everything else goes straight to pytest
+WORKERS=0
+BROWSERS=""
+PYTEST_ARGS=()
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --workers)
+            WORKERS="${2-}"
+            shift $(( $# > 1 ? 2 : 1 ))
+            ;;
+        --workers=*)
+            WORKERS="${1#*=}"
+            shift
+            ;;
+        --browsers)
+            BROWSERS="${2-}"
+            shift $(( $# > 1 ? 2 : 1 ))
+            ;;
+        --browsers=*)
+            BROWSERS="${1#*=}"
+            shift
+            ;;
+        *)
+            PYTEST_ARGS+=("$1")
+            shift
+            ;;
+    esac
+done
+
+# [[ -gt ]] would evaluate anything else as an arithmetic expression (or fail on it)
+if ! [[ "${WORKERS}" =~ ^[0-9]+$ ]]; then
+    echo "❌ --workers needs a whole number, got '${WORKERS}'" >&2
+    echo "Usage: $0 [--workers N] [--browsers chromium,firefox,webkit] [pytest args...]" >&2
+    exit 2
+fi
+
+if [[ -n "${BROWSERS}" ]]; then
+    # One shared browser server per engine, every engine's tests at the same time
+    echo "🌐 Browser matrix: ${BROWSERS}"
+    export PRACTICE_CONFIG_SNAPSHOT="$(cd "${PROJECT_DIR}" && python config.py)"
+    cd "${PROJECT_DIR}" && exec python -m tests.utils.browser_matrix \
+        --browsers "${BROWSERS}" --workers-per-browser "$(( WORKERS > 1 ? WORKERS : 1 ))" "${PYTEST_ARGS[@]}"
+fi
+
+if [[ "${WORKERS}" -gt 1 ]]; then
+    # One pytest process (and browser) per worker, tests split by historical duration
+    REPORT_DIR="${PROJECT_DIR}/.shard-reports"
+    rm -rf "${REPORT_DIR}"
+    mkdir -p "${REPORT_DIR}"
+    if [[ ${#PYTEST_ARGS[@]} -eq 0 ]]; then
+        PYTEST_ARGS=("${TESTS_DIR}")
+    fi
+    echo "🧪 Running on ${WORKERS} workers: ${PYTEST_ARGS[*]}"
+    # Settings are parsed once here; workers load this snapshot instead of .env
+    export PRACTICE_CONFIG_SNAPSHOT="$(cd "${PROJECT_DIR}" && python config.py)"
+
+    PIDS=()
+    for ((i = 0; i < WORKERS; i++)); do
+        pytest "${PYTEST_ARGS[@]}" \
+            --num-shards "${WORKERS}" --shard-id "${i}" \
+            --shard-report-dir "${REPORT_DIR}" \
+            --context-pool "${CONTEXT_POOL_SIZE:-2}" \
+            > "${REPORT_DIR}/worker-${i}.log" 2>&1 &
+        PIDS+=($!)
+    done
+
+    STATUS=0
+    for i in "${!PIDS[@]}"; do
+        wait "${PIDS[$i]}"
+        CODE=$?
+        echo "  worker ${i}: $(tail -n 1 "${REPORT_DIR}/worker-${i}.log")"
+        # Exit code 5 = no tests collected (more workers than tests)
+        if [[ ${CODE} -ne 0 && ${CODE} -ne 5 ]]; then
+            STATUS=1
+            echo "  ❌ see ${REPORT_DIR}/worker-${i}.log"
+        fi
+    done
+
+    (cd "${PROJECT_DIR}" && python -m tests.utils.sharding report "${REPORT_DIR}")
+    # Replace the merged durations with the flaky plugin's medians of passing attempts
+    (cd "${PROJECT_DIR}" && python -m tests.utils.flaky durations)
+    exit ${STATUS}
+fi
+
 # Run the tests with provided arguments or default to all tests
-if [[ $# -eq 0 ]]; then
+if [[ ${#PYTEST_ARGS[@]} -eq 0 ]]; then
     echo "🧪 Running all practice tests..."
     pytest "${TESTS_DIR}/test_practice_sites.py" -v --headed
 else
-    echo "🧪 Running: $@"
-    pytest "$@"
-fi
\ No newline at end of file
+    echo "🧪 Running: ${PYTEST_ARGS[*]}"
+    pytest "${PYTEST_ARGS[@]}"
+fi
@@ -4,6 +4,24 @@ pytest configuration for Playwright tests
 
 import pytest
 from playwright.sync_api import Playwright, Browser
+from config import config
+from tests.utils.auth_state import AuthStateCache, LOGIN_RECIPES
+from tests.utils.context_pool import ContextPool, PoolStats
+
+pytest_plugins = [
+    "tests.plugins.sharding",
+    "tests.plugins.readiness",
+    "tests.plugins.network",
+    "tests.plugins.record_replay",
+    "tests.plugins.action_timing",
+    "tests.plugins.run_profile",
+    "tests.plugins.local_site",
+    "tests.plugins.wait_stats",
+    "tests.plugins.impact",
+    "tests.plugins.artifacts",
+    "tests.plugins.flaky",
+    "tests.plugins.browser_server",
+]
 
 @pytest.fixture(scope="session")
 def browser_context_args(browser_context_args):
@@ -15,10 +33,167 @@ def browser_context_args(browser_context_args):
     }
 
 @pytest.fixture(scope="session") 
-def browser_type_launch_args(browser_type_launch_args):
-    """Configure browser launch arguments"""
-    return {
-        **browser_type_launch_args,
-        # Don't override headless here - let command line flags control it
-        "slow_mo": 100      # Slow down by 100ms per action for demo purposes
-    }
\ No newline at end of file
+def browser_type_launch_args(browser_type_launch_args, pytestconfig, run_profile):
+    """Configure browser launch arguments from the run profile"""
+    launch_args = {**browser_type_launch_args}
+    # slow_mo comes from the profile through --slowmo (run_profile plugin); --headed wins over the profile
+    if run_profile["headless"] is not None and not pytestconfig.getoption("--headed"):
+        launch_args["headless"] = run_profile["headless"]
+    return launch_args
+
+@pytest.fixture(scope="session")
+def launch_browser(launch_browser, browser_type, browser_type_launch_args, pytestconfig):
+    """Connect to the shared browser server given by --browser-server instead of launching"""
+    ws_endpoint = pytestconfig.getoption("--browser-server")
+    if not ws_endpoint:
+        return launch_browser
+
+    def connect(**kwargs):
+        # headless etc. were decided when the server launched; slow_mo is applied client-side
+        options = {**browser_type_launch_args, **kwargs}
+        return browser_type.connect(ws_endpoint, slow_mo=options.get("slow_mo"), timeout=options.get("timeout"))
+    return connect
+
+# Filled by the context_pool fixture, read by the terminal summary below
+context_pool_stats_key = pytest.StashKey[PoolStats]()
+
+@pytest.fixture(scope="session")
+def context_pool(pytestconfig, browser: Browser, browser_context_args):
+    """One pool of pre-warmed contexts per worker process (None when disabled)
+    
+    Contexts are reset and checked for leftover state between tests; see ContextPool.
+    """
+    size = pytestconfig.getoption("--context-pool")
+    if not size:
+        yield None
+        return
+    # Recycled contexts outlive a single test, so per-test video can't be recorded
+    pool_context_args = {
+        key: value for key, value in browser_context_args.items()
+        if key != "record_video_dir"
+    }
+    pool = ContextPool(browser, pool_context_args, size)
+    pytestconfig.stash[context_pool_stats_key] = pool.stats
+    pool.warm()
+    yield pool
+    pool.close()
+
+class ContextSetup:
+    """Per-test instrumentation every context of a test gets: artifacts, trace, interception, record/replay"""
+
+    def __init__(self, node, network_interceptor, traffic_capture, lazy_trace, failure_artifacts):
+        self.node = node
+        self.network_interceptor = network_interceptor
+        self.traffic_capture = traffic_capture
+        self.lazy_trace = lazy_trace
+        self.failure_artifacts = failure_artifacts
+
+    def attach(self, context, label=""):
+        """label names extra contexts of the test (their artifacts go to a subdirectory)"""
+        if self.failure_artifacts:
+            self.failure_artifacts.start(context, self.node, label)
+        if self.lazy_trace:
+            self.lazy_trace.start(context, self.node, label)
+        if self.network_interceptor:
+            self.network_interceptor.install(context)
+        # Record/replay routes are added last so they take precedence over interception
+        if self.traffic_capture:
+            self.traffic_capture.install(context)
+
+    def detach(self, context, label="", reused=False, failed=None):
+        """Before the context is closed, or released to the pool when reused=True
+
+        failed is the outcome for a context closed before the test's reports exist (a login).
+        """
+        if self.failure_artifacts:
+            self.failure_artifacts.stop(context, self.node, label, failed)
+        if self.lazy_trace:
+            self.lazy_trace.stop(context, self.node, label, failed)
+        if self.traffic_capture:
+            self.traffic_capture.uninstall(context)
+        if self.network_interceptor and (reused or label):
+            self.network_interceptor.uninstall(context)
+
+@pytest.fixture
+def context_setup(request, network_interceptor, traffic_capture, lazy_trace, failure_artifacts) -> ContextSetup:
+    """Instrumentation for the contexts of the current test"""
+    return ContextSetup(request.node, network_interceptor, traffic_capture, lazy_trace, failure_artifacts)
+
+@pytest.fixture
+def context(request, context_pool, context_setup, rerun_attempt):
+    """Pooled context when --context-pool is set, otherwise pytest-playwright's fresh one
+
+    Reruns of a failed test always get a fresh context (see the flaky plugin).
+    """
+    pooled = context_pool is not None and not rerun_attempt
+    if not pooled:
+        test_context = request.getfixturevalue("new_context")()
+    else:
+        test_context = context_pool.acquire()
+    context_setup.attach(test_context)
+    yield test_context
+    context_setup.detach(test_context, reused=pooled)
+    if pooled:
+        context_pool.release(test_context)
+
+def _login_context_args(browser_context_args):
+    # Login contexts are throwaway - don't record video for them
+    return {key: value for key, value in browser_context_args.items() if key != "record_video_dir"}
+
+@pytest.fixture(scope="session")
+def auth_state_cache():
+    """Session-wide cache of logged-in storage_state files (authenticated_page logs in with the test's setup)"""
+    return AuthStateCache(config.AUTH_STATE_DIR, config.AUTH_STATE_TTL)
+
+@pytest.fixture
+def authenticated_page(browser: Browser, browser_context_args, new_context, auth_state_cache, context_setup):
+    """Factory returning a page whose context is already logged in
+    
+    Usage: page = authenticated_page("practice") or authenticated_page("sauce_demo", "problem_user")
+    Both the login (when the cache has to log in) and the returned context get the same
+    instrumentation as the `context` fixture, so --record/--replay cover them too.
+    """
+    login_context_args = _login_context_args(browser_context_args)
+    attached = []
+
+    def login(site, username, password, state_path):
+        label = f"login-{site}"
+        context = browser.new_context(**login_context_args)
+        context_setup.attach(context, label)
+        failed = True
+        try:
+            LOGIN_RECIPES[site](context.new_page(), username, password)
+            context.storage_state(path=state_path)
+            failed = False
+        finally:
+            context_setup.detach(context, label, failed=failed)
+            context.close()
+
+    def _authenticated_page(site="practice", credential_type=None):
+        state_path = auth_state_cache.get(site, credential_type, login=login)
+        test_context = new_context(storage_state=str(state_path))
+        label = f"authenticated-{len(attached)}"
+        context_setup.attach(test_context, label)
+        attached.append((test_context, label))
+        return test_context.new_page()
+    yield _authenticated_page
+    # Before pytest-playwright's new_context closes them
+    for test_context, label in attached:
+        context_setup.detach(test_context, label)
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Context pool hit rate and setup time saved (only with --context-pool)"""
+    stats = config.stash.get(context_pool_stats_key, None)
+    if stats is None or not stats.acquired:
+        return
+    summary = stats.as_dict()
+    terminalreporter.section("context pool")
+    terminalreporter.write_line(
+        f"hit rate {summary['hit_rate']:.0%} ({summary['hits']}/{summary['acquired']} tests reused a context), "
+        f"{summary['fallbacks']} leak fallback(s)"
+    )
+    terminalreporter.write_line(
+        f"new_context {summary['mean_create_ms']:.0f} ms vs reset {summary['mean_reset_ms']:.0f} ms: "
+        f"{summary['saved_per_hit_ms']:.0f} ms saved per reused context, "
+        f"{summary['saved_total_ms'] / 1000:.1f} s in total"
+    )
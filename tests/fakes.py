@@ -0,0 +1,256 @@
+"""
+Fake Playwright objects shared by the unit tests and the benchmarks (no browser needed)
+
+Each fake implements just the calls our code makes and records them, so tests
+assert on what happened (waits, actions, round-trips, route outcomes) instead
+of on a browser. AsyncFakePage is the same page for the async page objects.
+"""
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from tests.pages.locators import FILL_FORM_SCRIPT, WAIT_FOR_STATE_SCRIPT
+
+
+class FakeRequest:
+    def __init__(self, url, method="GET", post_data_buffer=None, resource_type="script"):
+        self.url = url
+        self.method = method
+        self.post_data_buffer = post_data_buffer
+        self.resource_type = resource_type
+
+
+class FakeResponse:
+    def __init__(self, status, body, headers=None):
+        self.status = status
+        self._body = body
+        self.headers = headers or {"content-type": "text/html", "date": "Fri, 17 Oct 2026 10:00:00 GMT"}
+
+    def body(self):
+        return self._body
+
+
+class FakeRoute:
+    """fetch() answers with response; the outcome (abort / fallback / fulfill) is recorded"""
+
+    def __init__(self, request, response=None):
+        self.request = request
+        self.response = response
+        self.outcome = None
+
+    def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    def fallback(self):
+        self.outcome = "fallback"
+
+    def fetch(self, max_redirects=None):
+        return self.response
+
+    def fulfill(self, **kwargs):
+        self.outcome = "fulfill"
+        self.fulfilled = kwargs
+
+
+class FakeLocator:
+    """Every call is a round-trip on its page; actions are recorded in page.actions"""
+
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    def is_visible(self):
+        self.page.round_trips += 1
+        return True
+
+    def text_content(self):
+        self.page.round_trips += 1
+        return f"text of {self.selector}"
+
+    def __getattr__(self, action):
+        # fill / click / clear / set_checked / press_sequentially
+        def act(*args):
+            self.page.round_trips += 1
+            self.page.actions.append((action, self.selector) + args)
+        return act
+
+
+class FakePage:
+    """Just enough of Page for page objects: events, waits, locators and evaluate()
+
+    evaluate() answers batched queries with every selector visible, fill_form
+    with form_problems and the element-state wait with wait_reached.
+    wait_for_event() calls on_tick, then times out.
+    """
+
+    def __init__(self, context=None, form_problems=(), wait_reached=True, url="https://site.test/"):
+        self.context = context
+        self.url = url
+        self.form_problems = list(form_problems)
+        self.wait_reached = wait_reached
+        self.main_frame = object()
+        self.handlers = {}
+        self.on_tick = None
+        # Readiness waits and navigations, locator actions, evaluate() arguments
+        self.calls = []
+        self.actions = []
+        self.evaluated = []
+        self.waits = []
+        self.round_trips = 0
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event, argument):
+        for handler in self.handlers.get(event, []):
+            handler(argument)
+
+    def goto(self, url, wait_until=None):
+        self.url = url
+        self.calls.append(("goto", url))
+
+    def wait_for_load_state(self, state, timeout=None):
+        self.calls.append(("load_state", state, timeout))
+
+    def wait_for_selector(self, selector, state=None):
+        self.calls.append(("selector", selector))
+
+    def wait_for_event(self, event, predicate=None, timeout=None):
+        self.calls.append(("event", event))
+        if self.on_tick:
+            self.on_tick()
+        raise PlaywrightTimeoutError(f"no {event}")
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    def evaluate(self, script, arguments):
+        self.round_trips += 1
+        if script == WAIT_FOR_STATE_SCRIPT:
+            self.waits.append(arguments)
+            return self.wait_reached
+        self.evaluated.append(list(arguments))
+        if script == FILL_FORM_SCRIPT:
+            return self.form_problems
+        return [[True, f"text of {selector}"] for selector in arguments]
+
+    def screenshot(self):
+        return b"png-bytes"
+
+    def content(self):
+        return "<html>failed</html>"
+
+    def close(self):
+        self.context.pages.remove(self)
+
+
+class AsyncFakeLocator(FakeLocator):
+    async def is_visible(self):
+        return super().is_visible()
+
+    async def text_content(self):
+        return super().text_content()
+
+    def __getattr__(self, action):
+        act = super().__getattr__(action)
+
+        async def async_act(*args):
+            act(*args)
+        return async_act
+
+
+class AsyncFakePage(FakePage):
+    """FakePage with the calls playwright.async_api awaits turned into coroutines"""
+
+    async def goto(self, url, wait_until=None):
+        super().goto(url, wait_until)
+
+    async def wait_for_load_state(self, state, timeout=None):
+        super().wait_for_load_state(state, timeout)
+
+    async def wait_for_selector(self, selector, state=None):
+        super().wait_for_selector(selector, state)
+
+    async def wait_for_event(self, event, predicate=None, timeout=None):
+        super().wait_for_event(event, predicate, timeout)
+
+    def locator(self, selector):
+        return AsyncFakeLocator(self, selector)
+
+    async def evaluate(self, script, arguments):
+        return super().evaluate(script, arguments)
+
+
+class FakeTracing:
+    def __init__(self):
+        self.stopped_to = []
+
+    def start(self, **options):
+        pass
+
+    def stop(self, path=None):
+        self.stopped_to.append(path)
+        if path:
+            with open(path, "wb") as trace:
+                trace.write(b"trace-zip")
+
+
+class FakeContext:
+    """Tracks the state ContextPool.reset() is supposed to clear"""
+
+    def __init__(self, sticky_cookies=False):
+        self.pages = []
+        self.cookies = []
+        self.routes = 0
+        # (url pattern, handler) of context.route / route_from_har ("har"), like Playwright keeps them
+        self.routed = []
+        self.closed = False
+        self.sticky_cookies = sticky_cookies
+        self.init_scripts = []
+        self.listeners = []
+        self.tracing = FakeTracing()
+
+    def add_init_script(self, script=None, path=None):
+        self.init_scripts.append(script)
+
+    def on(self, event, handler):
+        self.listeners.append((event, handler))
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove((event, handler))
+
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def route(self, url, handler):
+        self.routed.append((url, handler))
+
+    def route_from_har(self, har, url=None, not_found=None):
+        self.routed.append((url or "**/*", "har"))
+
+    def unroute(self, url, handler=None):
+        self.routed = [(pattern, routed) for pattern, routed in self.routed
+                       if pattern != url or (handler and routed != handler)]
+
+    def unroute_all(self, behavior=None):
+        self.routes = 0
+        self.routed = []
+
+    def clear_cookies(self):
+        if not self.sticky_cookies:
+            self.cookies = []
+
+    def clear_permissions(self):
+        pass
+
+    def set_extra_http_headers(self, headers):
+        pass
+
+    def set_offline(self, offline):
+        pass
+
+    def storage_state(self):
+        return {'cookies': list(self.cookies), 'origins': []}
+
+    def close(self):
+        self.closed = True
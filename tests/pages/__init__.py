@@ -7,13 +7,25 @@ Available Page Objects:
 - BasePage: Base class with common functionality
 - PracticeLoginPage: Practice site login interactions
 - PracticeExceptionsPage: Practice site exception handling
+- AsyncBasePage / AsyncPracticeLoginPage / AsyncPracticeExceptionsPage:
+  playwright.async_api twins sharing the selector classes in selectors.py
+
+Readiness strategies used by BasePage after navigation live in readiness.py;
+the locator cache and batched element queries live in locators.py, the
+learned timeouts used by BasePage.wait_adaptively in wait_stats.py and the
+background writer behind take_screenshot and failure artifacts in artifacts.py
 """
 
 from .base_page import BasePage
 from .practice_pages import PracticeLoginPage, PracticeExceptionsPage
+from .async_base_page import AsyncBasePage
+from .async_practice_pages import AsyncPracticeLoginPage, AsyncPracticeExceptionsPage
 
 __all__ = [
     'BasePage',
     'PracticeLoginPage', 
-    'PracticeExceptionsPage'
+    'PracticeExceptionsPage',
+    'AsyncBasePage',
+    'AsyncPracticeLoginPage',
+    'AsyncPracticeExceptionsPage'
 ]
\ No newline at end of file
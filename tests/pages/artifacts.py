@@ -0,0 +1,192 @@
+"""
+Background artifact writer
+
+Screenshots, DOM snapshots and console logs are captured into memory in the
+test thread and handed to a small thread pool that compresses, deduplicates
+and writes them, so a test never waits for encoding or disk I/O. Images
+become WebP when Pillow is installed, text is zstd-compressed when
+zstandard is installed (gzip otherwise). An artifact whose content was
+already written in this run is hard-linked instead of written again, and
+budgeted artifacts stop being written once the run's MB budget is used up.
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from config import config
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+WEBP_QUALITY = 80
+ZSTD_LEVEL = 10
+
+
+def encode_image(data: bytes) -> Tuple[bytes, str]:
+    """PNG -> WebP when Pillow is available, otherwise the PNG unchanged"""
+    if Image is None:
+        return data, '.png'
+    output = io.BytesIO()
+    with Image.open(io.BytesIO(data)) as image:
+        image.save(output, 'WEBP', quality=WEBP_QUALITY)
+    return output.getvalue(), '.webp'
+
+
+def encode_text(data: bytes) -> Tuple[bytes, str]:
+    """zstd when zstandard is available, otherwise gzip"""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), '.zst'
+    return gzip.compress(data, compresslevel=6), '.gz'
+
+
+def encode_raw(data: bytes) -> Tuple[bytes, str]:
+    return data, ''
+
+
+# Encoder per kind: returns (encoded bytes, suffix appended to the file name)
+ENCODERS: Dict[str, Callable[[bytes], Tuple[bytes, str]]] = {
+    'image': encode_image,
+    'text': encode_text,
+    'raw': encode_raw,
+}
+
+
+class ArtifactStats:
+    """What was captured, written, deduplicated and dropped"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.written = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+        # Background encode + write time vs time the test thread spent capturing
+        self.write_seconds = 0.0
+        self.capture_seconds: List[float] = []
+
+
+class ArtifactWriter:
+    """Compresses and writes artifacts on a thread pool; submit() returns immediately"""
+
+    def __init__(self, root: Optional[Path] = None, budget_mb: Optional[float] = None,
+                 workers: Optional[int] = None):
+        # None = the ARTIFACTS_* settings, read on first use rather than at import
+        self._root = Path(root) if root else None
+        self._budget_bytes = int(budget_mb * 1024 * 1024) if budget_mb is not None else None
+        self._workers = workers
+        self.stats = ArtifactStats()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+        # (kind, sha256 of the captured bytes) -> (first file written with that content, its suffix)
+        self._written: Dict[Tuple[str, str], Tuple[Path, str]] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._root or config.ARTIFACTS_DIR
+
+    @property
+    def budget_bytes(self) -> int:
+        if self._budget_bytes is None:
+            self._budget_bytes = int(config.ARTIFACTS_BUDGET_MB * 1024 * 1024)
+        return self._budget_bytes
+
+    @budget_bytes.setter
+    def budget_bytes(self, value: int):
+        self._budget_bytes = value
+
+    def submit(self, path: Union[str, Path], data: bytes, kind: str = 'raw', budgeted: bool = True) -> Future:
+        """Queue an artifact; path is relative to root unless absolute. The future yields the written path
+
+        The encoder's suffix is appended to path (image: .png/.webp, text: .zst/.gz, raw: none).
+        Explicit saves (budgeted=False) are always written; failure artifacts count against the budget.
+        """
+        if kind not in ENCODERS:
+            raise ValueError(f"Unknown artifact kind: {kind} (choose from {', '.join(ENCODERS)})")
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers or config.ARTIFACTS_WORKERS,
+                                                    thread_name_prefix='artifacts')
+            self.stats.submitted += 1
+            self._pending = [future for future in self._pending if not future.done()]
+            future = self._executor.submit(self._write, self.root / path, data, kind, budgeted)
+            self._pending.append(future)
+        return future
+
+    def _write(self, path: Path, data: bytes, kind: str, budgeted: bool) -> Optional[Path]:
+        start = time.perf_counter()
+        key = (kind, hashlib.sha256(data).hexdigest())
+        try:
+            with self._lock:
+                self.stats.raw_bytes += len(data)
+                existing = self._written.get(key)
+            if existing is not None:
+                return self._link(existing, path)
+            encoded, suffix = ENCODERS[kind](data)
+            with self._lock:
+                if budgeted and self.stats.written_bytes + len(encoded) > self.budget_bytes:
+                    self.stats.dropped += 1
+                    return None
+                self.stats.written_bytes += len(encoded)
+                self.stats.written += 1
+            target = path.with_name(path.name + suffix)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(encoded)
+            os.replace(tmp_path, target)
+            with self._lock:
+                self._written.setdefault(key, (target, suffix))
+            return target
+        finally:
+            with self._lock:
+                self.stats.write_seconds += time.perf_counter() - start
+
+    def _link(self, existing: Tuple[Path, str], path: Path) -> Path:
+        """Same content as an earlier artifact: hard link (copy where links aren't supported)"""
+        source, suffix = existing
+        target = path.with_name(path.name + suffix)
+        if target == source:
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.unlink(missing_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+        with self._lock:
+            self.stats.deduplicated += 1
+        return target
+
+    def flush(self):
+        """Wait until everything submitted so far is written"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+# Shared by page objects (take_screenshot) and the artifacts plugin, which closes it at session end
+artifact_writer = ArtifactWriter()
@@ -0,0 +1,170 @@
+"""
+Async Base Page Object Class
+Async twin of BasePage built on playwright.async_api, so one event loop can
+drive many pages concurrently (e.g. dozens of simultaneous login sessions)
+"""
+
+from concurrent.futures import Future
+from playwright.async_api import Locator, Page, TimeoutError as PlaywrightTimeoutError
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+import time
+from config import config
+from tests.pages.readiness import ReadinessStrategy, build_strategy, readiness_stats
+from tests.pages.locators import (BATCH_QUERY_SCRIPT, FILL_FORM_SCRIPT, WAIT_FOR_STATE_SCRIPT, ElementState,
+                                  LocatorCache, batch_results, form_plan, query_plan)
+from tests.pages.wait_stats import origin_of, wait_stats
+from tests.pages.artifacts import artifact_writer
+
+class AsyncBasePage:
+    """Base class for all async page objects"""
+
+    # Same knobs as BasePage - None means Config.READINESS_STRATEGY
+    readiness_strategy: Optional[str] = None
+    ready_selector: Optional[str] = None
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.base_url = config.PRACTICE_BASE_URL  # Public site, or practice_server.py via LOCAL_SITE_URL
+        self.locators = LocatorCache(page)
+        # Track requests from the start, so a wait without navigate_to() sees those already in flight
+        self.get_readiness().prepare(self)
+
+    def locator(self, selector: str) -> Locator:
+        """Cached page.locator(selector), rebuilt after the page navigates"""
+        return self.locators.get(selector)
+
+    def get_readiness(self) -> ReadinessStrategy:
+        """Readiness strategy for this page object (see BasePage.get_readiness)"""
+        name = self.readiness_strategy or config.READINESS_STRATEGY
+        return build_strategy(name, config.NETWORK_IDLE_IGNORE, config.DEFAULT_TIMEOUT)
+
+    async def navigate_to(self, url: str, ready_selector: Optional[str] = None):
+        """Navigate to a specific URL and wait until the page is ready (see BasePage.navigate_to)"""
+        readiness = self.get_readiness()
+        readiness.prepare(self)
+        start = time.perf_counter()
+        await self.page.goto(url, wait_until=readiness.goto_wait_until)
+        await readiness.wait_async(self, ready_selector)
+        readiness_stats.record(type(self).__name__, readiness.name, "navigate", time.perf_counter() - start)
+
+    async def wait_for_page_load(self, ready_selector: Optional[str] = None):
+        """Wait until the page is ready according to the readiness strategy"""
+        await self._wait_until_ready("page_load", ready_selector)
+
+    async def _wait_until_ready(self, event: str, ready_selector: Optional[str] = None):
+        readiness = self.get_readiness()
+        start = time.perf_counter()
+        await readiness.wait_async(self, ready_selector)
+        readiness_stats.record(type(self).__name__, readiness.name, event, time.perf_counter() - start)
+
+    async def get_page_title(self) -> str:
+        """Get the current page title"""
+        return await self.page.title()
+
+    def get_current_url(self) -> str:
+        """Get the current page URL"""
+        return self.page.url
+
+    async def take_screenshot(self, name: str) -> Future:
+        """Take a screenshot with given name; it is written to screenshots/ in the background
+
+        The file may not exist yet when this returns: call .result() on the returned
+        future (it yields the written path) or artifact_writer.flush() before reading it.
+        """
+        return artifact_writer.submit(Path("screenshots").resolve() / f"{name}.png", await self.page.screenshot(),
+                                      budgeted=False)
+
+    async def wait_for_element(self, selector: str, timeout: int = 5000):
+        """Wait for an element to be visible"""
+        await self.page.wait_for_selector(selector, timeout=timeout)
+
+    async def wait_adaptively(self, selector: str, default_timeout: int = 10000, state: str = "visible") -> float:
+        """Wait for an element with a learned timeout (see BasePage.wait_adaptively)"""
+        page_class, origin = type(self).__name__, origin_of(self.page.url)
+        timeout = wait_stats.timeout_for(origin, page_class, selector, default_timeout)
+        start = time.perf_counter()
+        if getattr(selector, "is_css", False):
+            reached = await self.page.evaluate(WAIT_FOR_STATE_SCRIPT, [selector, state, timeout])
+        else:
+            try:
+                await self.page.wait_for_selector(selector, state=state, timeout=timeout)
+                reached = True
+            except PlaywrightTimeoutError:
+                reached = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if not reached:
+            wait_stats.record_timeout(origin, page_class, selector, timeout, default_timeout)
+            raise PlaywrightTimeoutError(
+                f"{page_class}: '{selector}' not {state} after {timeout} ms "
+                f"(learned budget, default {default_timeout} ms)"
+            )
+        wait_stats.record(origin, page_class, selector, elapsed_ms, default_timeout)
+        return elapsed_ms
+
+    async def is_element_visible(self, selector: str) -> bool:
+        """Check if an element is visible"""
+        return await self.locator(selector).is_visible()
+
+    async def get_element_text(self, selector: str) -> str:
+        """Get text content of an element"""
+        return await self.locator(selector).text_content() or ""
+
+    async def click_element(self, selector: str):
+        """Click an element with wait"""
+        # click() auto-waits for the element to be visible and enabled
+        await self.locator(selector).click()
+
+    async def fill_field(self, selector: str, value: str):
+        """Fill a form field with wait"""
+        # fill() auto-waits for the element to be visible and enabled
+        await self.locator(selector).fill(value)
+
+    async def fill_form(self, fields: Dict[str, Union[str, bool]], submit: Optional[str] = None,
+                        real_typing: bool = False):
+        """Fill a whole form in one round-trip, then optionally click submit (see BasePage.fill_form)"""
+        plan = None if real_typing else form_plan(fields)
+        problems = await self.page.evaluate(FILL_FORM_SCRIPT, plan) if plan else ["per-field"]
+        if problems:
+            for selector, value in fields.items():
+                await self._fill_one(selector, value, real_typing)
+        if submit:
+            await self.click_element(submit)
+
+    async def _fill_one(self, selector: str, value: Union[str, bool], real_typing: bool):
+        locator = self.locator(selector)
+        if isinstance(value, bool):
+            await locator.set_checked(value)
+        elif real_typing:
+            await locator.clear()
+            await locator.press_sequentially(value)
+        else:
+            await locator.fill(value)
+
+    async def query_elements(self, selectors: Optional[Iterable[str]] = None) -> Dict[str, ElementState]:
+        """Visibility and text of many selectors in one round-trip (see BasePage.query_elements)"""
+        if selectors is None:
+            selectors = getattr(self, "selector_registry", {}).values()
+        batched, fallback = query_plan(selectors)
+        states = batch_results(batched, await self.page.evaluate(BATCH_QUERY_SCRIPT, batched)) if batched else {}
+        for selector in fallback:
+            locator = self.locator(selector)
+            states[selector] = ElementState(await locator.is_visible(), await locator.text_content() or "")
+        return states
+
+    async def wait_for_navigation(self, ready_selector: Optional[str] = None):
+        """Wait for navigation to complete"""
+        await self._wait_until_ready("navigation", ready_selector)
+
+    def assert_url_contains(self, expected_path: str):
+        """Assert that current URL contains expected path"""
+        assert expected_path in self.get_current_url(), f"Expected URL to contain '{expected_path}', but got '{self.get_current_url()}'"
+
+    def assert_url_not_contains(self, unexpected_path: str):
+        """Assert that current URL does not contain unexpected path"""
+        assert unexpected_path not in self.get_current_url(), f"Expected URL to NOT contain '{unexpected_path}', but got '{self.get_current_url()}'"
+
+    async def assert_page_title_contains(self, expected_title: str):
+        """Assert that page title contains expected text"""
+        title = await self.get_page_title()
+        assert expected_title in title, f"Expected title to contain '{expected_title}', but got '{title}'"
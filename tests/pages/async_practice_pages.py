@@ -0,0 +1,92 @@
+"""
+Async Page Objects for Practice Test Automation site
+Same flows as practice_pages.py on playwright.async_api; selectors come from
+the shared classes in selectors.py
+"""
+from tests.pages.async_base_page import AsyncBasePage
+from tests.pages.selectors import PracticeLoginSelectors, PracticeExceptionsSelectors
+
+
+class AsyncPracticeLoginPage(PracticeLoginSelectors, AsyncBasePage):
+    """Async login page for Practice Test Automation site"""
+
+    async def navigate_to_login(self):
+        """Navigate to the practice login page"""
+        await self.navigate_to(f"{self.base_url}/practice-test-login/")
+        self.assert_url_contains("practice-test-login")
+
+    async def navigate_to_logged_in(self):
+        """Open the logged-in landing page directly (needs an authenticated context)"""
+        await self.navigate_to(f"{self.base_url}/logged-in-successfully/", ready_selector=self.success_message)
+
+    async def login_with_credentials(self, username, password):
+        """Perform login with given credentials"""
+        # One round-trip for both fields, then a real click so navigation is awaited
+        await self.fill_form({self.username_input: username, self.password_input: password},
+                             submit=self.login_button)
+
+    async def login_with_valid_credentials(self):
+        """Login with known valid credentials for practice site"""
+        await self.login_with_credentials("student", "Password123")
+
+    async def login_with_invalid_credentials(self):
+        """Login with invalid credentials for error testing"""
+        await self.login_with_credentials("incorrectUser", "Password123")
+
+    async def get_success_message(self):
+        """Get the success message text after login"""
+        return await self.get_element_text(self.success_message)
+
+    async def get_error_message(self):
+        """Get the error message text for failed login"""
+        return await self.get_element_text(self.error_message)
+
+    async def is_logged_in(self):
+        """Check if user is successfully logged in"""
+        return await self.is_element_visible(self.success_message)
+
+    def is_on_login_page(self):
+        """Verify we are on the practice login page"""
+        return "/practice-test-login" in self.get_current_url()
+
+    async def logout(self):
+        """Logout from the application"""
+        if await self.is_element_visible(self.logout_link):
+            await self.click_element(self.logout_link)
+
+
+class AsyncPracticeExceptionsPage(PracticeExceptionsSelectors, AsyncBasePage):
+    """Async exceptions page for practicing element interactions"""
+
+    async def navigate_to_exceptions(self):
+        """Navigate to the exceptions practice page"""
+        await self.navigate_to(f"{self.base_url}/practice-test-exceptions/")
+        self.assert_url_contains("practice-test-exceptions")
+
+    async def click_add_button(self):
+        """Click the Add button to add new row"""
+        await self.click_element(self.add_button)
+
+    async def wait_for_second_row(self, timeout=10000):
+        """Wait for second row to appear - ~5 s on the live site, timeout learned from earlier runs"""
+        await self.wait_adaptively(self.row2_div, default_timeout=timeout)
+
+    async def enter_text_in_second_row(self, text):
+        """Enter text in the second row input field"""
+        await self.fill_field(self.row2_input, text)
+
+    async def click_remove_button(self):
+        """Click the Remove button"""
+        await self.click_element(self.remove_button)
+
+    async def wait_for_confirmation(self, timeout=5000):
+        """Wait for confirmation message to appear (timeout learned from earlier runs)"""
+        await self.wait_adaptively(self.confirmation_message, default_timeout=timeout)
+
+    async def get_confirmation_message(self):
+        """Get the confirmation message text"""
+        return await self.get_element_text(self.confirmation_message)
+
+    async def is_second_row_visible(self):
+        """Check if second row is visible"""
+        return await self.is_element_visible(self.row2_div)
@@ -3,29 +3,64 @@ Base Page Object Class
 This class contains common functionality that all page objects can inherit
 """
 
-from playwright.sync_api import Page, expect
-from typing import Optional
+from concurrent.futures import Future
+from playwright.sync_api import Locator, Page, TimeoutError as PlaywrightTimeoutError
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
 import time
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from config import config
+from tests.pages.readiness import ReadinessStrategy, build_strategy, readiness_stats
+from tests.pages.locators import (BATCH_QUERY_SCRIPT, FILL_FORM_SCRIPT, WAIT_FOR_STATE_SCRIPT, ElementState,
+                                  LocatorCache, batch_results, form_plan, query_plan)
+from tests.pages.wait_stats import origin_of, wait_stats
+from tests.pages.artifacts import artifact_writer
 
 class BasePage:
     """Base class for all page objects"""
     
+    # Readiness after navigation - None means Config.READINESS_STRATEGY
+    readiness_strategy: Optional[str] = None
+    # Element that proves the page is usable (used by the "selector" strategy)
+    ready_selector: Optional[str] = None
+    
     def __init__(self, page: Page):
         self.page = page
-        self.base_url = "https://practicetestautomation.com"  # Default base URL for practice sites
+        self.base_url = config.PRACTICE_BASE_URL  # Public site, or practice_server.py via LOCAL_SITE_URL
+        self.locators = LocatorCache(page)
+        # Track requests from the start, so a wait without navigate_to() sees those already in flight
+        self.get_readiness().prepare(self)
+        
+    def locator(self, selector: str) -> Locator:
+        """Cached page.locator(selector), rebuilt after the page navigates"""
+        return self.locators.get(selector)
+        
+    def get_readiness(self) -> ReadinessStrategy:
+        """Readiness strategy for this page object (page object setting wins over Config)"""
+        name = self.readiness_strategy or config.READINESS_STRATEGY
+        return build_strategy(name, config.NETWORK_IDLE_IGNORE, config.DEFAULT_TIMEOUT)
+        
+    def navigate_to(self, url: str, ready_selector: Optional[str] = None):
+        """Navigate to a specific URL and wait until the page is ready
         
-    def navigate_to(self, url: str):
-        """Navigate to a specific URL"""
-        self.page.goto(url)
-        self.wait_for_page_load()
+        ready_selector is the element proving this URL is usable ("selector" readiness);
+        it defaults to the page object's ready_selector.
+        """
+        readiness = self.get_readiness()
+        readiness.prepare(self)
+        start = time.perf_counter()
+        self.page.goto(url, wait_until=readiness.goto_wait_until)
+        readiness.wait(self, ready_selector)
+        readiness_stats.record(type(self).__name__, readiness.name, "navigate", time.perf_counter() - start)
         
-    def wait_for_page_load(self):
-        """Wait for page to fully load"""
-        self.page.wait_for_load_state("networkidle")
+    def wait_for_page_load(self, ready_selector: Optional[str] = None):
+        """Wait until the page is ready according to the readiness strategy"""
+        self._wait_until_ready("page_load", ready_selector)
+        
+    def _wait_until_ready(self, event: str, ready_selector: Optional[str] = None):
+        readiness = self.get_readiness()
+        start = time.perf_counter()
+        readiness.wait(self, ready_selector)
+        readiness_stats.record(type(self).__name__, readiness.name, event, time.perf_counter() - start)
         
     def get_page_title(self) -> str:
         """Get the current page title"""
@@ -35,37 +70,110 @@ class BasePage:
         """Get the current page URL"""
         return self.page.url
         
-    def take_screenshot(self, name: str):
-        """Take a screenshot with given name"""
-        self.page.screenshot(path=f"screenshots/{name}.png")
+    def take_screenshot(self, name: str) -> Future:
+        """Take a screenshot with given name; it is written to screenshots/ in the background
+        
+        The file may not exist yet when this returns: call .result() on the returned
+        future (it yields the written path) or artifact_writer.flush() before reading it.
+        """
+        return artifact_writer.submit(Path("screenshots").resolve() / f"{name}.png", self.page.screenshot(),
+                                      budgeted=False)
         
     def wait_for_element(self, selector: str, timeout: int = 5000):
         """Wait for an element to be visible"""
         self.page.wait_for_selector(selector, timeout=timeout)
         
+    def wait_adaptively(self, selector: str, default_timeout: int = 10000, state: str = "visible") -> float:
+        """Wait for an element with a timeout learned from earlier runs; returns the wait in ms
+        
+        default_timeout applies until enough appearance times are recorded for this
+        page object and selector on the current page's origin. CSS selectors are
+        watched with a MutationObserver; others use Playwright's wait_for_selector.
+        """
+        page_class, origin = type(self).__name__, origin_of(self.page.url)
+        timeout = wait_stats.timeout_for(origin, page_class, selector, default_timeout)
+        start = time.perf_counter()
+        if getattr(selector, "is_css", False):
+            reached = self.page.evaluate(WAIT_FOR_STATE_SCRIPT, [selector, state, timeout])
+        else:
+            try:
+                self.page.wait_for_selector(selector, state=state, timeout=timeout)
+                reached = True
+            except PlaywrightTimeoutError:
+                reached = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if not reached:
+            wait_stats.record_timeout(origin, page_class, selector, timeout, default_timeout)
+            raise PlaywrightTimeoutError(
+                f"{page_class}: '{selector}' not {state} after {timeout} ms "
+                f"(learned budget, default {default_timeout} ms)"
+            )
+        wait_stats.record(origin, page_class, selector, elapsed_ms, default_timeout)
+        return elapsed_ms
+        
     def is_element_visible(self, selector: str) -> bool:
         """Check if an element is visible"""
-        return self.page.locator(selector).is_visible()
+        return self.locator(selector).is_visible()
         
     def get_element_text(self, selector: str) -> str:
         """Get text content of an element"""
-        return self.page.locator(selector).text_content() or ""
+        return self.locator(selector).text_content() or ""
         
     def click_element(self, selector: str):
         """Click an element with wait"""
-        element = self.page.locator(selector)
-        expect(element).to_be_visible()
-        element.click()
+        # click() auto-waits for the element to be visible and enabled
+        self.locator(selector).click()
         
     def fill_field(self, selector: str, value: str):
         """Fill a form field with wait"""
-        element = self.page.locator(selector)
-        expect(element).to_be_visible()
-        element.fill(value)
+        # fill() auto-waits for the element to be visible and enabled
+        self.locator(selector).fill(value)
+        
+    def fill_form(self, fields: Dict[str, Union[str, bool]], submit: Optional[str] = None,
+                  real_typing: bool = False):
+        """Fill a whole form in one round-trip, then optionally click submit
+        
+        Values are strings for inputs/selects and booleans for checkboxes. If any
+        field isn't ready yet (or uses a non-CSS selector) the form is filled field
+        by field with Playwright's auto-waiting fill() instead; real_typing=True
+        always does that and types each value key by key.
+        """
+        plan = None if real_typing else form_plan(fields)
+        problems = self.page.evaluate(FILL_FORM_SCRIPT, plan) if plan else ["per-field"]
+        if problems:
+            for selector, value in fields.items():
+                self._fill_one(selector, value, real_typing)
+        if submit:
+            self.click_element(submit)
+        
+    def _fill_one(self, selector: str, value: Union[str, bool], real_typing: bool):
+        locator = self.locator(selector)
+        if isinstance(value, bool):
+            locator.set_checked(value)
+        elif real_typing:
+            locator.clear()
+            locator.press_sequentially(value)
+        else:
+            locator.fill(value)
+        
+    def query_elements(self, selectors: Optional[Iterable[str]] = None) -> Dict[str, ElementState]:
+        """Visibility and text of many selectors (default: the whole selector registry)
+        
+        Plain CSS selectors are resolved in one page.evaluate() round-trip; the rest
+        fall back to one Locator call each for visibility and text.
+        """
+        if selectors is None:
+            selectors = getattr(self, "selector_registry", {}).values()
+        batched, fallback = query_plan(selectors)
+        states = batch_results(batched, self.page.evaluate(BATCH_QUERY_SCRIPT, batched)) if batched else {}
+        for selector in fallback:
+            locator = self.locator(selector)
+            states[selector] = ElementState(locator.is_visible(), locator.text_content() or "")
+        return states
         
-    def wait_for_navigation(self):
+    def wait_for_navigation(self, ready_selector: Optional[str] = None):
         """Wait for navigation to complete"""
-        self.page.wait_for_load_state("networkidle")
+        self._wait_until_ready("navigation", ready_selector)
         
     def assert_url_contains(self, expected_path: str):
         """Assert that current URL contains expected path"""
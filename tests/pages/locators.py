@@ -0,0 +1,148 @@
+"""
+Locator cache and batched element queries for page objects
+
+LocatorCache keeps one Locator per selector for a page and drops them all when
+the main frame navigates. query_plan()/BATCH_QUERY_SCRIPT let a page object
+read visibility and text of many CSS selectors with a single page.evaluate()
+instead of two IPC round-trips per selector; selectors the browser can't run
+natively (text=, xpath, >> chains, :has-text()...) fall back to Locator calls.
+FILL_FORM_SCRIPT does the same for writes: it checks every field of a form and
+then fills them all in one round-trip. WAIT_FOR_STATE_SCRIPT waits for an
+element with a MutationObserver, re-checking only when the DOM changes.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Same visibility rule as Playwright: non-empty box and not visibility:hidden.
+# Like querySelector (and unlike strict locators) the first match wins.
+BATCH_QUERY_SCRIPT = """
+(selectors) => selectors.map((selector) => {
+    const element = document.querySelector(selector);
+    if (!element) return [false, ""];
+    const box = element.getBoundingClientRect();
+    const visible = box.width > 0 && box.height > 0 &&
+        getComputedStyle(element).visibility !== "hidden";
+    return [visible, element.textContent || ""];
+})
+"""
+
+
+# Fills nothing unless every field is present, visible and editable. Values go
+# through the prototype setter so framework-tracked inputs (React etc.) notice,
+# followed by the input/change events real typing would fire.
+FILL_FORM_SCRIPT = """
+(fields) => {
+    const problems = [];
+    const targets = fields.map(([selector, value]) => {
+        const element = document.querySelector(selector);
+        if (!element) { problems.push(`${selector}: not found`); return null; }
+        const box = element.getBoundingClientRect();
+        if (!box.width || !box.height || getComputedStyle(element).visibility === "hidden") {
+            problems.push(`${selector}: not visible`);
+        } else if (element.disabled || element.readOnly) {
+            problems.push(`${selector}: not editable`);
+        } else if (!["INPUT", "TEXTAREA", "SELECT"].includes(element.tagName)) {
+            problems.push(`${selector}: <${element.tagName.toLowerCase()}> is not a form field`);
+        }
+        return [element, value];
+    });
+    if (problems.length) return problems;
+    for (const [element, value] of targets) {
+        element.focus();
+        if (typeof value === "boolean") {
+            if (element.checked !== value) element.click();
+            continue;
+        }
+        const prototype = Object.getPrototypeOf(element);
+        Object.getOwnPropertyDescriptor(prototype, "value").set.call(element, value);
+        element.dispatchEvent(new Event("input", { bubbles: true }));
+        element.dispatchEvent(new Event("change", { bubbles: true }));
+    }
+    return problems;
+}
+"""
+
+
+# Resolves true once the selector reaches the state, false after timeout ms.
+# Re-checks on DOM mutations only - no polling interval.
+WAIT_FOR_STATE_SCRIPT = """
+([selector, state, timeout]) => new Promise((resolve) => {
+    const reached = () => {
+        const element = document.querySelector(selector);
+        if (state === "attached" || state === "detached") return (element !== null) === (state === "attached");
+        const box = element && element.getBoundingClientRect();
+        const visible = !!element && box.width > 0 && box.height > 0 &&
+            getComputedStyle(element).visibility !== "hidden";
+        return visible === (state === "visible");
+    };
+    if (reached()) return resolve(true);
+    const observer = new MutationObserver(() => {
+        if (!reached()) return;
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(true);
+    });
+    const timer = setTimeout(() => { observer.disconnect(); resolve(reached()); }, timeout);
+    observer.observe(document.documentElement,
+                     { childList: true, subtree: true, attributes: true, characterData: true });
+})
+"""
+
+
+def form_plan(fields: Dict[str, object]) -> Optional[List[list]]:
+    """[[selector, value], ...] for FILL_FORM_SCRIPT, or None if a selector needs Playwright's engine"""
+    if not all(getattr(selector, 'is_css', False) for selector in fields):
+        return None
+    return [[selector, value] for selector, value in fields.items()]
+
+
+class ElementState(NamedTuple):
+    """What query_elements() reports per selector"""
+
+    visible: bool
+    text: str
+
+
+def query_plan(selectors: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """Split unique selectors into (batched CSS, per-selector fallback), keeping order"""
+    batched, fallback = [], []
+    for selector in dict.fromkeys(selectors):
+        (batched if getattr(selector, 'is_css', False) else fallback).append(selector)
+    return batched, fallback
+
+
+def batch_results(selectors: List[str], rows: List[list]) -> Dict[str, ElementState]:
+    return {selector: ElementState(bool(visible), text) for selector, (visible, text) in zip(selectors, rows)}
+
+
+class LocatorCache:
+    """One Locator per selector for a page, cleared when the main frame navigates"""
+
+    def __init__(self, page):
+        self.page = page
+        self._locators: Dict[str, object] = {}
+        self._listening = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, selector: str):
+        locator = self._locators.get(selector)
+        if locator is not None:
+            self.hits += 1
+            return locator
+        if not self._listening:
+            self.page.on("framenavigated", self._on_frame_navigated)
+            self._listening = True
+        self.misses += 1
+        locator = self._locators[selector] = self.page.locator(selector)
+        return locator
+
+    def clear(self):
+        self._locators.clear()
+
+    def _on_frame_navigated(self, frame):
+        if frame == self.page.main_frame:
+            self.clear()
+
+    def __len__(self):
+        return len(self._locators)
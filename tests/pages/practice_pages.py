@@ -3,34 +3,27 @@ Page Objects for Practice Test Automation site
 URL: https://practicetestautomation.com/practice/
 """
 from tests.pages.base_page import BasePage
+from tests.pages.selectors import PracticeLoginSelectors, PracticeExceptionsSelectors
 
 
-class PracticeLoginPage(BasePage):
-    """Login page for Practice Test Automation site"""
+class PracticeLoginPage(PracticeLoginSelectors, BasePage):
+    """Login page for Practice Test Automation site (selectors in PracticeLoginSelectors)"""
     
-    def __init__(self, page):
-        super().__init__(page)
-        self.base_url = "https://practicetestautomation.com"
-        
-        # Login page selectors
-        self.username_input = "#username"
-        self.password_input = "#password" 
-        self.login_button = "#submit"
-        self.success_message = ".post-title"
-        self.error_message = "#error"
-        self.logout_link = "text=Log out"
-        
     def navigate_to_login(self):
         """Navigate to the practice login page"""
         login_url = f"{self.base_url}/practice-test-login/"
         self.navigate_to(login_url)
         self.assert_url_contains("practice-test-login")
         
+    def navigate_to_logged_in(self):
+        """Open the logged-in landing page directly (needs an authenticated context)"""
+        self.navigate_to(f"{self.base_url}/logged-in-successfully/", ready_selector=self.success_message)
+        
     def login_with_credentials(self, username, password):
         """Perform login with given credentials"""
-        self.fill_field(self.username_input, username)
-        self.fill_field(self.password_input, password)
-        self.click_element(self.login_button)
+        # One round-trip for both fields, then a real click so navigation is awaited
+        self.fill_form({self.username_input: username, self.password_input: password},
+                       submit=self.login_button)
         
     def login_with_valid_credentials(self):
         """Login with known valid credentials for practice site"""
@@ -62,20 +55,9 @@ class PracticeLoginPage(BasePage):
             self.click_element(self.logout_link)
 
 
-class PracticeExceptionsPage(BasePage):
-    """Exceptions page for practicing element interactions"""
+class PracticeExceptionsPage(PracticeExceptionsSelectors, BasePage):
+    """Exceptions page for practicing element interactions (selectors in PracticeExceptionsSelectors)"""
     
-    def __init__(self, page):
-        super().__init__(page)
-        self.base_url = "https://practicetestautomation.com"
-        
-        # Exception page selectors - Fixed based on actual page structure
-        self.add_button = "#add_btn"
-        self.remove_button = "#row2 #remove_btn"  # Remove button appears in row2
-        self.row2_div = "#row2"  # The row2 div container
-        self.row2_input = "#row2 input.input-field"  # Input inside row2 div
-        self.confirmation_message = "#confirmation"
-        
     def navigate_to_exceptions(self):
         """Navigate to the exceptions practice page"""
         exceptions_url = f"{self.base_url}/practice-test-exceptions/"
@@ -87,8 +69,8 @@ class PracticeExceptionsPage(BasePage):
         self.click_element(self.add_button)
         
     def wait_for_second_row(self, timeout=10000):
-        """Wait for second row to appear - increased timeout as it takes ~5 seconds"""
-        self.page.wait_for_selector(self.row2_div, timeout=timeout)
+        """Wait for second row to appear - ~5 s on the live site, timeout learned from earlier runs"""
+        self.wait_adaptively(self.row2_div, default_timeout=timeout)
         
     def enter_text_in_second_row(self, text):
         """Enter text in the second row input field"""
@@ -99,8 +81,8 @@ class PracticeExceptionsPage(BasePage):
         self.click_element(self.remove_button)
         
     def wait_for_confirmation(self, timeout=5000):
-        """Wait for confirmation message to appear"""
-        self.page.wait_for_selector(self.confirmation_message, timeout=timeout)
+        """Wait for confirmation message to appear (timeout learned from earlier runs)"""
+        self.wait_adaptively(self.confirmation_message, default_timeout=timeout)
         
     def get_confirmation_message(self):
         """Get the confirmation message text"""
@@ -0,0 +1,213 @@
+"""
+Page readiness strategies
+Decide when a page is usable after navigation instead of always waiting
+for networkidle (500 ms of network silence)
+
+Available Strategies:
+- networkidle: Playwright networkidle, or in-flight request tracking that
+  ignores configured URL patterns (analytics, long-polling)
+- load / domcontentloaded: Plain load states
+- selector: Wait for the element given for this navigation, or the one a
+  page object declares in ready_selector
+
+Every strategy has wait() for sync pages and wait_async() for async ones.
+"""
+
+import fnmatch
+import time
+import weakref
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+
+
+class ReadinessStats:
+    """Collects how long each strategy actually waited"""
+
+    def __init__(self):
+        self.samples: Dict[tuple, List[float]] = defaultdict(list)
+
+    def record(self, page_class: str, strategy: str, event: str, seconds: float):
+        self.samples[(page_class, strategy, event)].append(seconds)
+
+    def clear(self):
+        self.samples.clear()
+
+    def summary(self) -> List[dict]:
+        """One row per (page class, strategy, event) with count/mean/max in ms"""
+        rows = []
+        for (page_class, strategy, event), values in sorted(self.samples.items()):
+            rows.append({
+                'page_class': page_class,
+                'strategy': strategy,
+                'event': event,
+                'count': len(values),
+                'mean_ms': sum(values) / len(values) * 1000,
+                'max_ms': max(values) * 1000,
+            })
+        return rows
+
+
+# Shared by every page object in the process
+readiness_stats = ReadinessStats()
+
+
+class ReadinessStrategy:
+    """Base strategy: what goto() waits for and what to wait for afterwards"""
+
+    name = "base"
+    goto_wait_until = "load"
+
+    def prepare(self, page_object):
+        """Hook called before goto() (e.g. to start listening for requests)"""
+
+    def wait(self, page_object, ready_selector: Optional[str] = None):
+        """Block until the page object's page is ready (ready_selector: element proving it, if known)"""
+        raise NotImplementedError
+
+    async def wait_async(self, page_object, ready_selector: Optional[str] = None):
+        """wait() for an async page object"""
+        raise NotImplementedError
+
+
+class LoadStateReadiness(ReadinessStrategy):
+    """Wait for a Playwright load state ('load' or 'domcontentloaded')"""
+
+    def __init__(self, state: str):
+        self.name = state
+        self.goto_wait_until = state
+        self.state = state
+
+    def wait(self, page_object, ready_selector: Optional[str] = None):
+        page_object.page.wait_for_load_state(self.state)
+
+    async def wait_async(self, page_object, ready_selector: Optional[str] = None):
+        await page_object.page.wait_for_load_state(self.state)
+
+
+class SelectorReadiness(ReadinessStrategy):
+    """Wait for the element that proves the page is usable"""
+
+    name = "selector"
+    goto_wait_until = "commit"
+
+    def wait(self, page_object, ready_selector: Optional[str] = None):
+        # The navigation knows best (a page object can reach several pages), then the page object
+        selector = ready_selector or page_object.ready_selector
+        if not selector:
+            # Nobody declared one - DOM parsed is the best we know
+            page_object.page.wait_for_load_state("domcontentloaded")
+            return
+        page_object.page.wait_for_selector(selector, state="visible")
+
+    async def wait_async(self, page_object, ready_selector: Optional[str] = None):
+        selector = ready_selector or page_object.ready_selector
+        if not selector:
+            await page_object.page.wait_for_load_state("domcontentloaded")
+            return
+        await page_object.page.wait_for_selector(selector, state="visible")
+
+
+class NetworkIdleReadiness(ReadinessStrategy):
+    """networkidle, optionally ignoring requests that match URL patterns"""
+
+    name = "networkidle"
+
+    def __init__(self, ignore_patterns: Sequence[str] = (), idle_ms: int = 500,
+                 timeout_ms: int = 30000, poll_ms: int = 250):
+        self.ignore_patterns = list(ignore_patterns)
+        self.idle_ms = idle_ms
+        self.timeout_ms = timeout_ms
+        self.poll_ms = poll_ms
+        # Playwright's own networkidle can't ignore anything, so track requests ourselves
+        self.goto_wait_until = "domcontentloaded" if self.ignore_patterns else "commit"
+        self._trackers = weakref.WeakKeyDictionary()
+
+    def is_ignored(self, url: str) -> bool:
+        return any(fnmatch.fnmatch(url, pattern) for pattern in self.ignore_patterns)
+
+    def prepare(self, page_object):
+        if self.ignore_patterns:
+            self.track(page_object.page)
+
+    def track(self, page: Page) -> set:
+        """Start counting in-flight requests on a page (idempotent)"""
+        if page not in self._trackers:
+            in_flight = set()
+
+            def on_request(request):
+                if not self.is_ignored(request.url):
+                    in_flight.add(request)
+
+            page.on("request", on_request)
+            page.on("requestfinished", in_flight.discard)
+            page.on("requestfailed", in_flight.discard)
+            self._trackers[page] = in_flight
+        return self._trackers[page]
+
+    def wait(self, page_object, ready_selector: Optional[str] = None):
+        page = page_object.page
+        if not self.ignore_patterns:
+            page.wait_for_load_state("networkidle", timeout=self.timeout_ms)
+            return
+        for event, predicate, timeout_ms in self._event_waits(page):
+            try:
+                page.wait_for_event(event, predicate=predicate, timeout=timeout_ms)
+            except PlaywrightTimeoutError:
+                pass
+
+    async def wait_async(self, page_object, ready_selector: Optional[str] = None):
+        page = page_object.page
+        if not self.ignore_patterns:
+            await page.wait_for_load_state("networkidle", timeout=self.timeout_ms)
+            return
+        for event, predicate, timeout_ms in self._event_waits(page):
+            try:
+                await page.wait_for_event(event, predicate=predicate, timeout=timeout_ms)
+            except PlaywrightTimeoutError:
+                pass
+
+    def _event_waits(self, page) -> Iterator[Tuple[str, Optional[Callable], float]]:
+        """The event waits (event, predicate, timeout ms) until the tracked requests have been idle
+
+        Both APIs dispatch request events while the caller waits, which updates in_flight.
+        """
+        in_flight = self.track(page)
+        deadline = time.monotonic() + self.timeout_ms / 1000
+        quiet_since = time.monotonic() if not in_flight else None
+        while True:
+            now = time.monotonic()
+            if in_flight:
+                quiet_since = None
+            elif quiet_since is None:
+                quiet_since = now
+            quiet_left_ms = self.idle_ms - (now - quiet_since) * 1000 if quiet_since is not None else None
+            if quiet_left_ms is not None and quiet_left_ms <= 0:
+                return
+            left_ms = (deadline - now) * 1000
+            if left_ms <= 0:
+                pending = ", ".join(sorted(request.url for request in in_flight)[:5])
+                raise PlaywrightTimeoutError(
+                    f"Network not idle after {self.timeout_ms} ms, pending: {pending}"
+                )
+            if in_flight:
+                # Woken by the next finished request; poll_ms caps it since failed ones end quietly
+                yield "requestfinished", None, min(left_ms, self.poll_ms)
+            else:
+                # Idle unless a tracked request starts within the rest of the quiet window
+                yield "request", lambda request: not self.is_ignored(request.url), min(left_ms, quiet_left_ms)
+
+
+@lru_cache(maxsize=None)
+def build_strategy(name: str, ignore_patterns: tuple = (), timeout_ms: int = 30000) -> ReadinessStrategy:
+    """Create (once) the strategy for a config name - shared so trackers attach only once per page"""
+    if name == "networkidle":
+        return NetworkIdleReadiness(ignore_patterns, timeout_ms=timeout_ms)
+    elif name in ("load", "domcontentloaded"):
+        return LoadStateReadiness(name)
+    elif name == "selector":
+        return SelectorReadiness()
+    else:
+        raise ValueError(f"Unknown readiness strategy: {name}")
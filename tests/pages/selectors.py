@@ -0,0 +1,118 @@
+"""
+Selector definitions shared by the sync and async page objects
+Each class is mixed into both PracticeXxxPage and AsyncPracticeXxxPage so a
+selector fix lands in one place
+
+Selectors are declared as Selector(...) class attributes. They are validated
+when the class body runs (i.e. at import), and every class deriving from
+SelectorRegistry gets a `selector_registry` of name -> Selector covering its
+whole MRO, which BasePage.query_elements() uses to resolve them in one batch.
+"""
+
+import re
+from typing import Dict
+
+# Playwright selector engines accepted as "engine=body" prefixes
+SELECTOR_ENGINES = ('css', 'xpath', 'text', 'id', 'data-testid', 'data-test-id', 'data-test',
+                    'role', 'nth', 'visible', 'internal:role', 'internal:text', 'internal:label',
+                    'internal:testid', 'internal:has-text')
+
+# Playwright-only CSS extensions that document.querySelector() doesn't understand
+PLAYWRIGHT_PSEUDO_CLASSES = (':has-text(', ':text(', ':text-is(', ':text-matches(', ':visible',
+                             ':nth-match(', ':left-of(', ':right-of(', ':above(', ':below(', ':near(')
+
+_ENGINE_PREFIX = re.compile(r'^([a-zA-Z][\w:-]*)=')
+_BRACKETS = {'(': ')', '[': ']'}
+
+
+class Selector(str):
+    """A validated selector string; `is_css` tells whether the browser can run it natively"""
+
+    is_css: bool
+
+    def __new__(cls, value: str):
+        selector = super().__new__(cls, value)
+        selector.is_css = _validate(value)
+        return selector
+
+
+def _validate(value: str) -> bool:
+    """Raise ValueError for malformed selectors; return True for plain CSS"""
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"Empty selector: {value!r}")
+    if value.startswith(('//', '..', '(')) or '>>' in value:
+        return False
+    match = _ENGINE_PREFIX.match(value)
+    if match:
+        if match.group(1) not in SELECTOR_ENGINES:
+            raise ValueError(f"Unknown selector engine '{match.group(1)}' in {value!r}")
+        if not value[match.end():].strip():
+            raise ValueError(f"Selector {value!r} has no body after the engine name")
+        return False
+    _check_balanced(value)
+    return not any(pseudo in value for pseudo in PLAYWRIGHT_PSEUDO_CLASSES)
+
+
+def _check_balanced(value: str):
+    stack = []
+    quote = None
+    for char in value:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in _BRACKETS:
+            stack.append(_BRACKETS[char])
+        elif char in _BRACKETS.values():
+            if not stack or stack.pop() != char:
+                raise ValueError(f"Unbalanced '{char}' in selector {value!r}")
+    if quote or stack:
+        raise ValueError(f"Unclosed {quote or stack[-1]!r} in selector {value!r}")
+
+
+# Page-object settings that point at one of the page's selectors rather than naming an element
+# (ready_selector = username_input); registering them would query that element twice
+NOT_REGISTERED = ('ready_selector',)
+
+
+class SelectorRegistry:
+    """Collects Selector attributes of a class and its bases into `selector_registry`"""
+
+    selector_registry: Dict[str, Selector] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        registry = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, Selector) and not name.startswith('_') and name not in NOT_REGISTERED:
+                    registry[name] = value
+        cls.selector_registry = registry
+
+
+class PracticeLoginSelectors(SelectorRegistry):
+    """Practice Test Automation login page"""
+
+    username_input = Selector("#username")
+    password_input = Selector("#password")
+    login_button = Selector("#submit")
+    success_message = Selector(".post-title")
+    error_message = Selector("#error")
+    logout_link = Selector("text=Log out")
+
+    # Element that proves the login form is usable (BasePage "selector" readiness);
+    # navigate_to_logged_in() passes its own
+    ready_selector = username_input
+
+
+class PracticeExceptionsSelectors(SelectorRegistry):
+    """Practice Test Automation exceptions page"""
+
+    add_button = Selector("#add_btn")
+    remove_button = Selector("#row2 #remove_btn")  # Remove button appears in row2
+    row2_div = Selector("#row2")  # The row2 div container
+    row2_input = Selector("#row2 input.input-field")  # Input inside row2 div
+    confirmation_message = Selector("#confirmation")
+
+    ready_selector = add_button
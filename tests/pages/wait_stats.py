@@ -0,0 +1,154 @@
+"""
+Learned wait budgets for dynamic elements
+
+Every adaptive wait (BasePage.wait_adaptively) records how long its element
+took to appear, per site origin, page object and selector (a local stand-in
+site and the live one have different timing). The samples are persisted
+between runs, and once there are enough of them the timeout comes from the
+observed p99 plus headroom instead of a hand-tuned constant. A timeout is
+recorded as a sample at the budget that was exceeded, so the budget grows
+after a false timeout.
+"""
+
+import json
+import math
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from config import config
+
+WAIT_STATS_VERSION = 2
+# Samples kept per origin + page object + selector (oldest dropped first)
+MAX_SAMPLES = 50
+# Below this many samples the caller's default timeout is used unchanged
+MIN_SAMPLES = 5
+HEADROOM = 1.5
+SLACK_MS = 500
+MIN_TIMEOUT_MS = 1000
+# Learned budgets never exceed this multiple of the default
+MAX_GROWTH = 3
+
+
+def origin_of(url: str) -> str:
+    """scheme://host:port of the page a wait runs on"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+class WaitStats:
+    """Appearance times per (origin, page class, selector), loaded lazily and merged on save"""
+
+    def __init__(self, path: Optional[Path] = None, learning: bool = True):
+        self._path = Path(path) if path else None
+        # False: every wait gets its caller's default and nothing is recorded (load runs)
+        self.learning = learning
+        self._waits: Optional[Dict[str, dict]] = None
+        # Only what this process measured, so save() can merge with other workers
+        self._new: Dict[str, dict] = defaultdict(lambda: {'samples': [], 'timeouts': 0})
+        self.measured = set()
+
+    @property
+    def path(self) -> Path:
+        """WAIT_STATS_FILE unless a path was given (read on first use, not at import)"""
+        return self._path or config.WAIT_STATS_FILE
+
+    @staticmethod
+    def key(origin: str, page_class: str, selector: str) -> str:
+        return f"{origin}|{page_class}|{selector}"
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get('version') == WAIT_STATS_VERSION:
+                return data['waits']
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        return {}
+
+    @property
+    def waits(self) -> Dict[str, dict]:
+        if self._waits is None:
+            self._waits = self._load()
+        return self._waits
+
+    def _entry(self, key: str) -> dict:
+        return self.waits.setdefault(key, {'samples': [], 'timeouts': 0})
+
+    def timeout_for(self, origin: str, page_class: str, selector: str, default_ms: int) -> int:
+        """Learned timeout in ms, or default_ms while there is too little history from this origin"""
+        if not self.learning:
+            return default_ms
+        samples = self.waits.get(self.key(origin, page_class, selector), {}).get('samples', [])
+        if len(samples) < MIN_SAMPLES:
+            return default_ms
+        learned = _percentile(samples, 99) * HEADROOM + SLACK_MS
+        return int(min(max(learned, MIN_TIMEOUT_MS), default_ms * MAX_GROWTH))
+
+    def record(self, origin: str, page_class: str, selector: str, elapsed_ms: float, default_ms: int):
+        if not self.learning:
+            return
+        key = self.key(origin, page_class, selector)
+        self.measured.add(key)
+        for entry in (self._entry(key), self._new[key]):
+            entry['samples'] = (entry['samples'] + [round(elapsed_ms, 1)])[-MAX_SAMPLES:]
+            entry['default_ms'] = default_ms
+
+    def record_timeout(self, origin: str, page_class: str, selector: str, timeout_ms: int, default_ms: int):
+        """A timeout counts as a sample at the exceeded budget so the next one is larger"""
+        if not self.learning:
+            return
+        self.record(origin, page_class, selector, timeout_ms, default_ms)
+        key = self.key(origin, page_class, selector)
+        self._entry(key)['timeouts'] += 1
+        self._new[key]['timeouts'] += 1
+
+    def save(self):
+        """Merge this process's samples into the file (other workers may have written too)"""
+        if not self._new:
+            return
+        merged = self._load()
+        for key, new in self._new.items():
+            entry = merged.setdefault(key, {'samples': [], 'timeouts': 0})
+            entry['samples'] = (entry['samples'] + new['samples'])[-MAX_SAMPLES:]
+            entry['timeouts'] += new['timeouts']
+            entry['default_ms'] = new['default_ms']
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({'version': WAIT_STATS_VERSION, 'waits': merged}, indent=1, sort_keys=True))
+        os.replace(tmp_path, self.path)
+        self._waits = merged
+        self._new.clear()
+
+    def summary(self) -> List[dict]:
+        """One row per origin + page class + selector with percentiles and the timeout the next wait gets"""
+        rows = []
+        for key, entry in sorted(self.waits.items()):
+            if not entry['samples']:
+                continue
+            origin, page_class, selector = key.split('|', 2)
+            rows.append({
+                'origin': origin,
+                'page_class': page_class,
+                'selector': selector,
+                'samples': len(entry['samples']),
+                'p50_ms': _percentile(entry['samples'], 50),
+                'p95_ms': _percentile(entry['samples'], 95),
+                'default_ms': entry.get('default_ms'),
+                'timeout_ms': self.timeout_for(origin, page_class, selector, entry.get('default_ms', MIN_TIMEOUT_MS)),
+                'timeouts': entry['timeouts'],
+                'measured_this_run': key in self.measured,
+            })
+        return rows
+
+
+# Shared by every page object in the process; the wait_stats plugin saves it
+wait_stats = WaitStats()
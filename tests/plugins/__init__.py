@@ -0,0 +1,19 @@
+"""
+pytest Plugins Package
+
+Harness plugins registered from tests/conftest.py via pytest_plugins.
+
+Available Plugins:
+- sharding: Duration-balanced --num-shards/--shard-id split and worker reports
+- readiness: Terminal summary of time spent in page readiness waits
+- network: Request blocking / asset cache fixtures and per-test counters
+- record_replay: --record / --replay of per-test network traffic archives
+- action_timing: --action-timing per-step p50/p95/max report of page-object calls
+- run_profile: --run-profile demo/debug/ci-fast and lazy (failure-only) tracing
+- local_site: --local-site serves the practice sites from practice_server.py
+- wait_stats: Saves learned element appearance times and reports them per page object
+- artifacts: Failure screenshot/DOM/console captured in memory, compressed and written in the background
+- impact: --impact-since REF runs only tests affected by a git diff, --impact-record maps tests to code
+- flaky: Reruns failed tests in a fresh context, records flaky/broken verdicts and durations in SQLite
+- browser_server: --browser-server connects to a shared browser server (cross-browser matrix)
+"""
@@ -0,0 +1,87 @@
+"""
+pytest plugin: per-action timing of page objects and a slow-step report
+
+Enable with --action-timing (or ACTION_TIMING=true). At session end the
+aggregated p50/p95/max per page-object step is written to JSON and the 20
+slowest steps are printed. Without the flag nothing is instrumented.
+
+Sharded runs (--num-shards > 1) write action-timings-<shard id>.json into
+--shard-report-dir instead; `python -m tests.utils.sharding report` merges them.
+"""
+
+import pytest
+from config import config as app_config
+from tests.utils.action_timing import (
+    DEFAULT_REPORT,
+    ActionTimings,
+    instrument_page_objects,
+    shard_report_path,
+)
+
+_timings = None
+_restore = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("action-timing", "Page-object action timing")
+    group.addoption(
+        "--action-timing",
+        action="store_true",
+        default=app_config.ACTION_TIMING,
+        help="Time every page-object action and report the slowest steps",
+    )
+    group.addoption(
+        "--action-timing-report",
+        default=DEFAULT_REPORT,
+        help="Where to write the JSON timing report (sharded runs use --shard-report-dir)",
+    )
+
+
+def pytest_configure(config):
+    global _timings, _restore
+    if config.getoption("--action-timing"):
+        _timings = ActionTimings()
+        _restore = instrument_page_objects(_timings)
+
+
+def pytest_unconfigure(config):
+    global _timings, _restore
+    if _restore:
+        _restore()
+    _timings = _restore = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    if _timings is None:
+        yield
+        return
+    _timings.current_test = item.nodeid
+    yield
+    _timings.current_test = None
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if _timings is None or not _timings.samples:
+        return
+    if config.getoption("--num-shards") > 1:
+        # Every shard gets the same options, so one shared file would be overwritten
+        report_path = shard_report_path(config.getoption("--shard-report-dir"), config.getoption("--shard-id"))
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        report_path = config.getoption("--action-timing-report")
+    _timings.write_json(report_path)
+
+    terminalreporter.section("top 20 slowest page-object steps (by p95)")
+    terminalreporter.write_line(
+        f"{'step':<58} {'count':>5} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"
+    )
+    for row in _timings.aggregate()[:20]:
+        step = f"{row['page_class']}.{row['method']}"
+        if row['selector']:
+            step += f"({row['selector']})"
+        terminalreporter.write_line(
+            f"{step[:58]:<58} {row['count']:>5} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['max_ms']:>8.1f}"
+        )
+    terminalreporter.write_line(f"Full report: {report_path}")
@@ -0,0 +1,104 @@
+"""
+pytest plugin: failure artifacts captured in memory, written in the background
+
+With --artifacts on-failure (default, or ARTIFACTS) the console of every test
+is collected and, when the test fails, each open page's screenshot and DOM
+are grabbed as bytes and handed to artifact_writer. Compression,
+deduplication and disk writes happen on its thread pool, so the test only
+pays for the capture itself. Pending writes are flushed at session end.
+"""
+
+import time
+from typing import Optional
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+from slugify import slugify
+from config import config as app_config
+from tests.pages.artifacts import artifact_writer
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("artifacts", "Failure artifacts")
+    group.addoption(
+        "--artifacts",
+        default=app_config.ARTIFACTS,
+        choices=["on-failure", "off"],
+        help="Capture screenshot, DOM and console log of failing tests (written in the background)",
+    )
+
+
+def pytest_configure(config):
+    # Sharded workers split the run's budget
+    num_shards = config.getoption("--num-shards", 1)
+    if num_shards > 1:
+        artifact_writer.budget_bytes //= num_shards
+
+
+class FailureArtifacts:
+    """Collects a context's console output and captures its pages when the test failed"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._console = {}
+
+    def start(self, context, node, label: str = ""):
+        """label tells apart extra contexts of one test (e.g. a login); their files go to a subdirectory"""
+        lines = []
+
+        def on_console(message):
+            lines.append(f"[{message.type}] {message.text}")
+
+        context.on("console", on_console)
+        self._console[node.nodeid, label] = (on_console, lines)
+
+    def stop(self, context, node, label: str = "", failed: Optional[bool] = None):
+        """failed: known outcome for a context closed mid-test, else taken from the test's reports"""
+        on_console, lines = self._console.pop((node.nodeid, label))
+        context.remove_listener("console", on_console)
+        if failed is None:
+            # No call report means setup failed or the run was interrupted - capture too
+            report = getattr(node, "rep_call", None) or getattr(node, "rep_setup", None)
+            failed = report is None or report.failed
+        if not failed:
+            return
+        start = time.perf_counter()
+        directory = f"{slugify(node.nodeid)}/{label}" if label else slugify(node.nodeid)
+        for number, page in enumerate(context.pages):
+            try:
+                screenshot, dom = page.screenshot(), page.content()
+            except PlaywrightError:
+                continue  # page crashed or closed while capturing
+            self.writer.submit(f"{directory}/page-{number}-screenshot", screenshot, "image")
+            self.writer.submit(f"{directory}/page-{number}-dom.html", dom.encode(), "text")
+        self.writer.submit(f"{directory}/console.log", "\n".join(lines).encode(), "text")
+        self.writer.stats.capture_seconds.append(time.perf_counter() - start)
+
+
+@pytest.fixture(scope="session")
+def failure_artifacts(pytestconfig):
+    """FailureArtifacts unless --artifacts off"""
+    if pytestconfig.getoption("--artifacts") == "off":
+        return None
+    return FailureArtifacts(artifact_writer)
+
+
+def pytest_sessionfinish(session):
+    artifact_writer.close()
+
+
+def pytest_terminal_summary(terminalreporter):
+    stats = artifact_writer.stats
+    if not stats.submitted:
+        return
+    capture_ms = sum(stats.capture_seconds) * 1000
+    terminalreporter.section("artifacts")
+    terminalreporter.write_line(
+        f"{stats.written} written, {stats.deduplicated} deduplicated, {stats.dropped} dropped over the "
+        f"{artifact_writer.budget_bytes / 1024 / 1024:.0f} MB budget -> {artifact_writer.root}"
+    )
+    terminalreporter.write_line(
+        f"{stats.raw_bytes / 1024:.0f} KB captured, {stats.written_bytes / 1024:.0f} KB on disk; "
+        f"tests spent {capture_ms:.0f} ms capturing, {stats.write_seconds * 1000:.0f} ms of encoding "
+        f"and writing ran in the background"
+    )
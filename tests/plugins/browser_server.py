@@ -0,0 +1,25 @@
+"""
+pytest plugin: --browser-server connects to a shared browser instead of launching one
+
+The browser matrix (python -m tests.utils.browser_matrix, ./run_tests.sh
+--browsers) starts one browser server per engine and points every pytest
+process of that engine at it; the `launch_browser` fixture in conftest.py
+then calls browser_type.connect() with this endpoint.
+"""
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("browser server", "Shared browser servers")
+    group.addoption(
+        "--browser-server",
+        metavar="WS_ENDPOINT",
+        default=None,
+        help="ws:// endpoint of a running browser server of the --browser engine",
+    )
+
+
+def pytest_report_header(config):
+    endpoint = config.getoption("--browser-server")
+    if endpoint:
+        return f"browser server: {endpoint}"
+    return None
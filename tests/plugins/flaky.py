@@ -0,0 +1,165 @@
+"""
+pytest plugin: flaky-test detection with targeted reruns
+
+A test whose call phase failed is rerun right away, up to --flaky-reruns
+times, in a fresh browser context (never a pooled one; see the `context`
+fixture); setup and teardown errors are reported once. A test that passes
+on a rerun is reported as passed but classified flaky; one that fails every
+attempt is broken. Every attempt and verdict goes to the SQLite history
+in TEST_HISTORY_DB (the latest HISTORY_RUNS runs of each test; runs without
+a browser test aren't recorded). Its median passing durations order
+--longest-first and are written to TEST_DURATIONS_FILE for sharding the next
+run; this plugin is the only one writing that file during a session (with
+--no-test-history it saves the passing durations of this run instead).
+Sharded workers leave it to run_tests.sh, which merges their reports after a
+parallel run. The run ends with a "flaky tests" summary of the wall time lost
+to reruns.
+"""
+
+import os
+
+import pytest
+from _pytest.runner import runtestprotocol
+from config import config as app_config
+from tests.utils.flaky import OutcomeHistory, classify, feed_durations, wasted_seconds
+from tests.utils.sharding import save_durations, uses_browser
+
+# Attempt number of the running test (0 = first run), read by the rerun_attempt fixture
+attempt_key = pytest.StashKey[int]()
+
+_history = None
+# nodeid -> [(outcome, seconds)] per attempt in this run
+_attempts = {}
+# History verdict counts per test, read at session end for the summary
+_recent = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("flaky", "Flaky-test detection")
+    group.addoption(
+        "--flaky-reruns",
+        type=int,
+        default=app_config.FLAKY_RERUNS,
+        help="Rerun a failed test up to N times in a fresh context (0 disables)",
+    )
+    group.addoption(
+        "--longest-first",
+        action="store_true",
+        default=False,
+        help="Run tests in order of their recent duration, longest first",
+    )
+    group.addoption(
+        "--no-test-history",
+        action="store_true",
+        default=False,
+        help="Don't read or write TEST_HISTORY_DB",
+    )
+
+
+def pytest_configure(config):
+    global _history
+    if not config.getoption("--no-test-history"):
+        _history = OutcomeHistory(app_config.TEST_HISTORY_DB)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    """After selection and sharding, so only the tests this process runs are reordered"""
+    if not config.getoption("--longest-first") or _history is None:
+        return
+    durations = _history.durations()
+    # Unknown tests first: they may be long, and we learn their duration early
+    items.sort(key=lambda item: -durations.get(item.nodeid, float("inf")))
+
+
+def _attempt_outcome(reports) -> str:
+    if any(report.failed for report in reports):
+        return "failed"
+    if any(report.skipped for report in reports):
+        return "skipped"
+    return "passed"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Run the test, then rerun it while its call fails and reruns are left"""
+    reruns = max(item.config.getoption("--flaky-reruns"), 0)
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    attempts = _attempts.setdefault(item.nodeid, [])
+    for attempt in range(reruns + 1):
+        item.stash[attempt_key] = attempt
+        for when in ("setup", "call", "teardown"):
+            # pytest-playwright's rep_<when> of the previous attempt would look like this one's
+            item.__dict__.pop(f"rep_{when}", None)
+        reports = runtestprotocol(item, nextitem=nextitem, log=False)
+        outcome = _attempt_outcome(reports)
+        attempts.append((outcome, sum(report.duration for report in reports)))
+        # A setup or teardown error (no browser, bad fixture) fails the same way on every attempt
+        test_failed = any(report.when == "call" and report.failed for report in reports)
+        final = not test_failed or attempt == reruns
+        for report in reports:
+            if not final and report.failed:
+                report.outcome = "rerun"
+            item.ihook.pytest_runtest_logreport(report=report)
+        if final:
+            break
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+def pytest_report_teststatus(report):
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+    return None
+
+
+@pytest.fixture
+def rerun_attempt(request) -> int:
+    """0 on a test's first run, 1.. on reruns"""
+    return request.node.stash.get(attempt_key, 0)
+
+
+def pytest_sessionfinish(session):
+    """Record the run and, unless sharded, update TEST_DURATIONS_FILE (its only writer in a session)"""
+    global _recent
+    if not _attempts or not any(uses_browser(item) for item in session.items):
+        # Unit-only runs (pytest tests/test_config.py) would churn the history for nothing
+        return
+    sharded = session.config.getoption("--num-shards") > 1
+    if _history is None:
+        if not sharded:
+            save_durations(app_config.TEST_DURATIONS_FILE, {
+                nodeid: attempts[-1][1] for nodeid, attempts in _attempts.items() if attempts[-1][0] == "passed"
+            })
+        return
+    worker = f"shard-{session.config.getoption('--shard-id')}" if sharded else "main"
+    _history.record_run(_attempts, worker=f"{worker}:{os.getpid()}")
+    if not sharded:
+        feed_durations(_history, app_config.TEST_DURATIONS_FILE)
+    _recent = _history.flake_rates()
+    _history.close()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Flaky and broken tests of this run and the time their reruns took"""
+    rerun = {nodeid: attempts for nodeid, attempts in _attempts.items() if len(attempts) > 1}
+    if not rerun:
+        return
+    verdicts = {nodeid: classify([outcome for outcome, _ in attempts]) for nodeid, attempts in rerun.items()}
+    terminalreporter.section("flaky tests")
+    for nodeid, attempts in sorted(rerun.items(), key=lambda row: -wasted_seconds(row[1])):
+        failed = sum(outcome == "failed" for outcome, _ in attempts)
+        line = (f"{verdicts[nodeid]:<6} {nodeid}: failed {failed}/{len(attempts)} attempts, "
+                f"{wasted_seconds(attempts):.1f} s rerun")
+        history_entry = _recent.get(nodeid)
+        if history_entry:
+            line += (f"; last {history_entry['runs']} runs: {history_entry['flaky']} flaky, "
+                     f"{history_entry['broken']} broken")
+        terminalreporter.write_line(line)
+    flaky = [nodeid for nodeid, verdict in verdicts.items() if verdict == "flaky"]
+    broken = [nodeid for nodeid, verdict in verdicts.items() if verdict == "broken"]
+    terminalreporter.write_line(
+        f"{len(flaky)} flaky, {len(broken)} broken; wall time wasted on flakes "
+        f"{sum(wasted_seconds(rerun[nodeid]) for nodeid in flaky):.1f} s, on rerunning broken tests "
+        f"{sum(wasted_seconds(rerun[nodeid]) for nodeid in broken):.1f} s"
+    )
@@ -0,0 +1,122 @@
+"""
+pytest plugin: test-impact selection
+
+--impact-since REF keeps only the tests a `git diff REF` (plus uncommitted and
+untracked files) can affect, using the static dependency map rebuilt from the
+current tree and the runtime coverage stored in IMPACT_MAP_FILE.
+--impact-record records which page-object methods, selectors and Config
+settings every test actually reaches and stores them for later selections.
+"""
+
+import subprocess
+
+import pytest
+from config import config as app_config
+from tests.utils.impact import (
+    ImpactMap,
+    RuntimeRecorder,
+    SymbolIndex,
+    build_static_map,
+    changes_from_diff,
+    git_changes,
+    select,
+)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("impact", "Test-impact selection")
+    group.addoption(
+        "--impact-since",
+        metavar="REF",
+        default=None,
+        help="Run only tests affected by changes since this git ref (e.g. origin/main)",
+    )
+    group.addoption(
+        "--impact-record",
+        action="store_true",
+        default=False,
+        help="Record the code each test reaches into the impact map",
+    )
+
+
+_index = None
+_recorder = None
+_summary = None
+
+
+def _symbol_index(config) -> SymbolIndex:
+    global _index
+    if _index is None:
+        _index = SymbolIndex.build(config.rootpath)
+    return _index
+
+
+def pytest_configure(config):
+    global _recorder
+    if config.getoption("--impact-record"):
+        _recorder = RuntimeRecorder(_symbol_index(config))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(session, config, items):
+    """Runs before sharding so workers split only the affected tests"""
+    global _summary
+    base = config.getoption("--impact-since")
+    if not base:
+        return
+    index = _symbol_index(config)
+    impact_map = ImpactMap.load(app_config.IMPACT_MAP_FILE)
+    impact_map.static = build_static_map(index)
+    try:
+        changes = changes_from_diff(index, *git_changes(base, config.rootpath))
+    except subprocess.CalledProcessError as error:
+        raise pytest.UsageError(f"--impact-since {base}: {error.stderr.strip()}")
+
+    selected_ids = set(select(impact_map, [item.nodeid for item in items], changes))
+    selected = [item for item in items if item.nodeid in selected_ids]
+    deselected = [item for item in items if item.nodeid not in selected_ids]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+    _summary = (base, len(selected), len(selected) + len(deselected), changes)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    if _recorder is None:
+        yield
+        return
+    _recorder.start()
+    try:
+        yield
+    finally:
+        _recorder.stop(item.nodeid)
+
+
+def pytest_sessionfinish(session):
+    if _recorder is None or not _recorder.tests:
+        return
+    impact_map = ImpactMap.load(app_config.IMPACT_MAP_FILE)
+    impact_map.static = build_static_map(_recorder.index)
+    impact_map.runtime.update(_recorder.tests)
+    impact_map.save(app_config.IMPACT_MAP_FILE)
+
+
+def pytest_report_header(config):
+    if config.getoption("--impact-record"):
+        return f"impact: recording runtime coverage into {app_config.IMPACT_MAP_FILE}"
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _summary is None:
+        return
+    base, selected, total, changes = _summary
+    terminalreporter.section("test impact")
+    if changes.run_all:
+        terminalreporter.write_line(f"all {total} tests selected: {changes.run_all}")
+        return
+    terminalreporter.write_line(f"{selected} of {total} tests affected by changes since {base}")
+    for symbol in sorted(changes.symbols):
+        terminalreporter.write_line(f"  changed {symbol}")
+    for path in sorted(changes.files):
+        terminalreporter.write_line(f"  changed {path} (module level)")
@@ -0,0 +1,51 @@
+"""
+pytest plugin: --local-site runs the suite against practice_server.py
+
+Starts the local stand-in once per pytest process on a free port and points
+Config's practice site URLs at it via configure(), so a run needs no network.
+Sharded workers each start their own. Setting LOCAL_SITE_URL instead uses an already running
+server (e.g. `python practice_server.py --workers 4`).
+"""
+
+import os
+
+from config import config as app_config, configure
+from practice_server import PracticeServer, ServerOptions
+
+_server = None
+_previous_url = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("local site")
+    group.addoption("--local-site", action="store_true", default=False,
+                    help="Serve the practice sites from an in-process practice_server.py")
+
+
+def pytest_configure(config):
+    global _server, _previous_url
+    if not config.getoption("--local-site") or _server is not None:
+        return
+    _server = PracticeServer(options=ServerOptions(
+        latency_ms=app_config.LOCAL_SITE_LATENCY_MS,
+        row2_delay_ms=app_config.LOCAL_SITE_ROW2_DELAY_MS,
+        secret=app_config.LOCAL_SITE_SECRET.encode(),
+    )).start()
+    _previous_url = app_config.LOCAL_SITE_URL
+    configure(LOCAL_SITE_URL=_server.url)
+    os.environ["LOCAL_SITE_URL"] = _server.url  # for subprocesses started by tests
+
+
+def pytest_unconfigure(config):
+    global _server
+    if _server is not None:
+        _server.stop()
+        _server = None
+        os.environ.pop("LOCAL_SITE_URL", None)
+        configure(LOCAL_SITE_URL=_previous_url)
+
+
+def pytest_report_header(config):
+    if app_config.LOCAL_SITE_URL:
+        return f"practice sites: {app_config.LOCAL_SITE_URL} (local)"
+    return None
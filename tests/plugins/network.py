@@ -0,0 +1,55 @@
+"""
+pytest plugin: request interception with per-test cache counters
+
+Enabled with NETWORK_INTERCEPT=true. The conftest context fixture installs
+the interceptor on every context; counters are reset per test, stored in the
+test's user_properties (so they reach junit XML) and totalled at session end.
+"""
+
+import pytest
+from config import config
+from tests.utils.network_cache import AssetCache, NetworkInterceptor, RouteStats
+
+_totals = RouteStats()
+
+
+@pytest.fixture(scope="session")
+def network_interceptor():
+    """Session-wide interceptor, or None when NETWORK_INTERCEPT is off"""
+    if not config.NETWORK_INTERCEPT:
+        yield None
+        return
+    cache = AssetCache(config.NETWORK_CACHE_DIR, config.NETWORK_CACHE_MAX_MB * 1024 * 1024)
+    interceptor = NetworkInterceptor(
+        cache=cache,
+        blocked_resource_types=config.BLOCKED_RESOURCE_TYPES,
+        blocked_domains=config.BLOCKED_DOMAINS,
+        har_path=config.NETWORK_HAR_PATH,
+    )
+    yield interceptor
+    cache.save()
+
+
+@pytest.fixture(autouse=True)
+def network_stats(request, network_interceptor):
+    """Interception counters for the current test (None when disabled)"""
+    if network_interceptor is None:
+        yield None
+        return
+    stats = network_interceptor.stats
+    stats.reset()
+    yield stats
+    request.node.user_properties.append(("network", stats.as_dict()))
+    _totals.add(stats)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not (_totals.hits or _totals.misses or _totals.blocked):
+        return
+    terminalreporter.section("network interception")
+    requests = _totals.hits + _totals.misses
+    hit_rate = _totals.hits / requests if requests else 0.0
+    terminalreporter.write_line(
+        f"cache hits: {_totals.hits}  misses: {_totals.misses}  hit rate: {hit_rate:.0%}  "
+        f"blocked: {_totals.blocked}  saved: {_totals.bytes_saved / 1024:.1f} KiB"
+    )
@@ -0,0 +1,20 @@
+"""
+pytest plugin: report how long page readiness strategies waited
+"""
+
+from tests.pages.readiness import readiness_stats
+
+
+def pytest_terminal_summary(terminalreporter):
+    rows = readiness_stats.summary()
+    if not rows:
+        return
+    terminalreporter.section("page readiness waits")
+    terminalreporter.write_line(
+        f"{'page object':<26} {'strategy':<17} {'event':<11} {'count':>5} {'mean ms':>9} {'max ms':>9}"
+    )
+    for row in rows:
+        terminalreporter.write_line(
+            f"{row['page_class']:<26} {row['strategy']:<17} {row['event']:<11} "
+            f"{row['count']:>5} {row['mean_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
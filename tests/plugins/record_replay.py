@@ -0,0 +1,103 @@
+"""
+pytest plugin: --record / --replay of each test's network traffic
+
+--record captures every request of a test into recordings/<test>/traffic.json
+(bodies deduplicated into recordings/blobs); one recording serves every
+browser. --replay serves those archives from in-process route handlers, so the
+suite runs without network access, delaying each response by
+--replay-latency; a request that was never recorded fails the test (its call
+phase, not the fixture teardown) with the list of misses.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from config import config as app_config
+from tests.utils.traffic_archive import (
+    TrafficArchive,
+    TrafficRecorder,
+    TrafficReplayer,
+    archive_name,
+)
+
+# The running test's capture, read when its call report is made
+capture_key = pytest.StashKey[object]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("recording", "Record and replay network traffic")
+    group.addoption(
+        "--record",
+        action="store_true",
+        default=False,
+        help="Record each test's network traffic into --recordings-dir",
+    )
+    group.addoption(
+        "--replay",
+        action="store_true",
+        default=False,
+        help="Serve each test's network traffic from its recording (offline run)",
+    )
+    group.addoption(
+        "--recordings-dir",
+        default=str(app_config.RECORDINGS_DIR),
+        help="Directory holding per-test traffic archives",
+    )
+    group.addoption(
+        "--replay-latency",
+        default=app_config.REPLAY_LATENCY,
+        help="Delay before each replayed response: 'recorded' or a fixed number of ms (default: %(default)s)",
+    )
+
+
+def replay_latency(value: str) -> Optional[float]:
+    """--replay-latency as TrafficReplayer's latency_ms (None = recorded latency)"""
+    if value == "recorded":
+        return None
+    try:
+        latency_ms = float(value)
+    except ValueError:
+        latency_ms = -1
+    if latency_ms < 0:
+        raise pytest.UsageError(f"--replay-latency must be 'recorded' or a number of ms, got {value!r}")
+    return latency_ms
+
+
+def pytest_configure(config):
+    if config.getoption("--record") and config.getoption("--replay"):
+        raise pytest.UsageError("--record and --replay are mutually exclusive")
+    replay_latency(config.getoption("--replay-latency"))
+
+
+@pytest.fixture
+def traffic_capture(request, pytestconfig):
+    """Recorder or replayer for the current test (None for live runs)"""
+    root = Path(pytestconfig.getoption("--recordings-dir"))
+    callspec = getattr(request.node, "callspec", None)
+    name = archive_name(request.node.nodeid, callspec.params.get("browser_name") if callspec else None)
+    if pytestconfig.getoption("--record"):
+        capture = TrafficRecorder(TrafficArchive(root, name))
+    elif pytestconfig.getoption("--replay"):
+        latency_ms = replay_latency(pytestconfig.getoption("--replay-latency"))
+        capture = TrafficReplayer(TrafficArchive.load(root, name), latency_ms)
+    else:
+        yield None
+        return
+    request.node.stash[capture_key] = capture
+    yield capture
+    capture.finish()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Fail a replayed test whose requests weren't all in its recording"""
+    outcome = yield
+    report = outcome.get_result()
+    capture = item.stash.get(capture_key, None)
+    if call.when != "call" or not isinstance(capture, TrafficReplayer) or report.failed:
+        return
+    missing = capture.missing()
+    if missing:
+        report.outcome = "failed"
+        report.longrepr = missing
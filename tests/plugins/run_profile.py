@@ -0,0 +1,94 @@
+"""
+pytest plugin: run profiles (demo / debug / ci-fast)
+
+--run-profile (or RUN_PROFILE) sets slow_mo, headless, video, screenshots and
+tracing together. Explicit --video/--screenshot/--tracing/--slowmo/--headed
+flags still win. Profiles with tracing "lazy" trace every test but only
+export trace.zip when the test failed; it goes through artifact_writer, so it
+is written off the test thread and counts against ARTIFACTS_BUDGET_MB.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from slugify import slugify
+from config import RUN_PROFILES, config as app_config, configure
+from tests.pages.artifacts import ArtifactWriter, artifact_writer
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("run-profile", "Run profiles")
+    group.addoption(
+        "--run-profile",
+        default=app_config.RUN_PROFILE,
+        choices=list(RUN_PROFILES),
+        help="Settings bundle for slow_mo, headless, video, screenshots and tracing",
+    )
+
+
+def _given_explicitly(config, option):
+    """True if the option was passed on the command line or in addopts"""
+    args = list(config.invocation_params.args) + list(config.getini("addopts"))
+    return any(arg == option or arg.startswith(f"{option}=") for arg in args)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # The command line is the top layer of Config
+    configure(RUN_PROFILE=config.getoption("--run-profile"))
+    profile = RUN_PROFILES[config.getoption("--run-profile")]
+    # pytest-playwright reads these options lazily, so overriding them here is enough
+    for option in ("video", "screenshot"):
+        if not _given_explicitly(config, f"--{option}"):
+            setattr(config.option, option, profile[option])
+    if not _given_explicitly(config, "--tracing"):
+        config.option.tracing = "off" if profile["tracing"] == "lazy" else profile["tracing"]
+    # --slowmo defaults to 0, so only the command line tells an explicit --slowmo 0 from unset
+    if not _given_explicitly(config, "--slowmo"):
+        config.option.slowmo = profile["slow_mo"]
+
+
+@pytest.fixture(scope="session")
+def run_profile(pytestconfig):
+    """Settings of the active run profile"""
+    return app_config.get_run_profile(pytestconfig.getoption("--run-profile"))
+
+
+class LazyTrace:
+    """Trace every test, export trace.zip only for failures"""
+
+    def __init__(self, output_dir, writer: ArtifactWriter = artifact_writer):
+        # Absolute, so the writer doesn't put it under its own root
+        self.output_dir = Path(output_dir).resolve()
+        self.writer = writer
+
+    def start(self, context, node, label: str = ""):
+        context.tracing.start(title=node.nodeid, screenshots=True, snapshots=True, sources=True)
+
+    def stop(self, context, node, label: str = "", failed: Optional[bool] = None):
+        if failed is None:
+            # No rep_call means setup failed or the run was interrupted - keep the trace
+            failed = node.rep_call.failed if hasattr(node, "rep_call") else True
+        if not failed:
+            context.tracing.stop()
+            return
+        # Playwright can only export to a path; the final write is the writer's
+        descriptor, temp_path = tempfile.mkstemp(prefix="trace-", suffix=".zip")
+        os.close(descriptor)
+        try:
+            context.tracing.stop(path=temp_path)
+            data = Path(temp_path).read_bytes()
+        finally:
+            os.unlink(temp_path)
+        self.writer.submit(self.output_dir / slugify(node.nodeid) / label / "trace.zip", data, kind="raw")
+
+
+@pytest.fixture(scope="session")
+def lazy_trace(pytestconfig, run_profile):
+    """LazyTrace when the profile asks for lazy tracing and --tracing wasn't given, else None"""
+    if run_profile["tracing"] != "lazy" or _given_explicitly(pytestconfig, "--tracing"):
+        return None
+    return LazyTrace(pytestconfig.getoption("--output"))
@@ -0,0 +1,80 @@
+"""
+pytest plugin: duration-balanced sharding for parallel worker processes
+
+run_tests.sh --workers N starts N pytest processes with --num-shards N and
+--shard-id 0..N-1. Each process keeps only its share of the collected tests
+and writes a worker report (durations + utilisation) at session end. The
+durations file itself is written by the flaky plugin (single runs) and by
+run_tests.sh (after a parallel run), never here.
+"""
+
+import pytest
+from config import config as app_config
+from tests.utils.sharding import (
+    WorkerStats,
+    load_durations,
+    partition_by_duration,
+)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sharding", "Parallel sharded execution")
+    group.addoption(
+        "--num-shards",
+        type=int,
+        default=1,
+        help="Total number of worker processes the suite is split across",
+    )
+    group.addoption(
+        "--shard-id",
+        type=int,
+        default=0,
+        help="Which shard (0-based) this process runs",
+    )
+    group.addoption(
+        "--shard-report-dir",
+        default=".shard-reports",
+        help="Directory for per-worker utilisation reports",
+    )
+    group.addoption(
+        "--context-pool",
+        type=int,
+        default=app_config.CONTEXT_POOL_SIZE,
+        help="Number of pre-warmed browser contexts reused per worker (0 disables)",
+    )
+
+
+_worker_stats = None
+
+
+def pytest_configure(config):
+    global _worker_stats
+    _worker_stats = WorkerStats(config.getoption("--shard-id"))
+
+
+def pytest_collection_modifyitems(session, config, items):
+    num_shards = config.getoption("--num-shards")
+    if num_shards <= 1:
+        return
+    shard_id = config.getoption("--shard-id")
+    if not 0 <= shard_id < num_shards:
+        raise pytest.UsageError(f"--shard-id must be between 0 and {num_shards - 1}")
+
+    durations = load_durations(app_config.TEST_DURATIONS_FILE)
+    shards = partition_by_duration([item.nodeid for item in items], durations, num_shards)
+    selected_ids = set(shards[shard_id])
+    selected = [item for item in items if item.nodeid in selected_ids]
+    deselected = [item for item in items if item.nodeid not in selected_ids]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+def pytest_runtest_logreport(report):
+    _worker_stats.add(report.nodeid, report.duration)
+
+
+def pytest_sessionfinish(session):
+    if session.config.getoption("--num-shards") > 1:
+        # run_tests.sh merges all worker reports into the durations file afterwards
+        _worker_stats.write(session.config.getoption("--shard-report-dir"))
@@ -0,0 +1,30 @@
+"""
+pytest plugin: persist learned element waits and report them per page object
+
+BasePage.wait_adaptively records appearance times into the shared wait_stats;
+at session end they are merged into WAIT_STATS_FILE (sharded workers merge
+into the same file) and the selectors waited on in this run are listed.
+"""
+
+from tests.pages.wait_stats import wait_stats
+
+
+def pytest_sessionfinish(session):
+    wait_stats.save()
+
+
+def pytest_terminal_summary(terminalreporter):
+    rows = [row for row in wait_stats.summary() if row['measured_this_run']]
+    if not rows:
+        return
+    terminalreporter.section("learned element waits")
+    terminalreporter.write_line(
+        f"{'origin':<28} {'page object':<26} {'selector':<26} {'samples':>7} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'timeout ms':>10} {'default':>8} {'timeouts':>8}"
+    )
+    for row in rows:
+        terminalreporter.write_line(
+            f"{row['origin'][:28]:<28} {row['page_class']:<26} {row['selector'][:26]:<26} {row['samples']:>7} "
+            f"{row['p50_ms']:>8.0f} {row['p95_ms']:>8.0f} {row['timeout_ms']:>10} "
+            f"{row['default_ms']:>8} {row['timeouts']:>8}"
+        )
@@ -0,0 +1,97 @@
+"""
+Unit tests for page-object action timing (fake page objects, no browser needed)
+"""
+import asyncio
+import json
+
+from tests.utils.action_timing import ActionTimings, instrument, merge_reports, percentile, shard_report_path
+
+
+class FakeBasePage:
+    def click_element(self, selector):
+        return selector
+
+    def _private_helper(self):
+        return "untouched"
+
+
+class FakeLoginPage(FakeBasePage):
+    def login(self):
+        self.click_element("#submit")
+
+    async def async_click(self, selector):
+        await asyncio.sleep(0)
+
+
+class TestActionTiming:
+    """Instrumentation and aggregation"""
+
+    def test_records_class_method_selector_and_nesting(self):
+        timings = ActionTimings()
+        timings.current_test = "tests/test_x.py::test_login"
+        restore = instrument([FakeBasePage, FakeLoginPage], timings)
+        try:
+            FakeLoginPage().login()
+        finally:
+            restore()
+
+        recorded = [(s['page_class'], s['method'], s['selector'], s['depth']) for s in timings.samples]
+        assert recorded == [
+            ("FakeLoginPage", "click_element", "#submit", 1),
+            ("FakeLoginPage", "login", None, 0),
+        ]
+        assert all(sample['test'] == "tests/test_x.py::test_login" for sample in timings.samples)
+
+    def test_restore_removes_wrappers(self):
+        original = FakeBasePage.click_element
+        restore = instrument([FakeBasePage], ActionTimings())
+        assert FakeBasePage.click_element is not original
+        restore()
+        assert FakeBasePage.click_element is original
+
+    def test_private_methods_are_not_wrapped(self):
+        original = FakeBasePage._private_helper
+        restore = instrument([FakeBasePage], ActionTimings())
+        try:
+            assert FakeBasePage._private_helper is original
+        finally:
+            restore()
+
+    def test_async_methods_stay_awaitable(self):
+        timings = ActionTimings()
+        restore = instrument([FakeLoginPage], timings)
+        try:
+            asyncio.run(FakeLoginPage().async_click("#add_btn"))
+        finally:
+            restore()
+        assert timings.samples[0]['selector'] == "#add_btn"
+
+    def test_aggregate_percentiles(self):
+        timings = ActionTimings()
+        for ms in range(1, 101):
+            timings.record("Page", "click_element", "#a", ms / 1000, 0)
+        timings.record("Page", "fill_field", "#b", 0.5, 0)
+
+        rows = timings.aggregate()
+
+        assert rows[0]['method'] == "fill_field"
+        click = rows[1]
+        assert (click['count'], round(click['p50_ms']), round(click['p95_ms']), round(click['max_ms'])) == (100, 50, 95, 100)
+
+    def test_percentile_nearest_rank(self):
+        assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+        assert percentile([5.0], 95) == 5.0
+
+    def test_shard_reports_merge_from_samples(self, tmp_path):
+        for shard_id, seconds in enumerate([[0.001] * 19, [0.1]]):
+            timings = ActionTimings()
+            for value in seconds:
+                timings.record("Page", "click_element", "#a", value, 0)
+            timings.write_json(shard_report_path(tmp_path, shard_id))
+
+        output = tmp_path / "action-timings.json"
+        merge_reports(tmp_path, output)
+
+        step, = json.loads(output.read_text())['steps']
+        assert (step['count'], round(step['p50_ms']), round(step['max_ms'])) == (20, 1, 100)
+        assert merge_reports(tmp_path / "empty", output) is None
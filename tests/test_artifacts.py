@@ -0,0 +1,133 @@
+"""
+Unit tests for the background artifact writer and failure capture (fake pages, no browser needed)
+"""
+import gzip
+import threading
+from pathlib import Path
+
+import pytest
+from tests.fakes import FakeContext, FakePage
+from tests.pages import artifacts as artifacts_module, base_page
+from tests.pages.artifacts import ArtifactWriter
+from tests.pages.base_page import BasePage
+from tests.plugins.artifacts import FailureArtifacts
+from tests.plugins.run_profile import LazyTrace
+
+DOM = b"<html><body>" + b"<div class='row'>row</div>" * 500 + b"</body></html>"
+
+
+@pytest.fixture
+def writer(tmp_path, monkeypatch):
+    # Exercise the stdlib fallback whatever is installed
+    monkeypatch.setattr(artifacts_module, "zstandard", None)
+    monkeypatch.setattr(artifacts_module, "Image", None)
+    writer = ArtifactWriter(tmp_path, budget_mb=1)
+    yield writer
+    writer.close()
+
+
+class TestArtifactWriter:
+    """Compression, deduplication and the budget"""
+
+    def test_writes_in_background_thread(self, writer, monkeypatch):
+        threads = []
+        original = artifacts_module.encode_text
+        monkeypatch.setitem(artifacts_module.ENCODERS, "text",
+                            lambda data: threads.append(threading.current_thread().name) or original(data))
+
+        path = writer.submit("test_a/dom.html", DOM, "text").result()
+
+        assert path == writer.root / "test_a/dom.html.gz"
+        assert gzip.decompress(path.read_bytes()) == DOM
+        assert path.stat().st_size < len(DOM) / 10
+        assert threads[0].startswith("artifacts")
+
+    def test_identical_content_is_hard_linked(self, writer):
+        first = writer.submit("test_a/page-0-screenshot", b"png-bytes", "image").result()
+        second = writer.submit("test_b/page-0-screenshot", b"png-bytes", "image").result()
+
+        assert second == writer.root / "test_b/page-0-screenshot.png"
+        assert second.read_bytes() == b"png-bytes"
+        assert first.stat().st_ino == second.stat().st_ino
+        assert (writer.stats.written, writer.stats.deduplicated) == (1, 1)
+
+    def test_budget_drops_failure_artifacts_but_not_explicit_saves(self, writer, tmp_path):
+        writer.budget_bytes = 100
+        assert writer.submit("test_a/big", b"x" * 200).result() is None
+        explicit = writer.submit(tmp_path / "screenshots/login.png", b"y" * 200, budgeted=False).result()
+
+        assert explicit.read_bytes() == b"y" * 200
+        assert writer.stats.dropped == 1
+
+    def test_take_screenshot_returns_its_write(self, writer, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(base_page, "artifact_writer", writer)
+
+        path = BasePage(FakePage()).take_screenshot("login").result()
+
+        assert path == tmp_path / "screenshots" / "login.png"
+        assert path.read_bytes() == b"png-bytes"
+
+    def test_unknown_kind(self, writer):
+        with pytest.raises(ValueError, match="video"):
+            writer.submit("test_a/clip", b"", "video")
+
+
+class FakeMessage:
+    def __init__(self, type, text):
+        self.type = type
+        self.text = text
+
+
+class FakeNode:
+    def __init__(self, failed):
+        self.nodeid = "tests/test_x.py::test_y"
+        self.rep_call = type("Report", (), {"failed": failed})()
+
+
+class TestFailureArtifacts:
+    """Console is collected for every test, pages are captured only on failure"""
+
+    def capture(self, writer, failed):
+        context, node = FakeContext(), FakeNode(failed)
+        context.new_page()
+        failure_artifacts = FailureArtifacts(writer)
+        failure_artifacts.start(context, node)
+        (event, on_console), = context.listeners
+        on_console(FakeMessage("error", "Uncaught TypeError"))
+        failure_artifacts.stop(context, node)
+        writer.flush()
+        assert event == "console" and context.listeners == []
+        return sorted(path.name for path in (writer.root / "tests-test-x-py-test-y").glob("*"))
+
+    def test_failed_test_captures_screenshot_dom_and_console(self, writer):
+        assert self.capture(writer, failed=True) == [
+            "console.log.gz", "page-0-dom.html.gz", "page-0-screenshot.png"
+        ]
+        console = writer.root / "tests-test-x-py-test-y" / "console.log.gz"
+        assert gzip.decompress(console.read_bytes()) == b"[error] Uncaught TypeError"
+        assert len(writer.stats.capture_seconds) == 1
+
+    def test_passed_test_writes_nothing(self, writer):
+        assert self.capture(writer, failed=False) == []
+        assert writer.stats.submitted == 0
+
+
+class TestLazyTrace:
+    """Only failing tests export a trace, and the writer writes it"""
+
+    def test_failed_trace_goes_through_the_writer(self, writer, tmp_path):
+        context, node = FakeContext(), FakeNode(failed=True)
+        LazyTrace(tmp_path / "test-results", writer).stop(context, node, "login")
+        writer.flush()
+
+        trace = tmp_path / "test-results" / "tests-test-x-py-test-y" / "login" / "trace.zip"
+        assert trace.read_bytes() == b"trace-zip"
+        assert not Path(context.tracing.stopped_to[0]).exists()
+        assert writer.stats.written_bytes == len(b"trace-zip")
+
+    def test_passed_test_exports_nothing(self, writer, tmp_path):
+        context, node = FakeContext(), FakeNode(failed=False)
+        LazyTrace(tmp_path, writer).stop(context, node)
+        assert context.tracing.stopped_to == [None]
+        assert writer.stats.submitted == 0
@@ -0,0 +1,141 @@
+"""
+Parity checks and behaviour of the async page objects (fake pages, no browser needed)
+"""
+import inspect
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from config import get_config
+from tests.fakes import AsyncFakePage, FakePage, FakeRequest
+from tests.pages import async_base_page
+from tests.pages import (
+    AsyncPracticeExceptionsPage,
+    AsyncPracticeLoginPage,
+    BasePage,
+    PracticeExceptionsPage,
+    PracticeLoginPage,
+)
+from tests.pages.readiness import NetworkIdleReadiness, ReadinessStats
+from tests.pages.selectors import PracticeExceptionsSelectors, PracticeLoginSelectors
+from tests.pages.wait_stats import MIN_SAMPLES, WaitStats
+
+PAIRS = [
+    (PracticeLoginPage, AsyncPracticeLoginPage, PracticeLoginSelectors),
+    (PracticeExceptionsPage, AsyncPracticeExceptionsPage, PracticeExceptionsSelectors),
+]
+
+
+def public_methods(cls):
+    return {
+        name for name, member in inspect.getmembers(cls, inspect.isfunction)
+        if not name.startswith("_")
+    }
+
+
+@pytest.mark.parametrize("sync_cls, async_cls, selectors", PAIRS)
+class TestAsyncPageParity:
+    """Async twins expose the same flows and the same selectors"""
+
+    def test_selectors_are_shared(self, sync_cls, async_cls, selectors):
+        assert selectors.selector_registry
+        for name in selectors.selector_registry:
+            assert getattr(sync_cls, name) is getattr(async_cls, name) is getattr(selectors, name)
+
+    def test_pages_inherit_selector_registry(self, sync_cls, async_cls, selectors):
+        assert sync_cls.selector_registry == async_cls.selector_registry == selectors.selector_registry
+
+    def test_page_specific_methods_have_async_twins(self, sync_cls, async_cls, selectors):
+        sync_methods = public_methods(sync_cls) - public_methods(BasePage)
+        assert sync_methods <= public_methods(async_cls)
+
+    def test_flows_are_coroutines(self, sync_cls, async_cls, selectors):
+        navigations = [name for name in public_methods(async_cls) if name.startswith("navigate_to")]
+        assert navigations
+        assert all(inspect.iscoroutinefunction(getattr(async_cls, name)) for name in navigations)
+
+
+@pytest.fixture
+def stats(tmp_path, monkeypatch):
+    """Fresh readiness and wait stats, so nothing leaks into the run's summaries or .wait_stats.json"""
+    readiness, waits = ReadinessStats(), WaitStats(tmp_path / "waits.json")
+    monkeypatch.setattr(async_base_page, "readiness_stats", readiness)
+    monkeypatch.setattr(async_base_page, "wait_stats", waits)
+    return readiness, waits
+
+
+def use_config(monkeypatch, **settings):
+    monkeypatch.setattr(async_base_page, "config", get_config()._replace(**settings))
+
+
+class TestAsyncBehaviour:
+    """Awaited flows do what their sync twins do"""
+
+    async def test_navigate_waits_for_the_navigation_ready_selector(self, stats, monkeypatch):
+        use_config(monkeypatch, READINESS_STRATEGY="selector")
+        page = AsyncFakePage()
+        login_page = AsyncPracticeLoginPage(page)
+
+        await login_page.navigate_to_logged_in()
+
+        assert page.calls == [("goto", f"{login_page.base_url}/logged-in-successfully/"),
+                              ("selector", login_page.success_message)]
+        row, = stats[0].summary()
+        assert (row["page_class"], row["strategy"], row["event"]) == ("AsyncPracticeLoginPage", "selector", "navigate")
+
+    async def test_networkidle_timeout_follows_config(self, stats, monkeypatch):
+        use_config(monkeypatch, READINESS_STRATEGY="networkidle", NETWORK_IDLE_IGNORE=(), DEFAULT_TIMEOUT=1234)
+        page = AsyncFakePage()
+
+        await AsyncPracticeLoginPage(page).wait_for_page_load()
+
+        assert page.calls == [("load_state", "networkidle", 1234)]
+        assert stats[0].summary()[0]["event"] == "page_load"
+
+    async def test_networkidle_ignores_patterns(self):
+        page = AsyncFakePage()
+        strategy = NetworkIdleReadiness(["*analytics*"], idle_ms=0, poll_ms=1)
+        in_flight = strategy.track(page)
+        request = FakeRequest("https://example.com/app.js")
+        page.emit("request", FakeRequest("https://analytics.example.com/collect"))
+        page.emit("request", request)
+        page.on_tick = lambda: page.emit("requestfinished", request)
+
+        await strategy.wait_async(AsyncPracticeLoginPage(page))
+
+        assert not in_flight
+        assert ("event", "requestfinished") in page.calls
+
+    async def test_fill_form_falls_back_to_per_field(self):
+        page = AsyncFakePage(form_problems=["#password: not visible"])
+        login_page = AsyncPracticeLoginPage(page)
+
+        await login_page.login_with_credentials("student", "Password123")
+
+        assert page.actions == [
+            ("fill", login_page.username_input, "student"),
+            ("fill", login_page.password_input, "Password123"),
+            ("click", login_page.login_button),
+        ]
+
+    async def test_query_elements_matches_sync(self):
+        page, sync_page = AsyncFakePage(), FakePage()
+
+        states = await AsyncPracticeLoginPage(page).query_elements()
+
+        assert states == PracticeLoginPage(sync_page).query_elements()
+        assert page.round_trips == sync_page.round_trips
+
+    async def test_wait_adaptively_uses_learned_budget(self, stats):
+        waits = stats[1]
+        for _ in range(MIN_SAMPLES):
+            waits.record("https://site.test", "AsyncPracticeExceptionsPage", "#row2", 1000, 10000)
+        page = AsyncFakePage()
+
+        await AsyncPracticeExceptionsPage(page).wait_for_second_row()
+
+        assert page.waits == [["#row2", "visible", 2000]]
+
+    async def test_wait_adaptively_timeout_raises(self, stats):
+        with pytest.raises(PlaywrightTimeoutError, match="#confirmation"):
+            await AsyncPracticeExceptionsPage(AsyncFakePage(wait_reached=False)).wait_for_confirmation()
+        assert stats[1].summary()[0]["timeouts"] == 1
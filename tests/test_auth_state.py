@@ -0,0 +1,94 @@
+"""
+Unit tests for the authenticated storage-state cache (no browser needed)
+"""
+import json
+import os
+import time
+
+import pytest
+from config import config, configure
+from tests.utils.auth_state import AuthStateCache
+
+
+@pytest.fixture
+def login_calls():
+    return []
+
+
+@pytest.fixture
+def cache(tmp_path, login_calls):
+    def fake_login(site, username, password, state_path):
+        login_calls.append((site, username, password))
+        state_path.write_text(json.dumps({"cookies": [{"name": "session", "value": username}], "origins": []}))
+    return AuthStateCache(tmp_path / "auth", ttl=60, login=fake_login)
+
+
+class TestAuthStateCache:
+    """Storage-state caching keyed by site and credential type"""
+
+    def test_login_per_call(self, tmp_path, login_calls):
+        cache = AuthStateCache(tmp_path / "auth", ttl=60)
+        with pytest.raises(ValueError, match="no login"):
+            cache.get("practice")
+
+        def login(site, username, password, state_path):
+            login_calls.append(site)
+            state_path.write_text("{}")
+        cache.get("practice", login=login)
+
+        assert cache.get("practice") == cache.state_path("practice", "valid")
+        assert login_calls == ["practice"]
+
+    def test_logs_in_once_per_key(self, cache, login_calls):
+        first = cache.get("practice")
+        second = cache.get("practice", "valid")
+
+        assert first == second
+        assert login_calls == [("practice", "student", "Password123")]
+        assert cache.logins == 1 and cache.hits == 1
+
+    def test_separate_entries_per_credential_type(self, cache, login_calls):
+        cache.get("sauce_demo", "standard_user")
+        cache.get("sauce_demo", "problem_user")
+
+        assert [call[1] for call in login_calls] == ["standard_user", "problem_user"]
+
+    def test_expired_state_triggers_new_login(self, cache, login_calls):
+        path = cache.get("the_internet")
+        stale = time.time() - 120
+        os.utime(path, (stale, stale))
+
+        cache.get("the_internet")
+
+        assert len(login_calls) == 2
+
+    def test_load_returns_storage_state(self, cache):
+        state = cache.load("practice")
+        assert state["cookies"][0]["value"] == "student"
+
+    def test_invalidate_site(self, cache, login_calls):
+        cache.get("practice")
+        cache.get("the_internet")
+        cache.invalidate("practice")
+
+        cache.get("practice")
+        cache.get("the_internet")
+
+        assert [call[0] for call in login_calls] == ["practice", "the_internet", "practice"]
+
+    def test_separate_entries_per_origin(self, cache, login_calls):
+        previous = config.LOCAL_SITE_URL
+        cache.get("practice")
+        configure(LOCAL_SITE_URL="http://127.0.0.1:8123")
+        try:
+            local = cache.get("practice")
+            assert len(login_calls) == 2
+            cache.get("practice")
+            assert len(login_calls) == 2
+        finally:
+            configure(LOCAL_SITE_URL=previous)
+        assert cache.get("practice") != local and len(login_calls) == 2
+
+    def test_unknown_site_raises(self, cache):
+        with pytest.raises(ValueError):
+            cache.get("unknown_site")
@@ -0,0 +1,94 @@
+"""
+Unit tests for the benchmark suite's baselines and regression gate (no browser needed)
+"""
+import json
+
+import pytest
+from benchmarks import suite
+from benchmarks.suite import BenchEnv, Case, compare, load_baseline, measure, save_baseline, select
+
+
+def result(median):
+    return {'median': median, 'min': median, 'max': median, 'rounds': 1}
+
+
+class TestCompare:
+    """Median vs baseline median, with the threshold in both directions"""
+
+    @pytest.mark.parametrize("median, verdict", [
+        (1.2, "ok"), (1.3, "regressed"), (0.9, "ok"), (0.7, "faster"),
+    ])
+    def test_verdicts(self, median, verdict):
+        row, = compare({"case": result(median)}, {"case": result(1.0)}, threshold=0.25)
+        assert row['verdict'] == verdict
+        assert row['ratio'] == pytest.approx(median)
+
+    def test_case_without_baseline_is_new(self):
+        row, = compare({"case": result(1.0)}, {}, threshold=0.25)
+        assert row['verdict'] == "new" and row['ratio'] is None
+
+    def test_skipped_baseline_case_is_missing(self):
+        rows = compare({"a": result(1.0)}, {"a": result(1.0), "b": result(1.0), "c": result(1.0)}, 0.25,
+                       selected=["a", "b"])
+        assert {row['case']: row['verdict'] for row in rows} == {"a": "ok", "b": "missing"}
+
+
+class TestBaseline:
+    """--save merges into the stored baseline"""
+
+    def test_filtered_save_keeps_other_cases(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        save_baseline(path, {"a": result(1.0), "b": result(2.0)})
+        save_baseline(path, {"a": result(3.0)})
+        baseline = load_baseline(path)
+        assert {name: entry['median'] for name, entry in baseline['results'].items()} == {"a": 3.0, "b": 2.0}
+        assert baseline['machine']['python']
+
+    def test_missing_baseline(self, tmp_path):
+        assert load_baseline(tmp_path / "missing.json") == {'machine': None, 'results': {}}
+
+
+def test_measure_discards_warm_up(tmp_path):
+    samples = iter([100.0, 3.0, 1.0, 2.0])
+    case = Case("fake", lambda env: next(samples), browser=False, description="")
+    assert measure(case, BenchEnv(tmp_path), rounds=3) == {'median': 2.0, 'min': 1.0, 'max': 3.0, 'rounds': 3}
+
+
+def test_select_by_pattern():
+    assert {case.name for case in select(r"^page\.")} >= {"page.navigate", "page.fill_form", "page.click"}
+    assert all(not case.browser for case in select("harness"))
+
+
+def test_page_object_calls_without_browser(tmp_path):
+    assert 0 < suite.page_object_calls(BenchEnv(tmp_path)) < 0.01
+
+
+def test_regression_fails_the_run(tmp_path, monkeypatch, capsys):
+    timings = {"seconds": 1.0}
+    monkeypatch.setattr(suite, "CASES", {"fake": Case("fake", lambda env: timings["seconds"], False, "fake")})
+    baseline = tmp_path / "baseline.json"
+    assert suite.main(["--save", "--rounds", "1", "--baseline", str(baseline)]) == 0
+    assert suite.main(["--rounds", "1", "--baseline", str(baseline)]) == 0
+    timings["seconds"] = 1.5
+    report = tmp_path / "report.json"
+    assert suite.main(["--rounds", "1", "--baseline", str(baseline), "--json", str(report)]) == 1
+    assert "1 regressed: fake" in capsys.readouterr().out
+    assert json.loads(report.read_text())['comparison'][0]['verdict'] == "regressed"
+
+
+def test_skipped_case_fails_unless_allowed(tmp_path, monkeypatch, capsys):
+    baseline = tmp_path / "baseline.json"
+    save_baseline(baseline, {"fake": result(1.0), "browser": result(1.0)})
+    monkeypatch.setattr(suite, "CASES", {"fake": Case("fake", lambda env: 1.0, False, "fake"),
+                                         "browser": Case("browser", lambda env: 1.0, True, "browser")})
+    monkeypatch.setattr(suite, "_run_browser_cases", lambda cases, env, rounds, headed: {})
+    assert suite.main(["--rounds", "1", "--baseline", str(baseline)]) == 1
+    assert "1 not measured: browser" in capsys.readouterr().out
+    assert suite.main(["--rounds", "1", "--baseline", str(baseline), "--allow-skip"]) == 0
+    assert suite.main(["--rounds", "1", "--baseline", str(baseline), "-k", "fake"]) == 0
+
+
+def test_compare_without_baseline_file_fails(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(suite, "CASES", {"fake": Case("fake", lambda env: 1.0, False, "fake")})
+    assert suite.main(["--rounds", "1", "--baseline", str(tmp_path / "missing.json")]) == 2
+    assert "No baseline" in capsys.readouterr().out
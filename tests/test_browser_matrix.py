@@ -0,0 +1,94 @@
+"""
+Unit tests for the cross-browser matrix bookkeeping (no browser needed)
+"""
+import pytest
+from tests.utils.browser_matrix import BrowserServer, compare, engine_exit_code, format_comparison, matrix_key, \
+    parse_junit, pytest_commands
+
+CLASSNAME = "tests.test_practice_sites.TestPracticeLogin"
+
+
+def junit(cases):
+    """Minimal pytest --junitxml report for (name, seconds, child element or '')"""
+    body = "".join(f'<testcase classname="{CLASSNAME}" name="{name}" time="{seconds}">{child}</testcase>'
+                   for name, seconds, child in cases)
+    return f'<?xml version="1.0"?><testsuites><testsuite name="pytest">{body}</testsuite></testsuites>'
+
+
+class TestMatrixKey:
+    """One key per test, whatever the engine"""
+
+    @pytest.mark.parametrize("name, expected", [
+        ("test_login[chromium]", "test_login"),
+        ("test_login[webkit-student]", "test_login[student]"),
+        ("test_login[student-firefox]", "test_login[student]"),
+        ("test_login[a-chromium-b]", "test_login[a-b]"),
+        ("test_unit", "test_unit"),
+    ])
+    def test_engine_removed(self, name, expected):
+        assert matrix_key(CLASSNAME, name) == f"{CLASSNAME}::{expected}"
+
+
+class TestComparison:
+    """JUnit reports of all engines side by side"""
+
+    def test_parse_outcomes(self, tmp_path):
+        report = tmp_path / "chromium-0.xml"
+        report.write_text(junit([("test_a[chromium]", 1.5, ""), ("test_b[chromium]", 0.2, '<failure message="x"/>'),
+                                 ("test_c[chromium]", 0, '<skipped message="y"/>'),
+                                 ("test_d[chromium]", 0.1, '<error message="z"/>')]))
+        results = parse_junit(report)
+        assert {key.split("::")[1]: entry["outcome"] for key, entry in results.items()} == {
+            "test_a": "passed", "test_b": "failed", "test_c": "skipped", "test_d": "error"}
+        assert results[f"{CLASSNAME}::test_a"]["seconds"] == 1.5
+
+    def test_differences_listed_first(self):
+        key_a, key_b = f"{CLASSNAME}::test_a", f"{CLASSNAME}::test_b"
+        results = {
+            "chromium": {key_a: {"outcome": "passed", "seconds": 1.0}, key_b: {"outcome": "passed", "seconds": 1.0}},
+            "webkit": {key_a: {"outcome": "passed", "seconds": 4.0}, key_b: {"outcome": "failed", "seconds": 2.0}},
+        }
+        comparison = compare(results, {"chromium": 10.0, "webkit": 12.0})
+        assert [test["test"] for test in comparison["tests"]] == [key_b, key_a]
+        assert comparison["tests"][1]["spread_seconds"] == 3.0
+        assert comparison["engines"]["webkit"]["failed"] == 1
+        comparison["wall_seconds"] = 12.5
+        lines = format_comparison(comparison)
+        assert "sum of per-engine wall times 22.0 s" in lines[0]
+        assert lines[-2].endswith("differs")
+
+    def test_missing_test_is_inconsistent(self):
+        key = f"{CLASSNAME}::test_a"
+        comparison = compare({"chromium": {key: {"outcome": "passed", "seconds": 1.0}}, "firefox": {}}, {})
+        assert comparison["tests"][0]["consistent"] is False
+
+
+class TestCommands:
+    """Every shard of an engine connects to that engine's server"""
+
+    def test_sharded_commands(self, tmp_path):
+        commands = pytest_commands("firefox", "ws://127.0.0.1:1/abc", ["tests/"], tmp_path, workers=2)
+        assert len(commands) == 2
+        for shard_id, command in enumerate(commands):
+            assert command[command.index("--browser") + 1] == "firefox"
+            assert command[command.index("--browser-server") + 1] == "ws://127.0.0.1:1/abc"
+            assert command[command.index("--shard-id") + 1] == str(shard_id)
+            assert command[command.index("--junitxml") + 1] == str(tmp_path / f"firefox-{shard_id}.xml")
+            assert command[command.index("--shard-report-dir") + 1] == str(tmp_path / "firefox")
+
+    def test_single_worker_is_not_sharded(self, tmp_path):
+        command, = pytest_commands("webkit", "ws://x", [], tmp_path, workers=1)
+        assert "--num-shards" not in command
+        assert command[command.index("--action-timing-report") + 1] == str(tmp_path / "webkit-action-timings.json")
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError, match="Unknown browser engine"):
+            BrowserServer("safari")
+
+
+@pytest.mark.parametrize("shard_codes, expected", [
+    ([0, 0], 0), ([0, 5], 0), ([0, 1], 1), ([0, -9], 1), ([2], 1),
+])
+def test_engine_exit_code(shard_codes, expected):
+    """A shard killed by a signal (negative code) fails the engine"""
+    assert engine_exit_code(shard_codes) == expected
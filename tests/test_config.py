@@ -0,0 +1,128 @@
+"""
+Unit tests for the lazy, layered Config (no browser needed)
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import config as config_module
+from config import PROJECT_DIR, SNAPSHOT_ENV, Config, configure, get_config, load_config
+
+
+@pytest.fixture
+def env_file(tmp_path):
+    path = tmp_path / ".env"
+    path.write_text("DEFAULT_TIMEOUT=5000\nHEADLESS_MODE=true\nRUN_PROFILE=debug\n")
+    return path
+
+
+@pytest.fixture
+def fresh_config(monkeypatch):
+    """Process-wide Config reloaded from defaults, restored afterwards"""
+    monkeypatch.delenv(SNAPSHOT_ENV, raising=False)
+    monkeypatch.setattr(config_module, "_config", Config())
+
+
+class TestLayers:
+    """defaults < .env < environment < overrides"""
+
+    def test_defaults_without_sources(self, tmp_path):
+        loaded = load_config(env_file=tmp_path / "missing.env", environ={})
+        assert loaded == Config()
+
+    def test_env_file_is_parsed_to_field_types(self, env_file):
+        loaded = load_config(env_file=env_file, environ={})
+        assert loaded.DEFAULT_TIMEOUT == 5000
+        assert loaded.HEADLESS_MODE is True
+        assert loaded.RUN_PROFILE == "debug"
+
+    def test_environment_beats_env_file(self, env_file):
+        loaded = load_config(env_file=env_file, environ={"DEFAULT_TIMEOUT": "7000",
+                                                          "BLOCKED_DOMAINS": "a.com, b.com",
+                                                          "RECORDINGS_DIR": "/tmp/rec"})
+        assert loaded.DEFAULT_TIMEOUT == 7000
+        assert loaded.HEADLESS_MODE is True
+        assert loaded.BLOCKED_DOMAINS == ("a.com", "b.com")
+        assert loaded.RECORDINGS_DIR == Path("/tmp/rec")
+
+    def test_overrides_beat_environment(self, env_file):
+        loaded = load_config({"RUN_PROFILE": "ci-fast"}, env_file=env_file, environ={"RUN_PROFILE": "demo"})
+        assert loaded.RUN_PROFILE == "ci-fast"
+
+    def test_unknown_run_profile_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown run profile"):
+            load_config(env_file=tmp_path / "missing.env", environ={"RUN_PROFILE": "turbo"})
+
+    def test_local_site_url_drives_site_urls(self, tmp_path):
+        loaded = load_config(env_file=tmp_path / "missing.env", environ={"LOCAL_SITE_URL": "http://127.0.0.1:9000/"})
+        assert loaded.LOCAL_SITE_URL == "http://127.0.0.1:9000"
+        assert loaded.PRACTICE_LOGIN_URL == "http://127.0.0.1:9000/practice-test-login/"
+        assert loaded.THE_INTERNET_URL == "http://127.0.0.1:9000/"
+
+
+class TestSnapshot:
+    """Parent parses once, workers load the snapshot"""
+
+    def test_roundtrip(self):
+        settings = Config(DEFAULT_TIMEOUT=1234, NETWORK_IDLE_IGNORE=("*ads*",), NETWORK_CACHE_DIR=Path("/tmp/c"))
+        assert Config.from_snapshot(settings.to_snapshot()) == settings
+
+    def test_snapshot_replaces_env_parsing(self, env_file):
+        snapshot = Config(DEFAULT_TIMEOUT=42).to_snapshot()
+        loaded = load_config(env_file=env_file, environ={SNAPSHOT_ENV: snapshot, "DEFAULT_TIMEOUT": "7000"})
+        assert loaded.DEFAULT_TIMEOUT == 42
+        assert loaded.RUN_PROFILE == "demo"
+
+    def test_changed_environment_wins_over_snapshot(self, env_file):
+        parent_env = {"RUN_PROFILE": "demo", "DEFAULT_TIMEOUT": "7000"}
+        snapshot = Config(DEFAULT_TIMEOUT=42).to_snapshot(parent_env)
+        loaded = load_config(env_file=env_file, environ={**parent_env, SNAPSHOT_ENV: snapshot,
+                                                         "RUN_PROFILE": "ci-fast", "HEADLESS_MODE": "true"})
+        assert (loaded.RUN_PROFILE, loaded.HEADLESS_MODE) == ("ci-fast", True)
+        # Same value as the parent's: the parent's Config (configure() included) stands
+        assert loaded.DEFAULT_TIMEOUT == 42
+
+    def test_configure_refreshes_exported_snapshot(self, fresh_config, monkeypatch):
+        monkeypatch.setenv(SNAPSHOT_ENV, Config().to_snapshot())
+        configure(RUN_PROFILE="ci-fast")
+        assert Config.from_snapshot(os.environ[SNAPSHOT_ENV]).RUN_PROFILE == "ci-fast"
+
+
+class TestImmutability:
+    """Changes only through configure()"""
+
+    def test_proxy_refuses_assignment(self):
+        with pytest.raises(AttributeError, match="configure"):
+            config_module.config.DEFAULT_TIMEOUT = 1
+
+    def test_instance_refuses_assignment(self):
+        with pytest.raises(AttributeError):
+            Config().DEFAULT_TIMEOUT = 1
+
+    def test_proxy_follows_configure(self, fresh_config):
+        configure(DEFAULT_TIMEOUT=2500)
+        assert config_module.config.DEFAULT_TIMEOUT == 2500
+        assert get_config().DEFAULT_TIMEOUT == 2500
+
+
+SLOWMO_TEST_FILE = '''
+def test_slowmo(pytestconfig):
+    print("slowmo", pytestconfig.getoption("--slowmo"))
+'''
+
+
+@pytest.mark.parametrize("args, slowmo", [([], 100), (["--slowmo", "0"], 0), (["--slowmo=250"], 250)])
+def test_explicit_slowmo_wins_over_profile(tmp_path, args, slowmo):
+    """Real pytest run with the demo profile (slow_mo 100): even an explicit 0 is kept"""
+    (tmp_path / "test_sample.py").write_text(SLOWMO_TEST_FILE)
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_DIR)}
+    env.pop(SNAPSHOT_ENV, None)
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "tests.plugins.run_profile", "-p", "no:cacheprovider",
+         "-c", os.devnull, "--rootdir", str(tmp_path), "-s", "--run-profile", "demo", *args,
+         str(tmp_path / "test_sample.py")],
+        cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert f"slowmo {slowmo}\n" in result.stdout, result.stdout
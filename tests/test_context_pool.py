@@ -0,0 +1,94 @@
+"""
+Unit tests for the context pool reset, leak check and stats (fake browser, no browser needed)
+"""
+from tests.fakes import FakeContext
+from tests.utils.context_pool import ContextPool
+
+
+class FakeBrowser:
+    def __init__(self, sticky_cookies=False):
+        self.sticky_cookies = sticky_cookies
+        self.created = []
+
+    def new_context(self, **kwargs):
+        context = FakeContext(self.sticky_cookies)
+        self.created.append(context)
+        return context
+
+
+def use(context):
+    """What a test leaves behind"""
+    context.new_page()
+    context.cookies.append({'name': 'session'})
+    context.routes += 1
+
+
+class TestContextPool:
+    """Recycling, reset and leak fallback"""
+
+    def test_reused_context_is_reset(self):
+        browser = FakeBrowser()
+        pool = ContextPool(browser, {}, size=1)
+        pool.warm()
+
+        context = pool.acquire()
+        use(context)
+        pool.release(context)
+
+        reused = pool.acquire()
+        assert reused is context
+        assert (reused.pages, reused.cookies, reused.routes) == ([], [], 0)
+        assert pool.stats.hits == 2
+        assert pool.stats.hit_rate == 1.0
+        assert pool.stats.fallbacks == 0
+
+    def test_leaking_context_is_replaced(self):
+        browser = FakeBrowser(sticky_cookies=True)
+        pool = ContextPool(browser, {}, size=1)
+        pool.warm()
+
+        context = pool.acquire()
+        use(context)
+        pool.release(context)
+
+        assert context.closed
+        assert pool.acquire() is browser.created[-1]
+        assert pool.stats.fallbacks == 1
+
+    def test_misses_when_pool_runs_dry(self):
+        pool = ContextPool(FakeBrowser(), {}, size=1)
+        pool.warm()
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+
+        assert second.closed
+        assert (pool.stats.acquired, pool.stats.hits) == (2, 1)
+        assert pool.stats.as_dict()['saved_total_ms'] == pool.stats.saved_per_hit_ms
+
+    def test_init_script_retires_context(self):
+        browser = FakeBrowser()
+        pool = ContextPool(browser, {}, size=1)
+        pool.warm()
+
+        context = pool.acquire()
+        context.new_page().context.add_init_script("window.flag = 1")
+        assert pool.leaks(context) == ["add_init_script()", "1 open page(s)"]
+        pool.release(context)
+
+        assert context.closed
+        assert pool.acquire() is browser.created[-1] is not context
+        assert pool.stats.fallbacks == 1
+
+    def test_listener_left_behind_retires_context(self):
+        pool = ContextPool(FakeBrowser(), {}, size=1)
+        pool.warm()
+        context = pool.acquire()
+        removed, kept = (lambda message: None), (lambda message: None)
+        context.on("console", removed)
+        context.on("page", kept)
+        context.remove_listener("console", removed)
+
+        assert pool.leaks(context) == ["1 listener(s) on page"]
+        pool.release(context)
+        assert context.closed
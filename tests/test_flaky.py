@@ -0,0 +1,163 @@
+"""
+Unit tests for flaky-test history and the rerun plugin (no browser needed)
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from config import PROJECT_DIR
+from tests.utils.flaky import OutcomeHistory, classify, feed_durations, format_report, wasted_seconds
+
+# Fails on its first attempt only (a counter file survives the rerun), like a timing flake
+FLAKY_TEST_FILE = '''
+from pathlib import Path
+
+import pytest
+
+COUNTER = Path(__file__).with_name("attempts.txt")
+
+
+@pytest.fixture
+def browser():
+    """Stands in for pytest-playwright's, so this counts as a browser run"""
+
+
+def test_flaky(browser):
+    attempts = int(COUNTER.read_text()) + 1 if COUNTER.exists() else 1
+    COUNTER.write_text(str(attempts))
+    assert attempts > 1
+
+
+def test_broken(browser):
+    assert False
+
+
+def test_stable():
+    pass
+'''
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = OutcomeHistory(tmp_path / "history.sqlite")
+    yield history
+    history.close()
+
+
+class TestVerdicts:
+    """Attempts of one run -> passed / flaky / broken"""
+
+    @pytest.mark.parametrize("outcomes, verdict", [
+        (["passed"], "passed"),
+        (["failed", "passed"], "flaky"),
+        (["failed", "failed", "failed"], "broken"),
+        (["skipped"], "skipped"),
+    ])
+    def test_classify(self, outcomes, verdict):
+        assert classify(outcomes) == verdict
+
+    def test_wasted_is_every_attempt_but_the_last(self):
+        assert wasted_seconds([("failed", 2.0), ("failed", 3.0), ("passed", 4.0)]) == 5.0
+        assert wasted_seconds([("passed", 4.0)]) == 0
+
+
+class TestOutcomeHistory:
+    """SQLite history across runs"""
+
+    def test_flake_rates_over_recent_runs(self, history):
+        history.record_run({"t::a": [("failed", 1.0), ("passed", 1.0)], "t::b": [("failed", 1.0)] * 3})
+        history.record_run({"t::a": [("passed", 1.0)], "t::b": [("failed", 1.0)] * 3})
+        rates = history.flake_rates()
+        assert rates["t::a"]["flaky"] == 1 and rates["t::a"]["flake_rate"] == 0.5
+        assert rates["t::a"]["wasted"] == 1.0
+        assert rates["t::b"]["broken"] == 2 and rates["t::b"]["wasted"] == 4.0
+        assert history.flake_rates(runs=1)["t::a"]["flaky"] == 0
+        assert format_report(rates)[1].split()[-1] == "t::a"
+
+    def test_durations_are_median_of_recent_passes(self, history):
+        for seconds in (1.0, 9.0, 2.0):
+            history.record_run({"t::a": [("passed", seconds)], "t::b": [("failed", 50.0), ("passed", 3.0)]})
+        assert history.durations() == {"t::a": 2.0, "t::b": 3.0}
+        assert history.durations(samples=1)["t::a"] == 2.0
+
+    def test_windows_are_per_test(self, history):
+        history.record_run({"t::a": [("passed", 1.0)], "t::b": [("passed", 7.0)]})
+        for _ in range(3):
+            history.record_run({"t::a": [("passed", 5.0)]})
+        assert history.durations(samples=1) == {"t::a": 5.0, "t::b": 7.0}
+        assert history.flake_rates(runs=2)["t::b"]["runs"] == 1
+
+    def test_old_runs_are_pruned_per_test(self, history):
+        for seconds in (1.0, 2.0, 3.0):
+            history.record_run({"t::a": [("passed", seconds)], "t::b": [("passed", seconds)]}, keep_runs=2)
+        # A shard that only ran t::a doesn't push t::b's runs out
+        history.record_run({"t::a": [("passed", 4.0)]}, keep_runs=2)
+        assert history.durations() == {"t::a": 3.5, "t::b": 2.5}
+        assert history.flake_rates()["t::b"]["runs"] == 2
+        assert history.connection.execute("SELECT COUNT(*) FROM attempts").fetchone() == (4,)
+        assert history.connection.execute("SELECT COUNT(*) FROM runs").fetchone() == (3,)
+
+    def test_feed_durations_overwrites_sharding_history(self, history, tmp_path):
+        durations_file = tmp_path / "durations.json"
+        durations_file.write_text(json.dumps({"t::a": 30.0, "t::c": 4.0}))
+        history.record_run({"t::a": [("passed", 2.0)]})
+        assert feed_durations(history, durations_file) == 1
+        assert json.loads(durations_file.read_text()) == {"t::a": 2.0, "t::c": 4.0}
+
+
+def run_plugin(tmp_path, test_file, *args):
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_DIR), "TEST_HISTORY_DB": str(tmp_path / "history.sqlite"),
+           "TEST_DURATIONS_FILE": str(tmp_path / "durations.json")}
+    env.pop("PRACTICE_CONFIG_SNAPSHOT", None)
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "tests.plugins.sharding", "-p", "tests.plugins.flaky",
+         "-p", "no:cacheprovider", "-c", os.devnull, "--rootdir", str(tmp_path), "--flaky-reruns", "2",
+         *args, str(test_file)],
+        cwd=tmp_path, env=env, capture_output=True, text=True)
+
+
+def test_plugin_reruns_and_classifies(tmp_path):
+    """Real pytest run: the flaky test passes on its rerun, the broken one fails 3 times"""
+    (tmp_path / "test_sample.py").write_text(FLAKY_TEST_FILE)
+    result = run_plugin(tmp_path, tmp_path / "test_sample.py")
+    assert "1 failed, 2 passed, 3 rerun" in result.stdout, result.stdout
+    assert "1 flaky, 1 broken" in result.stdout
+
+    history = OutcomeHistory(Path(tmp_path / "history.sqlite"))
+    rates, medians = history.flake_rates(), history.durations()
+    history.close()
+    assert rates["test_sample.py::test_flaky"]["flaky"] == 1
+    assert rates["test_sample.py::test_broken"]["broken"] == 1
+    # Only the passing attempt counts as the test's duration
+    durations = json.loads((tmp_path / "durations.json").read_text())
+    assert durations["test_sample.py::test_flaky"] == medians["test_sample.py::test_flaky"]
+
+
+def test_durations_without_history(tmp_path):
+    """--no-test-history: this run's passing durations, still written only once"""
+    (tmp_path / "test_sample.py").write_text(FLAKY_TEST_FILE)
+    run_plugin(tmp_path, tmp_path / "test_sample.py", "--no-test-history")
+    durations = json.loads((tmp_path / "durations.json").read_text())
+    assert set(durations) == {"test_sample.py::test_flaky", "test_sample.py::test_stable"}
+    assert not (tmp_path / "history.sqlite").exists()
+
+
+def test_setup_error_is_not_rerun(tmp_path):
+    (tmp_path / "test_setup.py").write_text(
+        "import pytest\n\n\n"
+        "@pytest.fixture\ndef browser():\n    raise RuntimeError('no browser installed')\n\n\n"
+        "def test_needs_browser(browser):\n    pass\n")
+    result = run_plugin(tmp_path, tmp_path / "test_setup.py")
+    summary = result.stdout.splitlines()[-1]
+    assert "1 error in" in summary and "rerun" not in summary, result.stdout
+
+
+def test_unit_only_run_records_nothing(tmp_path):
+    (tmp_path / "test_unit.py").write_text("def test_unit():\n    pass\n")
+    result = run_plugin(tmp_path, tmp_path / "test_unit.py")
+    assert "1 passed" in result.stdout, result.stdout
+    assert not (tmp_path / "history.sqlite").exists()
+    assert not (tmp_path / "durations.json").exists()
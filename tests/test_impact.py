@@ -0,0 +1,188 @@
+"""
+Unit tests for test-impact selection (small throwaway project, no browser needed)
+"""
+import importlib.util
+import subprocess
+
+import pytest
+from tests.utils.impact import (
+    ChangeSet,
+    ImpactMap,
+    RuntimeRecorder,
+    SymbolIndex,
+    build_static_map,
+    changes_from_diff,
+    git_changes,
+    parse_diff,
+    select,
+)
+
+PROJECT = {
+    "config.py": '''import os
+
+
+class Config:
+    def __init__(self):
+        self.BASE_URL = os.getenv("BASE_URL", "http://localhost")
+        self.TIMEOUT = 5000
+
+
+config = Config()
+''',
+    "pages/login_page.py": '''from config import config
+
+
+class LoginPage:
+    username_input = "#username"
+    password_input = "#password"
+
+    def __init__(self, page):
+        self.page = page
+
+    def open(self):
+        self.page.goto(config.BASE_URL)
+
+    def login(self, username, password):
+        self.page.fill(self.username_input, username)
+        self.page.fill(self.password_input, password)
+''',
+    "pages/wait_page.py": '''from config import config
+
+
+def wait(page):
+    return config.TIMEOUT
+''',
+    "tests/test_login.py": '''from pages.login_page import LoginPage
+
+
+def test_open(page):
+    LoginPage(page).open()
+
+
+class TestLogin:
+    def test_login(self, page):
+        LoginPage(page).login("student", "secret")
+''',
+    "tests/conftest.py": '''import pytest
+from pages.launch import launch_args
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args():
+    return launch_args()
+''',
+    "pages/launch.py": '''def launch_args():
+    return {"headless": True}
+''',
+    "tests/test_wait.py": '''from pages.wait_page import wait
+
+
+def test_wait(page):
+    assert wait(page) == 5000
+''',
+}
+
+ALL_TESTS = [
+    "tests/test_login.py::test_open",
+    "tests/test_login.py::TestLogin::test_login",
+    "tests/test_wait.py::test_wait",
+]
+
+
+@pytest.fixture
+def project(tmp_path):
+    for path, source in PROJECT.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(source)
+    return tmp_path
+
+
+def selected(project, changed, untracked=()):
+    index = SymbolIndex.build(project)
+    impact_map = ImpactMap(build_static_map(index))
+    return select(impact_map, ALL_TESTS, changes_from_diff(index, changed, untracked))
+
+
+class TestStaticMap:
+    """Tests depend on the page objects, selectors and Config settings they reach"""
+
+    def test_collects_test_functions_and_methods(self, project):
+        assert sorted(build_static_map(SymbolIndex.build(project))) == sorted(ALL_TESTS)
+
+    def test_config_setting_selects_only_its_readers(self, project):
+        # line 6: self.BASE_URL = ...
+        assert selected(project, {"config.py": [(6, 6)]}) == ["tests/test_login.py::test_open"]
+        assert selected(project, {"config.py": [(7, 7)]}) == ["tests/test_wait.py::test_wait"]
+
+    def test_selector_and_method_changes(self, project):
+        assert selected(project, {"pages/login_page.py": [(6, 6)]}) == ["tests/test_login.py::TestLogin::test_login"]
+        assert selected(project, {"pages/login_page.py": [(12, 12)]}) == ["tests/test_login.py::test_open"]
+
+    def test_module_level_change_selects_every_user_of_the_file(self, project):
+        assert selected(project, {"pages/login_page.py": [(1, 1)]}) == ALL_TESTS[:2]
+        # deleted file
+        assert selected(project, {"pages/wait_page.py": []}) == ["tests/test_wait.py::test_wait"]
+
+    def test_fixture_body_change_selects_every_test(self, project):
+        # line 7: inside a fixture pytest-playwright requests by name, not any test
+        assert selected(project, {"tests/conftest.py": [(7, 7)]}) == ALL_TESTS
+        # reached only through the fixture
+        assert selected(project, {"pages/launch.py": [(2, 2)]}) == ALL_TESTS
+
+    def test_changed_test_selects_itself(self, project):
+        assert selected(project, {"tests/test_login.py": [(9, 10)]}) == ["tests/test_login.py::TestLogin::test_login"]
+
+
+class TestChanges:
+    """Diff parsing and files the map can't reason about"""
+
+    def test_parse_diff(self):
+        diff = (
+            "diff --git a/config.py b/config.py\n--- a/config.py\n+++ b/config.py\n"
+            "@@ -6 +6 @@ class Config:\n-old\n+new\n@@ -10,2 +9,0 @@\n-gone\n-gone\n"
+            "diff --git a/old.py b/old.py\n--- a/old.py\n+++ /dev/null\n@@ -1 +0,0 @@\n-x\n"
+        )
+        assert parse_diff(diff) == {"config.py": [(6, 6), (9, 9)], "old.py": []}
+
+    def test_docs_ignored_and_unknown_files_run_everything(self, project):
+        assert selected(project, {"README.md": [(1, 1)]}) == []
+        assert selected(project, {"requirements.txt": [(1, 1)]}) == ALL_TESTS
+
+    def test_unmapped_tests_always_run(self):
+        impact_map = ImpactMap({"tests/test_a.py::test_a": ["a.py::f"]})
+        changes = ChangeSet(symbols={"b.py::g"})
+        assert select(impact_map, ["tests/test_a.py::test_a", "tests/test_new.py::test_new"], changes) == [
+            "tests/test_new.py::test_new"
+        ]
+
+    def test_git_changes(self, project):
+        def git(*args):
+            subprocess.run(["git", *args], cwd=project, check=True, capture_output=True)
+
+        git("init", "-q")
+        git("add", ".")
+        git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-qm", "base")
+        config = project / "config.py"
+        config.write_text(config.read_text().replace("5000", "10000"))
+        (project / "pages/new_page.py").write_text("X = 1\n")
+
+        changed, untracked = git_changes("HEAD", project)
+        assert changed == {"config.py": [(7, 7)]}
+        assert untracked == ["pages/new_page.py"]
+        assert selected(project, changed, untracked) == ["tests/test_wait.py::test_wait"]
+
+
+def test_runtime_recorder_maps_calls_to_symbols(project):
+    (project / "pages/helpers.py").write_text("def double(x):\n    return x * 2\n")
+    index = SymbolIndex.build(project)
+    spec = importlib.util.spec_from_file_location("helpers", project / "pages/helpers.py")
+    helpers = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(helpers)
+
+    recorder = RuntimeRecorder(index)
+    recorder.start()
+    try:
+        helpers.double(2)
+    finally:
+        recorder.stop("tests/test_wait.py::test_wait[chromium]")
+    assert recorder.tests == {"tests/test_wait.py::test_wait": ["pages/helpers.py::double"]}
@@ -0,0 +1,120 @@
+"""
+Unit tests for load_runner.py bookkeeping (no browser needed)
+"""
+import asyncio
+import json
+import random
+
+import pytest
+from load_runner import LatencyHistogram, LoadPlan, LoadResults, StepFailed, VirtualUser
+from tests.utils.action_timing import percentile
+
+
+class TestLatencyHistogram:
+    """Log buckets: percentiles within 5%, merge = one histogram of everything"""
+
+    def test_percentiles_close_to_exact(self):
+        samples = [random.Random(7).lognormvariate(3, 1) for _ in range(5000)]
+        histogram = LatencyHistogram()
+        for ms in samples:
+            histogram.record(ms)
+        for pct in (50, 95, 99):
+            exact = percentile(samples, pct)
+            assert exact <= histogram.percentile(pct) <= exact * 1.05
+
+    def test_max_is_exact(self):
+        histogram = LatencyHistogram()
+        for ms in (0.05, 12.3, 480.0):
+            histogram.record(ms)
+        assert histogram.percentile(100) == histogram.max_ms == 480.0
+        assert histogram.percentile(1) <= 0.1
+
+    def test_merge_equals_recording_everything_in_one(self):
+        first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for index in range(200):
+            (first if index % 3 else second).record(index * 1.7 + 1)
+            combined.record(index * 1.7 + 1)
+        first.merge(LatencyHistogram.from_dict(json.loads(json.dumps(second.to_dict()))))
+        assert first.to_dict() == combined.to_dict()
+
+
+class TestLoadResults:
+    """Worker results survive the trip to the parent and merge"""
+
+    def test_roundtrip_and_merge(self):
+        worker = LoadResults()
+        worker.record_step("login.open", 20)
+        worker.record_error("login.verify", AssertionError("no"))
+        worker.record_iteration("login", False, 3)
+        worker.record_iteration("login", True, 3)
+        merged = LoadResults()
+        for _ in range(2):
+            merged.merge(LoadResults.from_dict(json.loads(json.dumps(worker.to_dict()))))
+        assert merged.steps["login.open"].count == 2
+        assert merged.errors["login.verify"] == {"AssertionError": 2}
+        assert merged.timeline[3] == [2, 2]
+
+    def test_summary_rates(self):
+        results = LoadResults()
+        for second in range(10):
+            for _ in range(4):
+                results.record_step("login.open", 10)
+                results.record_iteration("login", True, second)
+        results.record_error("login.open", TimeoutError())
+        results.record_iteration("login", False, 9)
+        summary = results.summary(wall=10.0, ramp_up=5, duration=10)
+        assert summary["throughput"] == pytest.approx(4.1)
+        assert summary["steady_throughput"] == pytest.approx(4.0)
+        assert summary["error_rate"] == pytest.approx(1 / 41)
+        assert summary["steps"]["login.open"]["error_rate"] == pytest.approx(1 / 41)
+        assert summary["steps"]["login.open"]["error_types"] == {"TimeoutError": 1}
+
+    def test_summary_lists_steps_that_only_failed(self):
+        results = LoadResults()
+        results.record_error("exceptions.row2", TimeoutError())
+        assert results.summary(1.0, 0, 1)["steps"]["exceptions.row2"]["error_rate"] == 1.0
+
+
+class TestLoadPlan:
+    """Users dealt across processes, started over the ramp-up"""
+
+    def test_split_round_robin(self):
+        plan = LoadPlan(base_url="http://x", users=5, duration=10, ramp_up=5, scenarios=("login",))
+        assert [worker.user_ids for worker in plan.split(2)] == [[0, 2, 4], [1, 3]]
+        assert len(plan.split(8)) == 5
+
+    def test_ramp_up(self):
+        plan = LoadPlan(base_url="http://x", users=4, duration=10, ramp_up=8, scenarios=("login",), start_at=100)
+        assert [plan.start_of(user_id) for user_id in range(4)] == [100, 102, 104, 106]
+
+
+class TestVirtualUserStep:
+    """Steps time successes and charge errors to the step"""
+
+    @staticmethod
+    def run(coroutine):
+        return asyncio.run(coroutine)
+
+    @staticmethod
+    async def returns(value):
+        return value
+
+    @staticmethod
+    async def raises():
+        raise TimeoutError("slow")
+
+    def test_success_recorded(self):
+        results = LoadResults()
+        user = VirtualUser(page=None, base_url="http://x", results=results)
+        assert self.run(user.step("login.verify", self.returns(True), check=bool)) is True
+        assert results.steps["login.verify"].count == 1
+
+    def test_failed_check_and_exception_recorded(self):
+        results = LoadResults()
+        user = VirtualUser(page=None, base_url="http://x", results=results)
+        with pytest.raises(StepFailed):
+            self.run(user.step("login.verify", self.returns(False), check=bool))
+        with pytest.raises(StepFailed):
+            self.run(user.step("exceptions.row2", self.raises()))
+        assert results.errors == {"login.verify": {"AssertionError": 1}, "exceptions.row2": {"TimeoutError": 1}}
+        assert not results.steps
@@ -0,0 +1,127 @@
+"""
+Unit tests for the selector registry, locator cache and batched queries (fake page, no browser needed)
+"""
+import pytest
+from tests.fakes import FakePage
+from tests.pages import PracticeExceptionsPage, PracticeLoginPage
+from tests.pages.locators import ElementState, LocatorCache, query_plan
+from tests.pages.selectors import Selector, SelectorRegistry
+
+
+class TestSelector:
+    """Validation at class-definition time"""
+
+    @pytest.mark.parametrize("value, is_css", [
+        ("#username", True),
+        ("#row2 input.input-field", True),
+        ("input[name='q']", True),
+        ("text=Log out", False),
+        ("//div[@id='x']", False),
+        ("#list >> text=Item", False),
+        ("button:has-text('Add')", False),
+    ])
+    def test_css_detection(self, value, is_css):
+        assert Selector(value).is_css is is_css
+
+    @pytest.mark.parametrize("value", ["", "  ", "input[name='q'", "div)", "bogus=thing", "text="])
+    def test_invalid_selectors_fail_at_import(self, value):
+        with pytest.raises(ValueError):
+            class BrokenSelectors(SelectorRegistry):
+                broken = Selector(value)
+
+    def test_registry_merges_bases(self):
+        class Header(SelectorRegistry):
+            logo = Selector("#logo")
+
+        class Page(Header):
+            title = Selector("h1")
+            not_a_selector = "plain string"
+
+        assert Page.selector_registry == {"logo": "#logo", "title": "h1"}
+        assert Header.selector_registry == {"logo": "#logo"}
+
+    def test_ready_selector_is_not_registered(self):
+        assert "ready_selector" not in PracticeLoginPage.selector_registry
+        assert list(PracticeLoginPage.selector_registry.values()).count("#username") == 1
+
+
+class TestLocatorCache:
+    """One Locator per selector until the main frame navigates"""
+
+    def test_reuses_until_main_frame_navigates(self):
+        page = FakePage()
+        cache = LocatorCache(page)
+        first = cache.get("#a")
+        assert cache.get("#a") is first
+        page.emit("framenavigated", object())  # iframe navigation keeps the cache
+        assert cache.get("#a") is first
+        page.emit("framenavigated", page.main_frame)
+        assert cache.get("#a") is not first
+        assert (cache.hits, cache.misses) == (2, 2)
+        assert len(page.handlers["framenavigated"]) == 1
+
+
+class TestQueryElements:
+    """Batch reads through page objects"""
+
+    def test_query_plan_dedupes_and_splits(self):
+        batched, fallback = query_plan([Selector("#a"), Selector("text=B"), Selector("#a"), "#raw"])
+        assert batched == ["#a"]
+        assert fallback == ["text=B", "#raw"]
+
+    def test_registry_in_one_round_trip_plus_fallbacks(self):
+        page = FakePage()
+        login_page = PracticeLoginPage(page)
+
+        states = login_page.query_elements()
+
+        css = [value for value in PracticeLoginPage.selector_registry.values() if value.is_css]
+        assert page.evaluated == [list(dict.fromkeys(css))]
+        # one evaluate for all CSS selectors + visibility and text for "text=Log out"
+        assert page.round_trips == 3
+        assert states["#username"] == ElementState(True, "text of #username")
+        assert states["text=Log out"] == ElementState(True, "text of text=Log out")
+
+    def test_explicit_selectors(self):
+        page = FakePage()
+        exceptions_page = PracticeExceptionsPage(page)
+        states = exceptions_page.query_elements([exceptions_page.row2_div, exceptions_page.add_button])
+        assert list(states) == ["#row2", "#add_btn"]
+        assert page.round_trips == 1
+
+
+class TestFillForm:
+    """One evaluate per form, per-field fallback when it can't be used"""
+
+    def test_login_is_one_fill_plus_a_real_click(self):
+        page = FakePage()
+        PracticeLoginPage(page).login_with_credentials("student", "Password123")
+        assert page.evaluated == [[["#username", "student"], ["#password", "Password123"]]]
+        assert page.actions == [("click", "#submit")]
+        assert page.round_trips == 2
+
+    def test_falls_back_to_auto_waiting_fill_when_a_field_is_not_ready(self):
+        page = FakePage(form_problems=["#password: not visible"])
+        PracticeLoginPage(page).login_with_credentials("student", "Password123")
+        assert page.actions == [
+            ("fill", "#username", "student"),
+            ("fill", "#password", "Password123"),
+            ("click", "#submit"),
+        ]
+
+    def test_real_typing_and_checkboxes(self):
+        page = FakePage()
+        login_page = PracticeLoginPage(page)
+        login_page.fill_form({Selector("#username"): "ab", Selector("#remember"): True}, real_typing=True)
+        assert page.evaluated == []
+        assert page.actions == [
+            ("clear", "#username"),
+            ("press_sequentially", "#username", "ab"),
+            ("set_checked", "#remember", True),
+        ]
+
+    def test_non_css_selector_skips_the_script(self):
+        page = FakePage()
+        PracticeLoginPage(page).fill_form({Selector("text=Name"): "x"})
+        assert page.evaluated == []
+        assert page.actions == [("fill", "text=Name", "x")]
@@ -0,0 +1,131 @@
+"""
+Unit tests for the asset cache and request interceptor (fake routes, no browser needed)
+"""
+import pytest
+from tests.fakes import FakeContext, FakeRequest, FakeResponse, FakeRoute
+from tests.utils.network_cache import AssetCache, NetworkInterceptor
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AssetCache(tmp_path / "cache", max_bytes=100)
+
+
+class TestAssetCache:
+    """Content addressing and LRU eviction"""
+
+    def test_roundtrip_drops_encoding_headers(self, cache):
+        cache.put("https://cdn.test/app.js", 200, {"Content-Encoding": "gzip", "content-type": "text/javascript"}, b"abc")
+
+        cached = cache.get("https://cdn.test/app.js")
+
+        assert cached.body == b"abc"
+        assert cached.headers == {"content-type": "text/javascript"}
+
+    def test_identical_bodies_share_a_blob(self, cache):
+        cache.put("https://a.test/logo.png", 200, {}, b"x" * 60)
+        cache.put("https://b.test/logo.png", 200, {}, b"x" * 60)
+
+        assert cache.total_bytes() == 60
+        assert len(list(cache.blob_dir.rglob("*"))) == 2  # one prefix dir + one blob
+
+    def test_evicts_least_recently_used(self, cache):
+        cache.put("https://a.test/old.js", 200, {}, b"o" * 40)
+        cache.put("https://a.test/used.js", 200, {}, b"u" * 40)
+        cache.get("https://a.test/old.js")
+        cache.put("https://a.test/new.js", 200, {}, b"n" * 40)
+
+        assert cache.get("https://a.test/used.js") is None
+        assert cache.get("https://a.test/old.js") is not None
+        assert cache.total_bytes() <= 100
+
+    def test_index_survives_reload(self, cache, tmp_path):
+        cache.put("https://a.test/app.css", 200, {}, b"body{}")
+        cache.save()
+
+        reloaded = AssetCache(tmp_path / "cache", max_bytes=100)
+
+        assert reloaded.get("https://a.test/app.css").body == b"body{}"
+
+    def test_parallel_saves_merge(self, cache, tmp_path):
+        other = AssetCache(tmp_path / "cache", max_bytes=100)
+        cache.put("https://a.test/one.js", 200, {}, b"1" * 30)
+        other.put("https://a.test/two.js", 200, {}, b"2" * 30)
+        cache.save()
+        other.save()
+
+        reloaded = AssetCache(tmp_path / "cache", max_bytes=100)
+
+        assert set(reloaded.index) == {"https://a.test/one.js", "https://a.test/two.js"}
+
+    def test_merged_index_is_evicted_to_the_cap(self, cache, tmp_path):
+        other = AssetCache(tmp_path / "cache", max_bytes=100)
+        cache.put("https://a.test/one.js", 200, {}, b"1" * 60)
+        cache.save()
+        other.put("https://a.test/two.js", 200, {}, b"2" * 60)
+        other.save()
+
+        reloaded = AssetCache(tmp_path / "cache", max_bytes=100)
+
+        assert set(reloaded.index) == {"https://a.test/two.js"} and reloaded.total_bytes() == 60
+        assert len([path for path in cache.blob_dir.rglob("*") if path.is_file()]) == 1
+
+    def test_shared_blob_kept_until_last_reference_goes(self, cache):
+        cache.put("https://a.test/logo.png", 200, {}, b"x" * 40)
+        cache.put("https://b.test/logo.png", 200, {}, b"x" * 40)
+        cache.put("https://a.test/big.js", 200, {}, b"b" * 60)
+        cache.get("https://b.test/logo.png")
+        cache.put("https://a.test/new.js", 200, {}, b"n" * 30)
+
+        assert cache.get("https://b.test/logo.png").body == b"x" * 40
+        assert cache.total_bytes() <= 100
+
+
+class TestNetworkInterceptor:
+    """Block / cache / network routing decisions"""
+
+    def test_blocks_domains_and_subdomains(self, cache):
+        interceptor = NetworkInterceptor(cache, blocked_domains=["google-analytics.com"])
+        route = FakeRoute(FakeRequest("https://www.google-analytics.com/analytics.js"))
+
+        interceptor.handle(route)
+
+        assert route.outcome == "abort"
+        assert interceptor.stats.blocked == 1
+
+    def test_blocks_resource_types(self, cache):
+        interceptor = NetworkInterceptor(cache, blocked_resource_types=["media"])
+        route = FakeRoute(FakeRequest("https://site.test/intro.mp4", resource_type="media"))
+
+        interceptor.handle(route)
+
+        assert route.outcome == "abort"
+
+    def test_documents_go_to_network(self, cache):
+        interceptor = NetworkInterceptor(cache)
+        route = FakeRoute(FakeRequest("https://site.test/", resource_type="document"))
+
+        interceptor.handle(route)
+
+        assert route.outcome == "fallback"
+
+    def test_second_request_served_from_cache(self, cache):
+        interceptor = NetworkInterceptor(cache)
+        interceptor.handle(FakeRoute(FakeRequest("https://site.test/app.js"), FakeResponse(200, b"console.log(1)")))
+        route = FakeRoute(FakeRequest("https://site.test/app.js"), FakeResponse(200, b"changed"))
+
+        interceptor.handle(route)
+
+        assert route.fulfilled["body"] == b"console.log(1)"
+        assert interceptor.stats.as_dict() == {"hits": 1, "misses": 1, "blocked": 0, "bytes_saved": 14}
+
+    def test_uninstall_removes_the_har_route(self, cache, tmp_path):
+        interceptor = NetworkInterceptor(cache, har_path=tmp_path / "assets.har")
+        context = FakeContext()
+        context.route("**/*", "traffic capture")
+
+        interceptor.install(context)
+        assert len(context.routed) == 3
+        interceptor.uninstall(context)
+
+        assert context.routed == [("**/*", "traffic capture")]
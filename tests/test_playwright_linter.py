@@ -0,0 +1,164 @@
+"""
+Unit tests for playwright_linter.py (no browser needed)
+"""
+import json
+
+import pytest
+import playwright_linter
+from playwright_linter import LintCache, lint_paths, lint_source, run
+
+BAD_SOURCE = '''
+import time
+
+def test_flow(page):
+    time.sleep(2)
+    page.click("#submit")
+'''
+
+GOOD_SOURCE = '''
+def test_flow(login_page):
+    login_page.login_with_valid_credentials()
+'''
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    (tmp_path / "test_bad.py").write_text(BAD_SOURCE)
+    (tmp_path / "test_good.py").write_text(GOOD_SOURCE)
+    return tmp_path
+
+
+class TestRules:
+    """The built-in checks"""
+
+    def test_time_sleep_and_hardcoded_selector(self):
+        issues = lint_source(BAD_SOURCE)
+        assert [(issue['line'], issue['rule']) for issue in issues] == [
+            (5, 'no-time-sleep'),
+            (6, 'no-hardcoded-selector'),
+        ]
+
+    def test_clean_source(self):
+        assert lint_source(GOOD_SOURCE) == []
+
+    def test_networkidle_only_flagged_inside_loop(self):
+        source = '''
+def test_flow(page):
+    page.wait_for_load_state("networkidle")
+    for _ in range(3):
+        page.wait_for_load_state("networkidle")
+        def later():
+            page.wait_for_load_state("networkidle")
+'''
+        assert [(issue['line'], issue['rule']) for issue in lint_source(source)] == [
+            (5, 'no-networkidle-in-loop'),
+        ]
+
+    def test_wait_for_timeout(self):
+        issues = lint_source("def test_flow(page):\n    page.wait_for_timeout(500)\n")
+        assert [issue['rule'] for issue in issues] == ['no-wait-for-timeout']
+
+    def test_redundant_visibility_check(self):
+        source = '''
+async def click(page, element, other):
+    await expect(element).to_be_visible()
+    await element.click()
+    await expect(element).to_be_visible()
+    await other.click()
+'''
+        assert [(issue['line'], issue['rule']) for issue in lint_source(source)] == [
+            (3, 'no-redundant-visibility-check'),
+        ]
+
+    def test_missing_await_only_in_async_functions(self):
+        source = '''
+async def test_flow(page):
+    page.goto("https://example.com")
+    await page.goto("https://example.com")
+
+def test_sync(page):
+    page.goto("https://example.com")
+'''
+        assert [(issue['line'], issue['rule']) for issue in lint_source(source)] == [
+            (3, 'missing-await'),
+        ]
+
+    def test_custom_rule_set(self):
+        class NoGoto(playwright_linter.Rule):
+            id = 'no-goto'
+            node_types = (playwright_linter.ast.Call,)
+
+            def check(self, node, linter):
+                if playwright_linter._method_name(node) == 'goto':
+                    linter.report(node, self.id, "no goto")
+
+        linter = playwright_linter.PlaywrightLinter(rules=[NoGoto()])
+        linter.visit(playwright_linter.ast.parse("import time\ntime.sleep(1)\npage.goto('/')\n"))
+        assert [(issue['line'], issue['rule']) for issue in linter.issues] == [(3, 'no-goto')]
+
+    def test_node_visitor_api_kept(self):
+        linter = playwright_linter.PlaywrightLinter()
+        assert isinstance(linter, playwright_linter.ast.NodeVisitor)
+        linter.visit(playwright_linter.ast.parse(BAD_SOURCE))
+        linter.errors.append("Line 1: added by a caller")
+        assert linter.errors[0].startswith("Line 5: ") and len(linter.errors) == 3
+
+
+class TestLintPaths:
+    """Parallel, cached linting"""
+
+    def test_parallel_matches_serial(self, corpus):
+        files = sorted(corpus.glob("*.py"))
+        assert lint_paths(files, jobs=2) == lint_paths(files, jobs=1)
+
+    def test_unchanged_files_come_from_cache(self, corpus, tmp_path):
+        cache = LintCache(tmp_path / "cache.json")
+        lint_paths(sorted(corpus.glob("*.py")), cache=cache)
+        cache.save()
+
+        results = lint_paths(sorted(corpus.glob("*.py")), cache=LintCache(tmp_path / "cache.json"))
+
+        assert all(result['cached'] for result in results)
+
+    def test_edited_file_is_relinted(self, corpus, tmp_path):
+        cache = LintCache(tmp_path / "cache.json")
+        lint_paths(sorted(corpus.glob("*.py")), cache=cache)
+        (corpus / "test_good.py").write_text(BAD_SOURCE)
+
+        results = {r['path']: r for r in lint_paths(sorted(corpus.glob("*.py")), cache=cache)}
+
+        edited = results[str(corpus / "test_good.py")]
+        assert not edited['cached'] and len(edited['issues']) == 2
+
+    def test_rules_version_change_invalidates_cache(self, corpus, tmp_path, monkeypatch):
+        cache = LintCache(tmp_path / "cache.json")
+        lint_paths(sorted(corpus.glob("*.py")), cache=cache)
+        cache.save()
+        monkeypatch.setattr(playwright_linter, "RULES_VERSION", "next")
+
+        assert LintCache(tmp_path / "cache.json").files == {}
+
+    def test_syntax_error_is_reported(self, tmp_path):
+        broken = tmp_path / "broken.py"
+        broken.write_text("def oops(:\n")
+        assert lint_paths([broken])[0]['error']
+
+
+class TestCli:
+    """Output formats keep the exit code"""
+
+    @pytest.mark.parametrize("output_format", ["text", "json", "sarif"])
+    def test_exit_code_with_issues(self, corpus, tmp_path, output_format, capsys):
+        code = run([str(corpus), "--format", output_format, "--cache-file", str(tmp_path / "c.json")])
+        assert code == 1
+
+    def test_exit_code_clean(self, corpus, tmp_path):
+        assert run([str(corpus / "test_good.py"), "--no-cache"]) == 0
+
+    def test_sarif_locations(self, corpus, capsys):
+        run([str(corpus), "--format", "sarif", "--no-cache"])
+        log = json.loads(capsys.readouterr().out)
+
+        results = log['runs'][0]['results']
+        assert {result['ruleId'] for result in results} == {'no-time-sleep', 'no-hardcoded-selector'}
+        assert results[0]['locations'][0]['physicalLocation']['region']['startLine'] == 5
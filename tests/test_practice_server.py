@@ -0,0 +1,101 @@
+"""
+Unit tests for practice_server.py over real HTTP (no browser needed)
+"""
+import http.client
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+
+import pytest
+from practice_server import PracticeServer, ServerOptions
+
+
+@pytest.fixture(scope="module")
+def server():
+    with PracticeServer(options=ServerOptions(slow_paths={"/slow-page": 200}, row2_delay_ms=0)) as server:
+        yield server
+
+
+def browser_like(server):
+    """urllib opener that keeps cookies and follows redirects, like a browser context"""
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+    def request(path, form=None):
+        data = urllib.parse.urlencode(form).encode() if form is not None else None
+        with opener.open(server.url + path, data=data) as response:
+            return response.geturl(), response.read().decode()
+    return request
+
+
+class TestPracticeSite:
+    """Practice Test Automation pages"""
+
+    @pytest.mark.parametrize("form, message", [
+        ({"username": "incorrectUser", "password": "Password123"}, "Your username is invalid!"),
+        ({"username": "student", "password": "wrongPassword"}, "Your password is invalid!"),
+    ])
+    def test_login_errors(self, server, form, message):
+        url, body = browser_like(server)("/practice-test-login/", form)
+        assert url.endswith("/practice-test-login/")
+        assert f'<div id="error" class="show">{message}</div>' in body
+
+    def test_login_sets_session_for_landing_page(self, server):
+        request = browser_like(server)
+        url, body = request("/practice-test-login/", {"username": "student", "password": "Password123"})
+        assert url.endswith("/logged-in-successfully/")
+        assert "Logged In Successfully" in body
+        assert request("/logged-in-successfully/")[0].endswith("/logged-in-successfully/")
+
+    def test_landing_page_needs_session(self, server):
+        url, _ = browser_like(server)("/logged-in-successfully/")
+        assert url.endswith("/practice-test-login/")
+
+    def test_exceptions_page_uses_configured_row2_delay(self, server):
+        _, body = browser_like(server)("/practice-test-exceptions/")
+        assert 'id="add_btn"' in body
+        assert "}, 0);" in body
+
+
+class TestOtherSites:
+    """The Internet and Sauce Demo stand-ins"""
+
+    def test_the_internet_login(self, server):
+        url, body = browser_like(server)("/authenticate", {"username": "tomsmith", "password": "SuperSecretPassword!"})
+        assert url.endswith("/secure")
+        assert "You logged into a secure area!" in body
+
+    def test_sauce_demo_login_and_locked_out_user(self, server):
+        url, body = browser_like(server)("/", {"user-name": "standard_user", "password": "secret_sauce"})
+        assert url.endswith("/inventory.html")
+        assert "add-to-cart-sauce-labs-backpack" in body
+        _, body = browser_like(server)("/", {"user-name": "locked_out_user", "password": "secret_sauce"})
+        assert "locked out" in body
+
+    def test_unknown_path(self, server):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            browser_like(server)("/nope")
+        assert error.value.code == 404
+
+
+class TestTransport:
+    """Keep-alive and injected latency"""
+
+    def test_keep_alive_reuses_connection(self, server):
+        connection = http.client.HTTPConnection("127.0.0.1", server.port)
+        for _ in range(3):
+            connection.request("GET", "/practice-test-login/")
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 200
+            assert response.getheader("Connection") == "keep-alive"
+        connection.close()
+
+    def test_slow_paths_are_delayed(self, server):
+        connection = http.client.HTTPConnection("127.0.0.1", server.port)
+        start = time.perf_counter()
+        connection.request("GET", "/slow-page")
+        connection.getresponse().read()
+        assert time.perf_counter() - start >= 0.2
+        connection.close()
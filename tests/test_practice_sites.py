@@ -2,8 +2,12 @@
 Practice site test suite for learning Playwright automation
 Uses https://practicetestautomation.com/practice/ - safe for learning
 """
+import json
+
 import pytest
 from playwright.sync_api import Page
+from config import config
+from tests.utils.auth_state import DEFAULT_CREDENTIAL_TYPES
 from tests.pages.practice_pages import PracticeLoginPage, PracticeExceptionsPage
 
 
@@ -66,6 +70,19 @@ class TestPracticeLogin:
         
         # Step 5: Verify success
         assert login_page.is_logged_in()
+        
+    def test_reuse_cached_login_session(self, authenticated_page, auth_state_cache):
+        """Practice: Start from a cached logged-in session instead of the login form"""
+        page = authenticated_page("practice")
+        login_page = PracticeLoginPage(page)
+        
+        # Session was logged in at most once per run and restored from storage_state
+        saved = json.loads(auth_state_cache.state_path("practice", DEFAULT_CREDENTIAL_TYPES["practice"]).read_text())
+        restored = {(cookie["name"], cookie["value"], cookie["domain"]) for cookie in page.context.cookies()}
+        assert auth_state_cache.logins <= 1
+        assert {(cookie["name"], cookie["value"], cookie["domain"]) for cookie in saved["cookies"]} <= restored
+        login_page.navigate_to_logged_in()
+        assert login_page.is_logged_in()
 
 
 class TestPracticeExceptions:
@@ -137,7 +154,7 @@ class TestOtherPracticeSites:
     
     def test_the_internet_login(self, page: Page):
         """Practice with The Internet Heroku app"""
-        page.goto("https://the-internet.herokuapp.com/login")
+        page.goto(f"{config.THE_INTERNET_URL}login")
         
         # Valid login
         page.fill("#username", "tomsmith")
@@ -151,7 +168,7 @@ class TestOtherPracticeSites:
         
     def test_sauce_demo_workflow(self, page: Page):
         """Practice with Sauce Demo e-commerce site"""
-        page.goto("https://www.saucedemo.com/")
+        page.goto(config.SAUCE_DEMO_URL)
         
         # Login
         page.fill("#user-name", "standard_user")
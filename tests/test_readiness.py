@@ -0,0 +1,100 @@
+"""
+Unit tests for page readiness strategies (fake page, no browser needed)
+"""
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from config import get_config
+from tests.fakes import FakePage, FakeRequest
+from tests.pages import base_page
+from tests.pages.base_page import BasePage
+from tests.pages.readiness import NetworkIdleReadiness, ReadinessStats, build_strategy
+
+
+class ReadyPage(BasePage):
+    ready_selector = "#ready"
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch):
+    """Fresh readiness stats, so these waits don't show up in the run's "page readiness waits" table"""
+    readiness = ReadinessStats()
+    monkeypatch.setattr(base_page, "readiness_stats", readiness)
+    return readiness
+
+
+class TestReadinessStrategies:
+    """Strategy selection and waiting behaviour"""
+
+    def test_page_object_setting_wins_over_config(self, stats):
+        page_object = ReadyPage(FakePage())
+        page_object.readiness_strategy = "selector"
+
+        page_object.wait_for_page_load()
+
+        assert page_object.page.calls == [("selector", "#ready")]
+        assert [row["strategy"] for row in stats.summary()] == ["selector"]
+
+    def test_navigation_ready_selector_wins_over_page_object(self):
+        page_object = ReadyPage(FakePage())
+        page_object.readiness_strategy = "selector"
+
+        page_object.navigate_to("http://site/logged-in/", ready_selector=".post-title")
+
+        assert page_object.page.calls[-1] == ("selector", ".post-title")
+
+    def test_networkidle_timeout_follows_config(self, monkeypatch):
+        monkeypatch.setattr("tests.pages.base_page.config", get_config()._replace(DEFAULT_TIMEOUT=1234))
+        page_object = ReadyPage(FakePage())
+
+        page_object.wait_for_page_load()
+
+        assert page_object.page.calls == [("load_state", "networkidle", 1234)]
+
+    def test_page_object_tracks_requests_from_creation(self, monkeypatch):
+        monkeypatch.setattr("tests.pages.base_page.config",
+                            get_config()._replace(NETWORK_IDLE_IGNORE=("*analytics*",),
+                                                  READINESS_STRATEGY="networkidle"))
+        page = FakePage()
+        page_object = ReadyPage(page)
+        page.emit("request", FakeRequest("https://example.com/app.js"))
+
+        assert page_object.get_readiness().track(page)
+
+    def test_strategies_are_shared(self):
+        assert build_strategy("load") is build_strategy("load")
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            build_strategy("eventually")
+
+    def test_networkidle_ignores_matching_requests(self):
+        page = FakePage()
+        strategy = NetworkIdleReadiness(["*analytics*"], idle_ms=0, poll_ms=1)
+        in_flight = strategy.track(page)
+        page.emit("request", FakeRequest("https://analytics.example.com/collect"))
+
+        strategy.wait(ReadyPage(page))  # returns although analytics request never finished
+
+        assert not in_flight
+        assert ("event", "requestfinished") not in page.calls
+
+    def test_networkidle_waits_for_tracked_requests(self):
+        page = FakePage()
+        strategy = NetworkIdleReadiness(["*analytics*"], idle_ms=0, poll_ms=1)
+        in_flight = strategy.track(page)
+        request = FakeRequest("https://example.com/app.js")
+        page.emit("request", request)
+        page.on_tick = lambda: page.emit("requestfinished", request)
+
+        strategy.wait(ReadyPage(page))
+
+        assert not in_flight
+
+    def test_networkidle_timeout_names_pending_requests(self):
+        page = FakePage()
+        strategy = NetworkIdleReadiness(["*analytics*"], timeout_ms=0, poll_ms=1)
+        strategy.track(page)
+        page.emit("request", FakeRequest("https://example.com/long-poll"))
+
+        with pytest.raises(PlaywrightTimeoutError, match="long-poll"):
+            strategy.wait(ReadyPage(page))
@@ -0,0 +1,65 @@
+"""
+Unit tests for duration-based sharding (no browser needed)
+"""
+from tests.utils.sharding import (
+    format_utilisation,
+    load_durations,
+    partition_by_duration,
+    save_durations,
+)
+
+
+class TestPartitionByDuration:
+    """Longest-first greedy split across workers"""
+
+    def test_balances_by_duration_not_count(self):
+        durations = {"slow": 10.0, "a": 2.0, "b": 3.0, "c": 5.0}
+        shards = partition_by_duration(durations, durations, 2)
+
+        loads = [sum(durations[nodeid] for nodeid in shard) for shard in shards]
+        assert sorted(loads) == [10.0, 10.0]
+        assert ["slow"] in shards
+
+    def test_every_test_assigned_exactly_once(self):
+        nodeids = [f"test_{index}" for index in range(25)]
+        shards = partition_by_duration(nodeids, {}, 4)
+
+        assigned = [nodeid for shard in shards for nodeid in shard]
+        assert sorted(assigned) == sorted(nodeids)
+        assert all(len(shard) in (6, 7) for shard in shards)
+
+    def test_split_is_deterministic(self):
+        nodeids = ["x", "y", "z", "w"]
+        durations = {"x": 1.0, "y": 1.0}
+        assert partition_by_duration(nodeids, durations, 3) == partition_by_duration(reversed(nodeids), durations, 3)
+
+    def test_unknown_tests_use_median(self):
+        durations = {"known_a": 1.0, "known_b": 9.0, "known_c": 5.0}
+        shards = partition_by_duration(["known_a", "known_b", "known_c", "new"], durations, 2)
+
+        # "new" is assumed to take 5s, so it pairs with the other 5s test
+        assert ["known_c", "new"] in shards
+
+
+class TestDurationHistory:
+    """Durations file persistence and reporting"""
+
+    def test_save_merges_with_existing(self, tmp_path):
+        path = tmp_path / "durations.json"
+        save_durations(path, {"a": 1.0, "b": 2.0})
+        save_durations(path, {"b": 3.0})
+
+        assert load_durations(path) == {"a": 1.0, "b": 3.0}
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "durations.json"
+        path.write_text("{not json")
+        assert load_durations(path) == {}
+
+    def test_utilisation_report_shows_imbalance(self):
+        reports = [
+            {"worker_id": 0, "tests": 3, "busy_time": 30.0, "wall_time": 31.0, "utilisation": 0.97},
+            {"worker_id": 1, "tests": 3, "busy_time": 10.0, "wall_time": 31.0, "utilisation": 0.32},
+        ]
+        lines = format_utilisation(reports)
+        assert lines[-1] == "Load imbalance (max/mean busy): 1.50"
@@ -0,0 +1,137 @@
+"""
+Unit tests for record/replay traffic archives (fake routes, no browser needed)
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from config import PROJECT_DIR
+from tests.fakes import FakeRequest, FakeResponse, FakeRoute
+from tests.utils.traffic_archive import (
+    TrafficArchive,
+    TrafficRecorder,
+    TrafficReplayer,
+    archive_name,
+)
+
+
+def record(root, name, exchanges):
+    recorder = TrafficRecorder(TrafficArchive(root, name))
+    for request, response in exchanges:
+        recorder.handle(FakeRoute(request, response))
+    recorder.finish()
+
+
+class TestTrafficArchive:
+    """Record, persist and replay per-test traffic"""
+
+    def test_archive_name_is_filesystem_safe(self):
+        name = archive_name("tests/test_practice_sites.py::TestPracticeLogin::test_successful_login[admin]")
+        assert name == "tests-test_practice_sites.py-TestPracticeLogin-test_successful_login-admin"
+
+    def test_archive_name_is_shared_by_browsers(self):
+        names = {archive_name(f"tests/test_a.py::test_login[admin-{browser}]", browser)
+                 for browser in ("chromium", "firefox", "webkit")}
+        assert names == {"tests-test_a.py-test_login-admin"}
+        assert archive_name("tests/test_a.py::test_page[webkit]", "webkit") == "tests-test_a.py-test_page"
+
+    def test_recording_is_diffable_and_deduplicated(self, tmp_path):
+        page = FakeResponse(200, b"<html>same</html>")
+        record(tmp_path, "test_a", [
+            (FakeRequest("https://site.test/"), page),
+            (FakeRequest("https://site.test/again"), page),
+        ])
+
+        data = json.loads((tmp_path / "test_a" / "traffic.json").read_text())
+        assert [entry["url"] for entry in data["entries"]] == ["https://site.test/", "https://site.test/again"]
+        assert "date" not in data["entries"][0]["headers"]
+        assert isinstance(data["entries"][0]["elapsed_ms"], int)
+        assert len(list((tmp_path / "blobs").iterdir())) == 1
+
+    def test_replay_matches_method_url_and_body(self, tmp_path):
+        record(tmp_path, "test_login", [
+            (FakeRequest("https://site.test/login", "POST", b"user=student"), FakeResponse(302, b"")),
+            (FakeRequest("https://site.test/login", "POST", b"user=wrong"), FakeResponse(200, b"invalid")),
+        ])
+        replayer = TrafficReplayer(TrafficArchive.load(tmp_path, "test_login"))
+        route = FakeRoute(FakeRequest("https://site.test/login", "POST", b"user=wrong"))
+
+        replayer.handle(route)
+
+        assert route.fulfilled["status"] == 200
+        assert route.fulfilled["body"] == b"invalid"
+
+    def test_repeated_requests_replay_in_order(self, tmp_path):
+        record(tmp_path, "test_poll", [
+            (FakeRequest("https://site.test/status"), FakeResponse(200, b"pending")),
+            (FakeRequest("https://site.test/status"), FakeResponse(200, b"done")),
+        ])
+        replayer = TrafficReplayer(TrafficArchive.load(tmp_path, "test_poll"))
+
+        bodies = []
+        for _ in range(3):
+            route = FakeRoute(FakeRequest("https://site.test/status"))
+            replayer.handle(route)
+            bodies.append(route.fulfilled["body"])
+
+        assert bodies == [b"pending", b"done", b"done"]
+
+    def test_replay_waits_recorded_or_fixed_latency(self, tmp_path):
+        record(tmp_path, "test_slow", [(FakeRequest("https://site.test/"), FakeResponse(200, b"ok"))])
+        archive = TrafficArchive.load(tmp_path, "test_slow")
+        archive.entries[0]["elapsed_ms"] = 250
+
+        waits = []
+        for latency_ms in (None, 40, 0):
+            TrafficReplayer(archive, latency_ms, sleep=waits.append).handle(FakeRoute(FakeRequest("https://site.test/")))
+
+        assert waits == [0.25, 0.04]
+
+    def test_unmatched_request_fails_clearly(self, tmp_path):
+        record(tmp_path, "test_page", [(FakeRequest("https://site.test/"), FakeResponse(200, b"ok"))])
+        replayer = TrafficReplayer(TrafficArchive.load(tmp_path, "test_page"))
+        route = FakeRoute(FakeRequest("https://site.test/new-endpoint"))
+
+        replayer.handle(route)
+
+        assert route.outcome == "abort"
+        assert "GET https://site.test/new-endpoint" in replayer.missing()
+
+    def test_missing_recording(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match="--record"):
+            TrafficArchive.load(tmp_path, "never_recorded")
+
+
+# A replayed test that makes one request its (empty) recording doesn't have
+REPLAY_TEST_FILE = '''
+class Request:
+    url, method, post_data_buffer = "https://site.test/new-endpoint", "GET", None
+
+
+class Route:
+    request = Request()
+
+    def abort(self, error_code=None):
+        pass
+
+
+def test_unrecorded_request(traffic_capture):
+    traffic_capture.handle(Route())
+'''
+
+
+def test_replay_miss_fails_the_test_not_its_teardown(tmp_path):
+    """Real pytest run: a miss is reported as a failed test, not as an error"""
+    (tmp_path / "test_sample.py").write_text(REPLAY_TEST_FILE)
+    TrafficArchive(tmp_path / "recordings", archive_name("test_sample.py::test_unrecorded_request")).save()
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_DIR)}
+    env.pop("PRACTICE_CONFIG_SNAPSHOT", None)
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "tests.plugins.record_replay", "-p", "no:cacheprovider",
+         "-c", os.devnull, "--rootdir", str(tmp_path), "--replay", "--recordings-dir", str(tmp_path / "recordings"),
+         str(tmp_path / "test_sample.py")],
+        cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert "1 failed in" in result.stdout and "error" not in result.stdout.splitlines()[-1], result.stdout
+    assert "GET https://site.test/new-endpoint" in result.stdout
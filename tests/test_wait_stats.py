@@ -0,0 +1,96 @@
+"""
+Unit tests for learned element waits (fake page, no browser needed)
+"""
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from tests.fakes import FakePage
+from tests.pages import PracticeExceptionsPage
+from tests.pages import base_page
+from tests.pages.wait_stats import MIN_SAMPLES, WaitStats
+
+# FakePage's default url
+ORIGIN = "https://site.test"
+
+
+@pytest.fixture
+def stats(tmp_path, monkeypatch):
+    stats = WaitStats(tmp_path / "waits.json")
+    monkeypatch.setattr(base_page, "wait_stats", stats)
+    return stats
+
+
+class TestWaitStats:
+    """Budgets from history"""
+
+    def test_default_until_enough_samples(self, stats):
+        for _ in range(MIN_SAMPLES - 1):
+            stats.record(ORIGIN, "Page", "#row2", 100, 10000)
+        assert stats.timeout_for(ORIGIN, "Page", "#row2", 10000) == 10000
+
+    def test_learned_timeout_from_p99(self, stats):
+        for elapsed in [4800, 5000, 5100, 5200, 5300]:
+            stats.record(ORIGIN, "Page", "#row2", elapsed, 10000)
+        assert stats.timeout_for(ORIGIN, "Page", "#row2", 10000) == 5300 * 1.5 + 500
+
+    def test_learned_timeout_is_clamped(self, stats):
+        for _ in range(MIN_SAMPLES):
+            stats.record(ORIGIN, "Page", "#fast", 10, 5000)
+            stats.record(ORIGIN, "Page", "#slow", 60000, 5000)
+        assert stats.timeout_for(ORIGIN, "Page", "#fast", 5000) == 1000
+        assert stats.timeout_for(ORIGIN, "Page", "#slow", 5000) == 15000
+
+    def test_no_learning_keeps_default(self, tmp_path):
+        path = tmp_path / "waits.json"
+        learned = WaitStats(path)
+        for _ in range(MIN_SAMPLES):
+            learned.record(ORIGIN, "Page", "#row2", 100, 10000)
+        learned.save()
+
+        frozen = WaitStats(path, learning=False)
+        frozen.record(ORIGIN, "Page", "#row2", 50, 10000)
+        frozen.record_timeout(ORIGIN, "Page", "#row2", 1000, 10000)
+        frozen.save()
+
+        assert frozen.timeout_for(ORIGIN, "Page", "#row2", 10000) == 10000
+        assert WaitStats(path).waits[f"{ORIGIN}|Page|#row2"]["samples"] == [100] * MIN_SAMPLES
+
+    def test_budgets_are_per_origin(self, stats):
+        for _ in range(MIN_SAMPLES):
+            stats.record("http://127.0.0.1:8000", "Page", "#row2", 300, 10000)
+        assert stats.timeout_for("http://127.0.0.1:8000", "Page", "#row2", 10000) == 1000
+        # A fast local site teaches nothing about the live one
+        assert stats.timeout_for(ORIGIN, "Page", "#row2", 10000) == 10000
+
+    def test_save_merges_with_other_workers(self, tmp_path):
+        path = tmp_path / "waits.json"
+        worker_1, worker_2 = WaitStats(path), WaitStats(path)
+        worker_1.record(ORIGIN, "Page", "#row2", 100, 10000)
+        worker_2.record(ORIGIN, "Page", "#row2", 200, 10000)
+        worker_2.record_timeout(ORIGIN, "Page", "#other", 5000, 5000)
+        worker_1.save()
+        worker_2.save()
+
+        waits = WaitStats(path).waits
+        assert waits[f"{ORIGIN}|Page|#row2"]["samples"] == [100, 200]
+        assert waits[f"{ORIGIN}|Page|#other"]["timeouts"] == 1
+
+
+class TestWaitAdaptively:
+    """PracticeExceptionsPage waits through the learned budget"""
+
+    def test_records_appearance_and_uses_learned_timeout(self, stats):
+        for _ in range(MIN_SAMPLES):
+            stats.record(ORIGIN, "PracticeExceptionsPage", "#row2", 1000, 10000)
+        page = FakePage()
+
+        PracticeExceptionsPage(page).wait_for_second_row()
+
+        assert page.waits == [["#row2", "visible", 2000]]
+        assert len(stats.waits[f"{ORIGIN}|PracticeExceptionsPage|#row2"]["samples"]) == MIN_SAMPLES + 1
+
+    def test_timeout_raises_and_grows_budget(self, stats):
+        page = FakePage(wait_reached=False)
+        with pytest.raises(PlaywrightTimeoutError, match="#confirmation"):
+            PracticeExceptionsPage(page).wait_for_confirmation()
+        row = stats.summary()[0]
+        assert (row["origin"], row["selector"], row["timeouts"], row["p50_ms"]) == (ORIGIN, "#confirmation", 1, 5000)
@@ -0,0 +1,25 @@
+"""
+Test Utilities Package
+
+This package contains harness helpers shared by fixtures and page objects.
+
+Available Utilities:
+- AuthStateCache: Reusable logged-in storage_state per site and credential type
+- ContextPool: Pre-warmed browser contexts recycled between tests
+- partition_by_duration: Duration-balanced test sharding for parallel workers
+- NetworkInterceptor / AssetCache: Request blocking and on-disk static asset cache
+"""
+
+from .auth_state import AuthStateCache, LOGIN_RECIPES
+from .context_pool import ContextPool
+from .sharding import partition_by_duration
+from .network_cache import AssetCache, NetworkInterceptor
+
+__all__ = [
+    'AuthStateCache',
+    'LOGIN_RECIPES',
+    'ContextPool',
+    'partition_by_duration',
+    'AssetCache',
+    'NetworkInterceptor'
+]
@@ -0,0 +1,162 @@
+"""
+Per-action timing for page objects
+
+instrument_page_objects() wraps the public methods of BasePage, AsyncBasePage
+and every subclass so each call is recorded with page class, method, selector
+(or URL) and the current test id. Nothing is wrapped unless timing is
+enabled, so a normal run pays no overhead at all.
+"""
+
+import functools
+import inspect
+import json
+import math
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Public helpers that aren't page actions
+UNTIMED_METHODS = ('get_readiness', 'locator')
+
+# The run's JSON report (--action-timing-report)
+DEFAULT_REPORT = "action-timings.json"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class ActionTimings:
+    """Collects one sample per page-object call"""
+
+    def __init__(self):
+        self.samples: List[dict] = []
+        self.current_test: Optional[str] = None
+        self._depth = 0
+
+    def record(self, page_class: str, method: str, selector: Optional[str], seconds: float, depth: int):
+        self.samples.append({
+            'test': self.current_test,
+            'page_class': page_class,
+            'method': method,
+            'selector': selector,
+            'seconds': seconds,
+            'depth': depth,  # 0 = called by the test, >0 = called by another page-object method
+        })
+
+    def aggregate(self) -> List[dict]:
+        """p50/p95/max per (page class, method, selector), slowest p95 first"""
+        groups: Dict[tuple, List[dict]] = defaultdict(list)
+        for sample in self.samples:
+            groups[(sample['page_class'], sample['method'], sample['selector'])].append(sample)
+        rows = []
+        for (page_class, method, selector), samples in groups.items():
+            seconds = [sample['seconds'] for sample in samples]
+            slowest = max(samples, key=lambda sample: sample['seconds'])
+            rows.append({
+                'page_class': page_class,
+                'method': method,
+                'selector': selector,
+                'count': len(seconds),
+                'total_ms': sum(seconds) * 1000,
+                'p50_ms': percentile(seconds, 50) * 1000,
+                'p95_ms': percentile(seconds, 95) * 1000,
+                'max_ms': max(seconds) * 1000,
+                'slowest_test': slowest['test'],
+            })
+        return sorted(rows, key=lambda row: row['p95_ms'], reverse=True)
+
+    def write_json(self, path: Path):
+        payload = {'steps': self.aggregate(), 'samples': self.samples}
+        Path(path).write_text(json.dumps(payload, indent=2))
+
+
+def shard_report_path(report_dir: Path, shard_id: int) -> Path:
+    """Where one shard of a --workers run writes its timings (next to its worker report)"""
+    return Path(report_dir) / f"action-timings-{shard_id}.json"
+
+
+def merge_reports(report_dir: Path, output: Path) -> Optional[ActionTimings]:
+    """Combine every shard's action-timings-*.json into one report; None if there were none"""
+    paths = sorted(Path(report_dir).glob("action-timings-*.json"))
+    if not paths:
+        return None
+    merged = ActionTimings()
+    for path in paths:
+        # Percentiles don't merge, so aggregate again from the raw samples
+        merged.samples.extend(json.loads(path.read_text())['samples'])
+    merged.write_json(output)
+    return merged
+
+
+def _selector_of(args) -> Optional[str]:
+    return args[0] if args and isinstance(args[0], str) else None
+
+
+def _timed(function: Callable, timings: ActionTimings) -> Callable:
+    """Wrap a sync or async page-object method so each call is recorded"""
+    name = function.__name__
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def async_wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await function(self, *args, **kwargs)
+            finally:
+                # Concurrent coroutines interleave, so nesting depth isn't tracked here
+                timings.record(type(self).__name__, name, _selector_of(args),
+                               time.perf_counter() - start, 0)
+        async_wrapper.__wrapped_by_timing__ = True
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        depth = timings._depth
+        timings._depth += 1
+        start = time.perf_counter()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            timings._depth = depth
+            timings.record(type(self).__name__, name, _selector_of(args),
+                           time.perf_counter() - start, depth)
+    wrapper.__wrapped_by_timing__ = True
+    return wrapper
+
+
+def _all_subclasses(cls) -> List[type]:
+    subclasses = []
+    for subclass in cls.__subclasses__():
+        subclasses.append(subclass)
+        subclasses.extend(_all_subclasses(subclass))
+    return subclasses
+
+
+def instrument(classes, timings: ActionTimings) -> Callable[[], None]:
+    """Wrap public methods defined on each class; returns a function that undoes it"""
+    originals = []
+    for cls in classes:
+        for name, member in list(vars(cls).items()):
+            if name.startswith('_') or name in UNTIMED_METHODS or not inspect.isfunction(member):
+                continue
+            if getattr(member, '__wrapped_by_timing__', False):
+                continue
+            originals.append((cls, name, member))
+            setattr(cls, name, _timed(member, timings))
+
+    def restore():
+        for cls, name, member in originals:
+            setattr(cls, name, member)
+    return restore
+
+
+def instrument_page_objects(timings: ActionTimings) -> Callable[[], None]:
+    """Instrument BasePage, AsyncBasePage and all their (imported) subclasses"""
+    from tests.pages import AsyncBasePage, BasePage
+    classes = [BasePage, *_all_subclasses(BasePage), AsyncBasePage, *_all_subclasses(AsyncBasePage)]
+    return instrument(classes, timings)
@@ -0,0 +1,170 @@
+"""
+Authenticated storage-state cache
+Logs in through the UI once per site and credential type, then hands the
+saved Playwright storage_state to every test that needs a logged-in user
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import config
+from tests.pages.practice_pages import PracticeLoginPage
+
+# The Internet / Sauce Demo have no page objects yet - keep their selectors here
+THE_INTERNET_SELECTORS = {
+    'username': '#username',
+    'password': '#password',
+    'submit': "button[type='submit']",
+}
+SAUCE_DEMO_SELECTORS = {
+    'username': '#user-name',
+    'password': '#password',
+    'submit': '#login-button',
+}
+
+# Credential type used when a test does not ask for a specific one
+DEFAULT_CREDENTIAL_TYPES = {
+    'practice': 'valid',
+    'sauce_demo': 'standard_user',
+    'the_internet': 'default',
+}
+
+
+def get_credentials(site: str, credential_type: str) -> Tuple[str, str]:
+    """Resolve (username, password) for a site through Config"""
+    if site == 'practice':
+        return config.get_practice_credentials(credential_type)
+    elif site == 'sauce_demo':
+        return config.get_sauce_demo_credentials(credential_type)
+    elif site == 'the_internet':
+        return config.get_the_internet_credentials()
+    else:
+        raise ValueError(f"Unknown site: {site}")
+
+
+def site_origin(site: str) -> str:
+    """scheme://host:port the site is served from (the live site or LOCAL_SITE_URL)"""
+    url = {
+        'practice': config.PRACTICE_BASE_URL,
+        'the_internet': config.THE_INTERNET_URL,
+        'sauce_demo': config.SAUCE_DEMO_URL,
+    }[site]
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def login_practice(page, username: str, password: str):
+    """Log in to Practice Test Automation through the page object"""
+    login_page = PracticeLoginPage(page)
+    login_page.navigate_to_login()
+    login_page.login_with_credentials(username, password)
+    page.wait_for_url("**/logged-in-successfully/")
+
+
+def login_the_internet(page, username: str, password: str):
+    """Log in to The Internet Heroku app"""
+    page.goto(f"{config.THE_INTERNET_URL}login")
+    page.fill(THE_INTERNET_SELECTORS['username'], username)
+    page.fill(THE_INTERNET_SELECTORS['password'], password)
+    page.click(THE_INTERNET_SELECTORS['submit'])
+    page.wait_for_url("**/secure")
+
+
+def login_sauce_demo(page, username: str, password: str):
+    """Log in to Sauce Demo"""
+    page.goto(config.SAUCE_DEMO_URL)
+    page.fill(SAUCE_DEMO_SELECTORS['username'], username)
+    page.fill(SAUCE_DEMO_SELECTORS['password'], password)
+    page.click(SAUCE_DEMO_SELECTORS['submit'])
+    page.wait_for_url("**/inventory.html")
+
+
+LOGIN_RECIPES: Dict[str, Callable] = {
+    'practice': login_practice,
+    'the_internet': login_the_internet,
+    'sauce_demo': login_sauce_demo,
+}
+
+
+class AuthStateCache:
+    """On-disk cache of storage_state files keyed by site, origin and credential type"""
+
+    def __init__(self, cache_dir: Path, ttl: int, login: Optional[Callable[[str, str, str, Path], None]] = None):
+        """
+        Args:
+            cache_dir: Directory holding the storage_state JSON files
+            ttl: Seconds a saved session stays valid before logging in again
+            login: Callable(site, username, password, state_path) that logs in
+                   and writes Playwright storage_state to state_path; without
+                   one, every get() that has to log in must pass login=
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.login = login
+        self.logins = 0
+        self.hits = 0
+
+    def state_path(self, site: str, credential_type: str) -> Path:
+        """Path of the storage_state file for a site/credential pair at the site's current origin
+
+        The origin is part of the key, so a session saved against the live site (or an
+        earlier local server on another port) is never restored against a different one.
+        """
+        origin = hashlib.sha1(site_origin(site).encode()).hexdigest()[:10]
+        return self.cache_dir / f"{site}-{origin}-{credential_type}.json"
+
+    def is_fresh(self, path: Path) -> bool:
+        """Check if a saved session exists and is younger than the TTL"""
+        try:
+            return time.time() - path.stat().st_mtime < self.ttl
+        except FileNotFoundError:
+            return False
+
+    def get(self, site: str = 'practice', credential_type: Optional[str] = None,
+            login: Optional[Callable[[str, str, str, Path], None]] = None) -> Path:
+        """Return a fresh storage_state path, logging in only when needed
+
+        login overrides the cache's login for this call (e.g. one that instruments the
+        login context like the calling test's own contexts).
+        """
+        if site not in DEFAULT_CREDENTIAL_TYPES:
+            raise ValueError(f"Unknown site: {site}")
+        credential_type = credential_type or DEFAULT_CREDENTIAL_TYPES[site]
+        path = self.state_path(site, credential_type)
+        if self.is_fresh(path):
+            self.hits += 1
+            return path
+
+        login = login or self.login
+        if login is None:
+            raise ValueError(f"No fresh session for {site}/{credential_type} and no login to create one")
+        username, password = get_credentials(site, credential_type)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so parallel readers never see a partial file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        login(site, username, password, tmp_path)
+        os.replace(tmp_path, path)
+        self.logins += 1
+        return path
+
+    def load(self, site: str = 'practice', credential_type: Optional[str] = None) -> dict:
+        """Return the cached storage_state as a dict"""
+        return json.loads(self.get(site, credential_type).read_text())
+
+    def invalidate(self, site: Optional[str] = None, credential_type: Optional[str] = None):
+        """Drop cached sessions (all of them, one site, or one site/credential pair)"""
+        if not self.cache_dir.exists():
+            return
+        if site and credential_type:
+            pattern = f"{site}-*-{credential_type}.json"
+        elif site:
+            pattern = f"{site}-*.json"
+        else:
+            pattern = "*.json"
+        for path in self.cache_dir.glob(pattern):
+            path.unlink(missing_ok=True)
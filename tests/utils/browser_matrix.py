@@ -0,0 +1,263 @@
+"""
+Cross-browser matrix: one shared browser server per engine, all engines at once
+
+Python Playwright has no BrowserType.launch_server(), so each engine's server
+is the driver's `launch-server` command (browserType.launchServer() in Node),
+started once per engine. Every pytest process for that engine connects to its
+ws endpoint with --browser-server instead of launching a browser of its own.
+The engines' runs (each optionally sharded over --workers-per-browser
+processes) execute concurrently, so the matrix takes about as long as the
+slowest engine instead of the sum. JUnit reports of every run are compared
+per test at the end and written to matrix.json. With --action-timing each
+engine's timings end up in <engine>-action-timings.json.
+
+Usage: python -m tests.utils.browser_matrix [--browsers chromium,firefox,webkit]
+                                            [--workers-per-browser 1] [--headed] [pytest args...]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tests.utils.action_timing import merge_reports
+
+ENGINES = ('chromium', 'firefox', 'webkit')
+DEFAULT_REPORT_DIR = Path(".matrix-reports")
+DEFAULT_TESTS = ["tests/test_practice_sites.py"]
+
+_ENGINE_IN_ID = re.compile(r"(?<=[\[-])(?:%s)(?=[\]-])" % "|".join(ENGINES))
+
+
+class BrowserServer:
+    """A `launch-server` driver process for one engine; ws_endpoint is known once started"""
+
+    def __init__(self, engine: str, headless: bool = True, log_path: Optional[Path] = None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown browser engine: {engine} (choose from {', '.join(ENGINES)})")
+        self.engine = engine
+        self.headless = headless
+        self.log_path = log_path
+        self.ws_endpoint: Optional[str] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._config_path: Optional[Path] = None
+
+    def start(self) -> 'BrowserServer':
+        # The driver's node process itself, so stopping it really stops the server
+        from playwright._impl._driver import compute_driver_executable, get_driver_env
+        node, cli = compute_driver_executable()
+        descriptor, config_path = tempfile.mkstemp(prefix=f"{self.engine}-server-", suffix=".json")
+        with os.fdopen(descriptor, "w") as config_file:
+            json.dump({"headless": self.headless}, config_file)
+        self._config_path = Path(config_path)
+        log = open(self.log_path, "w") if self.log_path else subprocess.DEVNULL
+        try:
+            self._process = subprocess.Popen(
+                [node, cli, "launch-server", "--browser", self.engine, "--config", config_path],
+                stdout=subprocess.PIPE, stderr=log, text=True, env=get_driver_env())
+        finally:
+            if self.log_path:
+                log.close()
+        # launchServer() prints the endpoint once the browser is up, or exits on failure
+        line = self._process.stdout.readline().strip()
+        if not line.startswith("ws://"):
+            self.stop()
+            output = (self.log_path.read_text() if self.log_path else line).splitlines() or ["no output"]
+            detail = next((text for text in output if text.startswith("Error")), output[-1])
+            raise RuntimeError(f"{self.engine} browser server failed to start: {detail}")
+        self.ws_endpoint = line
+        return self
+
+    def stop(self):
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()  # launchServer closes the browser on SIGTERM
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        if self._process is not None:
+            self._process.stdout.close()
+        if self._config_path is not None:
+            self._config_path.unlink(missing_ok=True)
+            self._config_path = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def matrix_key(classname: str, name: str) -> str:
+    """Test id without its engine, so one test lines up across engines"""
+    name = _ENGINE_IN_ID.sub("", name).replace("[-", "[").replace("-]", "]").replace("--", "-").replace("[]", "")
+    return f"{classname}::{name}"
+
+
+def parse_junit(path: Path) -> Dict[str, dict]:
+    """{matrix key: {'outcome', 'seconds'}} from one pytest --junitxml report"""
+    results = {}
+    for case in ElementTree.parse(path).getroot().iter("testcase"):
+        outcome = "passed"
+        for child, child_outcome in (("failure", "failed"), ("error", "error"), ("skipped", "skipped")):
+            if case.find(child) is not None:
+                outcome = child_outcome
+                break
+        results[matrix_key(case.get("classname", ""), case.get("name", ""))] = {
+            'outcome': outcome, 'seconds': float(case.get("time", 0)),
+        }
+    return results
+
+
+def compare(results: Dict[str, Dict[str, dict]], walls: Dict[str, float]) -> dict:
+    """Per-engine totals and per-test outcome/time across engines (largest time spread first)"""
+    engines = {}
+    for engine, tests in results.items():
+        outcomes = [test['outcome'] for test in tests.values()]
+        engines[engine] = {
+            'tests': len(tests),
+            **{outcome: outcomes.count(outcome) for outcome in ("passed", "failed", "error", "skipped")},
+            'test_seconds': sum(test['seconds'] for test in tests.values()),
+            'wall_seconds': walls.get(engine, 0.0),
+        }
+    keys = sorted({key for tests in results.values() for key in tests})
+    per_test = []
+    for key in keys:
+        row = {engine: results[engine].get(key) for engine in results}
+        seconds = [entry['seconds'] for entry in row.values() if entry]
+        outcomes = {entry['outcome'] for entry in row.values() if entry}
+        per_test.append({'test': key, 'engines': row, 'spread_seconds': max(seconds) - min(seconds),
+                         'consistent': len(outcomes) == 1 and all(row.values())})
+    per_test.sort(key=lambda test: (test['consistent'], -test['spread_seconds'], test['test']))
+    return {'engines': engines, 'tests': per_test}
+
+
+def format_comparison(comparison: dict) -> List[str]:
+    engines = comparison['engines']
+    serial = sum(engine['wall_seconds'] for engine in engines.values())
+    lines = [f"matrix wall time {comparison['wall_seconds']:.1f} s; "
+             f"sum of per-engine wall times {serial:.1f} s (about one engine after another)",
+             f"{'engine':<10} {'passed':>6} {'failed':>6} {'error':>6} {'skipped':>7} {'test s':>8} {'wall s':>8}"]
+    for name, engine in engines.items():
+        lines.append(f"{name:<10} {engine['passed']:>6} {engine['failed']:>6} {engine['error']:>6} "
+                     f"{engine['skipped']:>7} {engine['test_seconds']:>8.1f} {engine['wall_seconds']:>8.1f}")
+    lines.append("")
+    lines.append(f"{'test':<60} " + " ".join(f"{name:>16}" for name in engines))
+    for test in comparison['tests']:
+        cells = []
+        for name in engines:
+            entry = test['engines'][name]
+            cells.append(f"{entry['outcome']:>8} {entry['seconds']:>6.1f}s" if entry else f"{'missing':>16}")
+        marker = "" if test['consistent'] else "  ⚠️ differs"
+        lines.append(f"{test['test'][-60:]:<60} " + " ".join(cells) + marker)
+    return lines
+
+
+def pytest_commands(engine: str, ws_endpoint: str, pytest_args: List[str], report_dir: Path,
+                    workers: int) -> List[List[str]]:
+    """One pytest command per shard of this engine, all connecting to the same server"""
+    commands = []
+    for shard_id in range(workers):
+        command = [sys.executable, "-m", "pytest", *pytest_args, "--browser", engine,
+                   "--browser-server", ws_endpoint,
+                   "--junitxml", str(report_dir / f"{engine}-{shard_id}.xml"),
+                   "--action-timing-report", str(report_dir / f"{engine}-action-timings.json")]
+        if workers > 1:
+            command += ["--num-shards", str(workers), "--shard-id", str(shard_id),
+                        "--shard-report-dir", str(report_dir / engine)]
+        commands.append(command)
+    return commands
+
+
+def engine_exit_code(shard_codes: List[int]) -> int:
+    """1 if any shard failed, crashed or was killed (negative code), else 0
+
+    5 (nothing collected, e.g. more shards than tests) counts as success.
+    """
+    return 1 if any(code not in (0, 5) for code in shard_codes) else 0
+
+
+def run_matrix(engines: List[str], pytest_args: List[str], report_dir: Path, workers: int = 1,
+               headless: bool = True) -> dict:
+    """Start one server per engine, run every engine's pytest processes concurrently, compare"""
+    report_dir.mkdir(parents=True, exist_ok=True)
+    for stale in [*report_dir.glob("*.xml"), *report_dir.glob("**/*action-timings*.json")]:
+        stale.unlink()
+    servers = [BrowserServer(engine, headless, report_dir / f"{engine}-server.log") for engine in engines]
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(len(servers)) as pool:
+            list(pool.map(BrowserServer.start, servers))
+        processes = []
+        for server in servers:
+            for shard_id, command in enumerate(pytest_commands(server.engine, server.ws_endpoint, pytest_args,
+                                                               report_dir, workers)):
+                log = open(report_dir / f"{server.engine}-{shard_id}.log", "w")
+                processes.append((server.engine, subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT),
+                                  log))
+
+        def wait(entry):
+            engine, process, log = entry
+            code = process.wait()
+            log.close()
+            return engine, code, time.perf_counter() - start
+
+        walls: Dict[str, float] = {}
+        shard_codes: Dict[str, List[int]] = {engine: [] for engine in engines}
+        with ThreadPoolExecutor(max(len(processes), 1)) as pool:
+            for engine, code, elapsed in pool.map(wait, processes):
+                # An engine's wall time ends with its last shard
+                walls[engine] = max(walls.get(engine, 0.0), elapsed)
+                shard_codes[engine].append(code)
+        codes = {engine: engine_exit_code(shard_codes[engine]) for engine in engines}
+    finally:
+        for server in servers:
+            server.stop()
+    wall = time.perf_counter() - start
+
+    results: Dict[str, Dict[str, dict]] = {engine: {} for engine in engines}
+    for engine in engines:
+        if workers > 1:
+            # Shards write their --action-timing files next to their worker reports
+            merge_reports(report_dir / engine, report_dir / f"{engine}-action-timings.json")
+        for report in sorted(report_dir.glob(f"{engine}-*.xml")):
+            results[engine].update(parse_junit(report))
+    comparison = compare(results, walls)
+    comparison['wall_seconds'] = wall
+    comparison['exit_codes'] = codes
+    (report_dir / "matrix.json").write_text(json.dumps(comparison, indent=2))
+    return comparison
+
+
+def main(argv=None):
+    # No abbreviations: anything not ours is passed to pytest unchanged
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     allow_abbrev=False)
+    parser.add_argument("--browsers", default=",".join(ENGINES), help="Comma separated engines")
+    parser.add_argument("--workers-per-browser", type=int, default=1, help="pytest processes per engine")
+    parser.add_argument("--report-dir", type=Path, default=DEFAULT_REPORT_DIR)
+    parser.add_argument("--headed", action="store_true")
+    args, pytest_args = parser.parse_known_args(argv)
+    engines = [engine.strip() for engine in args.browsers.split(",") if engine.strip()]
+
+    print(f"🌐 {', '.join(engines)}: one browser server each, "
+          f"{args.workers_per_browser} pytest process(es) per engine")
+    comparison = run_matrix(engines, pytest_args or DEFAULT_TESTS, args.report_dir, args.workers_per_browser,
+                            headless=not args.headed)
+    for line in format_comparison(comparison):
+        print(f"  {line}")
+    print(f"Logs and matrix.json: {args.report_dir}")
+    return 1 if any(comparison['exit_codes'].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Pool of pre-warmed browser contexts
+Contexts are created up front and recycled between tests instead of paying
+browser.new_context() for every test. On release a context is reset (pages,
+cookies, storage, permissions, routes, headers) and then verified; a context
+that still carries state from the previous test is closed and replaced by a
+fresh one so leakage can't reach the next test. Changes reset() can't undo
+(init scripts, exposed bindings, geolocation, default timeouts, event
+listeners) are recorded as the test makes them and retire the context too.
+"""
+
+import time
+from collections import deque
+from functools import wraps
+from typing import Dict, List
+
+from playwright.sync_api import Browser, BrowserContext
+
+# Served for every origin while clearing its storage, so no real request is made
+_BLANK_PAGE = "<!DOCTYPE html><title>reset</title>"
+
+_CLEAR_STORAGE_SCRIPT = """
+async () => {
+    localStorage.clear();
+    sessionStorage.clear();
+    if (indexedDB.databases) {
+        for (const database of await indexedDB.databases()) indexedDB.deleteDatabase(database.name);
+    }
+}
+"""
+
+
+# Context methods whose effect reset() can't undo
+_UNDOABLE_CALLS = ('add_init_script', 'expose_binding', 'expose_function', 'set_geolocation',
+                   'set_default_timeout', 'set_default_navigation_timeout')
+_ADD_LISTENER_CALLS = ('on', 'once', 'add_listener')
+
+
+class ContextUsage:
+    """Records the calls on a pooled context that reset() can't undo
+
+    The context's methods are wrapped on the instance, so calls through
+    page.context (the same object) are seen too. Listeners count while they are
+    registered; one removed again with remove_listener() is harmless.
+    """
+
+    def __init__(self, context: BrowserContext):
+        self.calls: List[str] = []
+        self.listeners: List[tuple] = []
+        for name in _UNDOABLE_CALLS:
+            self._wrap(context, name, lambda *args, name=name: self.calls.append(name))
+        for name in _ADD_LISTENER_CALLS:
+            self._wrap(context, name, lambda event, handler, *args: self.listeners.append((event, handler)))
+        self._wrap(context, 'remove_listener', self._listener_removed)
+
+    @staticmethod
+    def _wrap(context, name, record):
+        method = getattr(context, name, None)
+        if method is None:
+            return
+
+        @wraps(method)
+        def tracked(*args, **kwargs):
+            record(*args)
+            return method(*args, **kwargs)
+        setattr(context, name, tracked)
+
+    def _listener_removed(self, event, handler, *args):
+        if (event, handler) in self.listeners:
+            self.listeners.remove((event, handler))
+
+    def problems(self) -> List[str]:
+        problems = [f"{name}()" for name in dict.fromkeys(self.calls)]
+        events = sorted({event for event, _ in self.listeners})
+        if events:
+            problems.append(f"{len(self.listeners)} listener(s) on {', '.join(events)}")
+        return problems
+
+
+class PoolStats:
+    """Hit rate and time spent creating vs resetting contexts"""
+
+    def __init__(self):
+        self.acquired = 0
+        self.hits = 0
+        self.fallbacks = 0
+        self.create_seconds: List[float] = []
+        self.reset_seconds: List[float] = []
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.acquired if self.acquired else 0.0
+
+    @property
+    def mean_create_ms(self) -> float:
+        return sum(self.create_seconds) / len(self.create_seconds) * 1000 if self.create_seconds else 0.0
+
+    @property
+    def mean_reset_ms(self) -> float:
+        return sum(self.reset_seconds) / len(self.reset_seconds) * 1000 if self.reset_seconds else 0.0
+
+    @property
+    def saved_per_hit_ms(self) -> float:
+        """Setup time a reused context saves over a new one"""
+        return self.mean_create_ms - self.mean_reset_ms
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            'acquired': self.acquired,
+            'hits': self.hits,
+            'hit_rate': self.hit_rate,
+            'fallbacks': self.fallbacks,
+            'mean_create_ms': self.mean_create_ms,
+            'mean_reset_ms': self.mean_reset_ms,
+            'saved_per_hit_ms': self.saved_per_hit_ms,
+            'saved_total_ms': self.saved_per_hit_ms * self.hits,
+        }
+
+
+class ContextPool:
+    """Hands out ready BrowserContexts and takes them back after each test"""
+
+    def __init__(self, browser: Browser, context_args: Dict, size: int = 2, verify: bool = True):
+        self.browser = browser
+        self.context_args = context_args
+        self.size = size
+        self.verify = verify
+        self.stats = PoolStats()
+        self._idle = deque()
+        self._usage: Dict[BrowserContext, ContextUsage] = {}
+
+    def _create(self) -> BrowserContext:
+        start = time.perf_counter()
+        context = self.browser.new_context(**self.context_args)
+        self.stats.create_seconds.append(time.perf_counter() - start)
+        self._usage[context] = ContextUsage(context)
+        return context
+
+    def _retire(self, context: BrowserContext):
+        self._usage.pop(context, None)
+        context.close()
+
+    def warm(self):
+        """Create contexts until the pool is full"""
+        while len(self._idle) < self.size:
+            self._idle.append(self._create())
+
+    def acquire(self) -> BrowserContext:
+        """Take an idle context, creating one if the pool ran dry"""
+        self.stats.acquired += 1
+        if self._idle:
+            self.stats.hits += 1
+            return self._idle.popleft()
+        return self._create()
+
+    def release(self, context: BrowserContext):
+        """Reset a context and put it back; close it if the pool is full or it still leaks state"""
+        if len(self._idle) >= self.size:
+            self._retire(context)
+            return
+        usage = self._usage.get(context)
+        if usage is not None and usage.problems():
+            # Nothing to reset: the test changed what reset() can't undo
+            self.stats.fallbacks += 1
+            self._retire(context)
+            self._idle.append(self._create())
+            return
+        start = time.perf_counter()
+        self.reset(context)
+        leaks = self.leaks(context) if self.verify else []
+        self.stats.reset_seconds.append(time.perf_counter() - start)
+        if leaks:
+            self.stats.fallbacks += 1
+            self._retire(context)
+            context = self._create()
+        self._idle.append(context)
+
+    def reset(self, context: BrowserContext):
+        """Clear per-test state so the next test starts clean"""
+        for page in context.pages:
+            page.close()
+        context.unroute_all(behavior="ignoreErrors")
+        context.clear_cookies()
+        context.clear_permissions()
+        context.set_extra_http_headers({})
+        context.set_offline(False)
+        self.clear_storage(context)
+
+    def clear_storage(self, context: BrowserContext):
+        """Clear localStorage/IndexedDB of every origin the last test wrote to"""
+        origins = [origin['origin'] for origin in context.storage_state()['origins']]
+        if not origins:
+            return
+        page = context.new_page()
+        page.route("**/*", lambda route: route.fulfill(body=_BLANK_PAGE, content_type="text/html"))
+        try:
+            for origin in origins:
+                page.goto(origin)
+                page.evaluate(_CLEAR_STORAGE_SCRIPT)
+        finally:
+            page.close()
+
+    def leaks(self, context: BrowserContext) -> List[str]:
+        """Describe state a reset context still carries (empty when clean)"""
+        usage = self._usage.get(context)
+        problems = usage.problems() if usage is not None else []
+        if context.pages:
+            problems.append(f"{len(context.pages)} open page(s)")
+        state = context.storage_state()
+        if state['cookies']:
+            problems.append(f"{len(state['cookies'])} cookie(s)")
+        for origin in state['origins']:
+            if origin.get('localStorage'):
+                problems.append(f"localStorage on {origin['origin']}")
+        return problems
+
+    def close(self):
+        while self._idle:
+            self._retire(self._idle.popleft())
@@ -0,0 +1,207 @@
+"""
+Per-test outcome and duration history for flaky-test detection
+
+Every attempt of every test (first run and reruns) is stored in a SQLite
+database together with the verdict of the test for that run:
+passed, flaky (failed, then passed on a rerun), broken (failed every attempt)
+or skipped. The median of recent passing durations is written back to the
+durations file sharding reads and drives longest-first ordering; the
+verdicts give per-test flake rates and the time lost to reruns.
+
+Usage: python -m tests.utils.flaky report [--runs 20]
+       python -m tests.utils.flaky durations   # after a parallel run, see run_tests.sh
+"""
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tests.utils.sharding import save_durations
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    worker TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    wasted REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_test ON attempts (nodeid, run_id);
+CREATE INDEX IF NOT EXISTS verdicts_by_test ON verdicts (nodeid, run_id);
+CREATE INDEX IF NOT EXISTS attempts_by_run ON attempts (run_id);
+CREATE INDEX IF NOT EXISTS verdicts_by_run ON verdicts (run_id);
+"""
+
+# Passing durations per test used for scheduling (most recent first)
+DURATION_SAMPLES = 5
+
+# Verdicts flake_rates() looks back on per test
+FLAKE_WINDOW = 20
+
+# Runs kept per test: the flake window plus some slack; with every --workers shard
+# recording a run of its own, a global run count would thin out each test's history
+HISTORY_RUNS = 30
+
+# (outcome, seconds) of one attempt
+Attempt = Tuple[str, float]
+
+
+def classify(outcomes: Sequence[str]) -> str:
+    """Verdict for one test from the outcomes of its attempts in one run"""
+    if outcomes[-1] == 'skipped':
+        return 'skipped'
+    if outcomes[-1] == 'passed':
+        return 'flaky' if 'failed' in outcomes else 'passed'
+    return 'broken'
+
+
+def wasted_seconds(attempts: Sequence[Attempt]) -> float:
+    """Time spent on attempts that didn't decide the result (every attempt but the last)"""
+    return sum(duration for _, duration in attempts[:-1])
+
+
+class OutcomeHistory:
+    """SQLite store of attempts and verdicts; safe to share between parallel workers"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Workers finish at about the same time; wait for each other's writes
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def record_run(self, results: Dict[str, List[Attempt]], worker: str = "main",
+                   keep_runs: int = HISTORY_RUNS) -> int:
+        """Store one run's attempts and verdicts in a single transaction; returns the run id
+
+        Each test keeps its latest keep_runs runs; older ones (and runs no test
+        refers to any more) are deleted in the same transaction.
+        """
+        with self.connection as connection:
+            run_id = connection.execute("INSERT INTO runs (started, worker) VALUES (?, ?)",
+                                        (time.time(), worker)).lastrowid
+            connection.executemany(
+                "INSERT INTO attempts VALUES (?, ?, ?, ?, ?)",
+                [(run_id, nodeid, number, outcome, duration)
+                 for nodeid, attempts in results.items()
+                 for number, (outcome, duration) in enumerate(attempts)])
+            connection.executemany(
+                "INSERT INTO verdicts VALUES (?, ?, ?, ?, ?)",
+                [(run_id, nodeid, classify([outcome for outcome, _ in attempts]), len(attempts),
+                  wasted_seconds(attempts))
+                 for nodeid, attempts in results.items()])
+            connection.execute(
+                "DELETE FROM verdicts WHERE rowid IN ("
+                "  SELECT rowid FROM ("
+                "    SELECT rowid, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY run_id DESC) AS age"
+                "    FROM verdicts"
+                "  ) WHERE age > ?)", (keep_runs,))
+            connection.execute(
+                "DELETE FROM attempts WHERE run_id < "
+                "(SELECT MIN(run_id) FROM verdicts WHERE verdicts.nodeid = attempts.nodeid)")
+            connection.execute("DELETE FROM runs WHERE id NOT IN (SELECT run_id FROM verdicts)")
+        return run_id
+
+    def durations(self, samples: int = DURATION_SAMPLES) -> Dict[str, float]:
+        """{nodeid: median of the latest passing attempts}, for scheduling"""
+        rows = self.connection.execute(
+            "SELECT nodeid, duration FROM ("
+            "  SELECT nodeid, duration, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY run_id DESC) AS age"
+            "  FROM attempts WHERE outcome = 'passed'"
+            ") WHERE age <= ?", (samples,))
+        recent: Dict[str, List[float]] = {}
+        for nodeid, duration in rows:
+            recent.setdefault(nodeid, []).append(duration)
+        return {nodeid: statistics.median(durations) for nodeid, durations in recent.items()}
+
+    def flake_rates(self, runs: int = FLAKE_WINDOW) -> Dict[str, dict]:
+        """Per test over its last `runs` verdicts: counts of each verdict and rerun time"""
+        rows = self.connection.execute(
+            "SELECT nodeid, verdict, wasted FROM ("
+            "  SELECT nodeid, verdict, wasted, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY run_id DESC) AS age"
+            "  FROM verdicts"
+            ") WHERE age <= ?", (runs,))
+        stats: Dict[str, dict] = {}
+        for nodeid, verdict, wasted in rows:
+            entry = stats.setdefault(nodeid, {'runs': 0, 'passed': 0, 'flaky': 0, 'broken': 0, 'skipped': 0,
+                                              'wasted': 0.0})
+            entry['runs'] += 1
+            entry[verdict] += 1
+            entry['wasted'] += wasted
+        for entry in stats.values():
+            judged = entry['runs'] - entry['skipped']
+            entry['flake_rate'] = entry['flaky'] / judged if judged else 0.0
+        return stats
+
+
+def feed_durations(history: OutcomeHistory, durations_file: Path) -> int:
+    """Overwrite the sharding durations with the history medians; returns how many tests"""
+    durations = history.durations()
+    if durations:
+        save_durations(durations_file, durations)
+    return len(durations)
+
+
+def format_report(stats: Dict[str, dict]) -> List[str]:
+    """Tests that were flaky or broken, most flaky first"""
+    rows = sorted(((nodeid, entry) for nodeid, entry in stats.items() if entry['flaky'] or entry['broken']),
+                  key=lambda row: (-row[1]['flake_rate'], -row[1]['broken'], row[0]))
+    if not rows:
+        return ["no flaky or broken tests in the history"]
+    lines = [f"{'flake rate':>10} {'flaky':>5} {'broken':>6} {'runs':>4} {'rerun s':>8}  test"]
+    for nodeid, entry in rows:
+        lines.append(f"{entry['flake_rate']:>10.0%} {entry['flaky']:>5} {entry['broken']:>6} {entry['runs']:>4} "
+                     f"{entry['wasted']:>8.1f}  {nodeid}")
+    return lines
+
+
+def main():
+    from config import config
+
+    parser = argparse.ArgumentParser(description="Flaky-test history")
+    parser.add_argument("command", choices=["report", "durations"])
+    parser.add_argument("--runs", type=int, default=FLAKE_WINDOW, help="Latest runs per test to consider")
+    parser.add_argument("--db", type=Path, default=None, help="History database (default TEST_HISTORY_DB)")
+    args = parser.parse_args()
+
+    history = OutcomeHistory(args.db or config.TEST_HISTORY_DB)
+    if args.command == "durations":
+        count = feed_durations(history, config.TEST_DURATIONS_FILE)
+        print(f"⏱️  {count} median durations from {history.path} -> {config.TEST_DURATIONS_FILE}")
+        return 0
+    print(f"📊 last {args.runs} runs per test from {history.path}")
+    for line in format_report(history.flake_rates(args.runs)):
+        print(f"  {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
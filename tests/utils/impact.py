@@ -0,0 +1,486 @@
+"""
+Test-impact selection: run only the tests a change can affect
+
+Every Python file in the project is split into symbols - module-level code,
+functions, classes, methods, class attributes (selectors) and attributes set
+through self.X = ... (Config settings). A test depends on the symbols its
+body, fixtures and everything they reference by name reach (static analysis,
+deliberately over-approximating) plus whatever it actually called in a run
+recorded with --impact-record (runtime coverage). Both are kept in
+.impact_map.json.
+
+Given a git diff, changed lines are mapped to the innermost symbol containing
+them and only tests depending on a changed symbol are selected. Tests missing
+from the map are always selected, and changes the map can't reason about
+(pyproject.toml, requirements.txt, unknown files) select everything.
+
+Usage:
+    python -m tests.utils.impact build                # static map -> .impact_map.json
+    python -m tests.utils.impact select origin/main   # print affected test ids
+"""
+
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+IMPACT_MAP_VERSION = 2
+ROOT = Path(__file__).resolve().parents[2]
+
+SKIPPED_DIRS = {'.git', 'venv', '.venv', 'node_modules', '__pycache__', 'recordings', 'screenshots', 'test-results'}
+# Changes to these never affect which tests pass
+IGNORED_SUFFIXES = ('.md', '.rst', '.example', '.code-workspace', '.sh')
+IGNORED_FILES = ('.gitignore', 'LICENSE')
+# Symbol name for a file's top-level code (imports, module statements)
+MODULE = '<module>'
+
+
+@dataclass
+class Symbol:
+    """A unit of code: where it is and which names it references"""
+
+    id: str
+    path: str
+    name: str
+    kind: str  # module | function | class | method | attribute
+    ranges: List[Tuple[int, int]] = field(default_factory=list)
+    refs: Set[str] = field(default_factory=set)
+    # Direct edges that aren't name references (class -> its __init__)
+    edges: Set[str] = field(default_factory=set)
+
+
+def _is_self_assignment(node: ast.AST) -> bool:
+    if not isinstance(node, (ast.Assign, ast.AnnAssign)):
+        return False
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    return any(isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+               and target.value.id == 'self' for target in targets)
+
+
+def _names(nodes: Iterable[ast.AST], skip_self_assignments: bool = False) -> Set[str]:
+    """Every Name id, Attribute attr and argument name under the nodes"""
+    names = set()
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if skip_self_assignments and _is_self_assignment(node):
+            continue  # indexed as an attribute symbol of its own
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        stack.extend(ast.iter_child_nodes(node))
+    return names
+
+
+def _span(node: ast.AST) -> Tuple[int, int]:
+    decorators = getattr(node, 'decorator_list', [])
+    start = min([node.lineno] + [decorator.lineno for decorator in decorators])
+    return start, node.end_lineno
+
+
+def _is_shared(path: str) -> bool:
+    """conftest.py and plugins apply to every test without being imported"""
+    return path.startswith('tests/plugins/') or Path(path).name == 'conftest.py'
+
+
+class SymbolIndex:
+    """All symbols of the project's Python files"""
+
+    def __init__(self, root: Path = ROOT):
+        self.root = Path(root)
+        self.symbols: Dict[str, Symbol] = {}
+        self.by_name: Dict[str, List[str]] = defaultdict(list)
+        self.by_path: Dict[str, List[str]] = defaultdict(list)
+        self.imports: Dict[str, Set[str]] = defaultdict(set)
+        self._visible: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def build(cls, root: Path = ROOT) -> 'SymbolIndex':
+        index = cls(root)
+        for path in sorted(project_files(root)):
+            index.add_file(path.relative_to(root).as_posix(), path.read_text())
+        return index
+
+    def _add(self, symbol: Symbol):
+        existing = self.symbols.get(symbol.id)
+        if existing:
+            # self.X assigned in several methods: one symbol, several ranges
+            existing.ranges.extend(symbol.ranges)
+            existing.refs |= symbol.refs
+            return
+        self.symbols[symbol.id] = symbol
+        self.by_name[symbol.name].append(symbol.id)
+        self.by_path[symbol.path].append(symbol.id)
+
+    def add_file(self, path: str, source: str):
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            tree = ast.Module(body=[], type_ignores=[])
+        self._visible.clear()
+        self.imports[path] = self._imported_files(path, tree)
+        module = Symbol(f"{path}::{MODULE}", path, MODULE, 'module', [(1, max(1, len(source.splitlines())))])
+        module_statements = []
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._add(Symbol(f"{path}::{node.name}", path, node.name, 'function', [_span(node)], _names([node])))
+            elif isinstance(node, ast.ClassDef):
+                self._add_class(path, node)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)) and self._targets(node):
+                for target in self._targets(node):
+                    self._add(Symbol(f"{path}::{target}", path, target, 'attribute', [_span(node)],
+                                     _names([node.value]) if node.value else set()))
+            else:
+                module_statements.append(node)
+        module.refs = _names(module_statements)
+        self._add(module)
+
+    def _module_file(self, module: str) -> Optional[str]:
+        base = module.replace('.', '/')
+        for candidate in (f"{base}.py", f"{base}/__init__.py"):
+            if (self.root / candidate).is_file():
+                return candidate
+        return None
+
+    def _imported_files(self, path: str, tree: ast.AST) -> Set[str]:
+        """Project files a file imports (anywhere in it, including lazy imports)"""
+        modules = []
+        package = path.rsplit('/', 1)[0].replace('/', '.') if '/' in path else ''
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ''
+                if node.level:
+                    parent = package.split('.')[:len(package.split('.')) - node.level + 1] if package else []
+                    base = '.'.join(part for part in parent + [base] if part)
+                modules.append(base)
+                # from package import submodule
+                modules.extend(f"{base}.{alias.name}" for alias in node.names)
+        return {file for file in map(self._module_file, filter(None, modules)) if file and file != path}
+
+    def visible(self, path: str) -> Set[str]:
+        """Files whose names a file can reach: itself, its transitive imports, conftest and plugins"""
+        if path not in self._visible:
+            seen = {path}
+            queue = deque([path])
+            while queue:
+                for imported in self.imports.get(queue.popleft(), ()):
+                    if imported not in seen:
+                        seen.add(imported)
+                        queue.append(imported)
+            seen.update(file for file in self.by_path if _is_shared(file))
+            self._visible[path] = seen
+        return self._visible[path]
+
+    @staticmethod
+    def _targets(node) -> List[str]:
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        return [target.id for target in targets if isinstance(target, ast.Name)]
+
+    def _add_class(self, path: str, node: ast.ClassDef):
+        class_id = f"{path}::{node.name}"
+        header = list(node.bases) + list(node.keywords) + list(node.decorator_list)
+        symbol = Symbol(class_id, path, node.name, 'class', [_span(node)], _names(header))
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                method_id = f"{class_id}.{item.name}"
+                self._add(Symbol(method_id, path, item.name, 'method', [_span(item)],
+                                 _names([item], skip_self_assignments=True)))
+                if item.name == '__init__':
+                    symbol.edges.add(method_id)
+                self._add_self_attributes(path, class_id, item)
+            elif isinstance(item, (ast.Assign, ast.AnnAssign)) and self._targets(item):
+                for target in self._targets(item):
+                    self._add(Symbol(f"{class_id}.{target}", path, target, 'attribute', [_span(item)],
+                                     _names([item.value]) if item.value else set()))
+        self._add(symbol)
+
+    def _add_self_attributes(self, path: str, class_id: str, method: ast.AST):
+        """self.X = ... statements become symbols of their own (e.g. each Config setting)"""
+        for node in ast.walk(method):
+            if not _is_self_assignment(node):
+                continue
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name):
+                    self._add(Symbol(f"{class_id}.{target.attr}", path, target.attr, 'attribute',
+                                     [_span(node)], _names([node.value]) if node.value else set()))
+
+    def symbol_at(self, path: str, line: int) -> Optional[str]:
+        """Innermost symbol containing a line of a file (module code if none)"""
+        best, best_size = None, None
+        for symbol_id in self.by_path.get(path, []):
+            for start, end in self.symbols[symbol_id].ranges:
+                size = end - start
+                if start <= line <= end and (best_size is None or size < best_size):
+                    best, best_size = symbol_id, size
+        return best
+
+    def function_at(self, path: str, line: int) -> Optional[str]:
+        """Innermost function/method whose definition starts at or contains a line"""
+        best, best_size = None, None
+        for symbol_id in self.by_path.get(path, []):
+            symbol = self.symbols[symbol_id]
+            if symbol.kind not in ('function', 'method'):
+                continue
+            for start, end in symbol.ranges:
+                if start <= line <= end and (best_size is None or end - start < best_size):
+                    best, best_size = symbol_id, end - start
+        return best
+
+    def resolve(self, path: str, name: str) -> List[str]:
+        """Symbols a name used in path can refer to"""
+        visible = self.visible(path)
+        return [symbol_id for symbol_id in self.by_name.get(name, ())
+                if self.symbols[symbol_id].path in visible]
+
+    def closure(self, start: Iterable[str]) -> Set[str]:
+        """Every symbol reachable from start through name references and edges"""
+        seen = set(start)
+        queue = deque(seen)
+        while queue:
+            symbol = self.symbols.get(queue.popleft())
+            # Module code is a dependency but not followed: its imports would reach everything
+            if symbol is None or symbol.kind == 'module':
+                continue
+            reached = set(symbol.edges) | {f"{symbol.path}::{MODULE}"}
+            for name in symbol.refs:
+                reached.update(self.resolve(symbol.path, name))
+            for symbol_id in reached - seen:
+                seen.add(symbol_id)
+                queue.append(symbol_id)
+        return seen
+
+
+def project_files(root: Path = ROOT) -> List[Path]:
+    files = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIPPED_DIRS and not name.startswith('.')]
+        files.extend(Path(directory) / name for name in filenames if name.endswith('.py'))
+    return files
+
+
+def is_test_file(path: str) -> bool:
+    return path.startswith('tests/') and Path(path).name.startswith('test_')
+
+
+def collect_tests(index: SymbolIndex) -> Dict[str, str]:
+    """{nodeid: symbol id} for every test function/method in test files"""
+    tests = {}
+    for symbol_id, symbol in index.symbols.items():
+        if not is_test_file(symbol.path) or not symbol.name.startswith('test'):
+            continue
+        qualname = symbol_id.split('::', 1)[1]
+        if symbol.kind == 'function':
+            tests[f"{symbol.path}::{qualname}"] = symbol_id
+        elif symbol.kind == 'method' and qualname.split('.')[0].startswith('Test'):
+            tests[f"{symbol.path}::{qualname.replace('.', '::')}"] = symbol_id
+    return tests
+
+
+def build_static_map(index: SymbolIndex) -> Dict[str, List[str]]:
+    """{nodeid: sorted symbols the test can reach}; conftest and plugin code applies to every test
+
+    pytest calls fixtures and hooks by name, so no test reaches them statically:
+    every symbol of a shared file, and whatever those reach, is a dependency of every test.
+    """
+    shared = index.closure(symbol_id for path, symbol_ids in index.by_path.items() if _is_shared(path)
+                           for symbol_id in symbol_ids)
+    static = {}
+    for nodeid, symbol_id in collect_tests(index).items():
+        static[nodeid] = sorted(index.closure([symbol_id]) | shared)
+    return static
+
+
+def base_nodeid(nodeid: str) -> str:
+    """Test id without the parametrization suffix"""
+    return re.sub(r'\[.*\]$', '', nodeid)
+
+
+class ImpactMap:
+    """Static + runtime dependencies per test, persisted as JSON"""
+
+    def __init__(self, static: Dict[str, List[str]] = None, runtime: Dict[str, List[str]] = None):
+        self.static = static or {}
+        self.runtime = runtime or {}
+
+    @classmethod
+    def load(cls, path: Path) -> 'ImpactMap':
+        try:
+            data = json.loads(Path(path).read_text())
+        except (FileNotFoundError, ValueError):
+            return cls()
+        if data.get('version') != IMPACT_MAP_VERSION:
+            return cls()
+        return cls(data.get('static'), data.get('runtime'))
+
+    def save(self, path: Path):
+        payload = {'version': IMPACT_MAP_VERSION, 'static': self.static, 'runtime': self.runtime}
+        Path(path).write_text(json.dumps(payload, indent=1, sort_keys=True))
+
+    def dependencies(self, nodeid: str) -> Optional[Set[str]]:
+        nodeid = base_nodeid(nodeid)
+        if nodeid not in self.static and nodeid not in self.runtime:
+            return None
+        return set(self.static.get(nodeid, ())) | set(self.runtime.get(nodeid, ()))
+
+
+@dataclass
+class ChangeSet:
+    """What a diff touched: symbols, whole files, or a reason to run everything"""
+
+    symbols: Set[str] = field(default_factory=set)
+    files: Set[str] = field(default_factory=set)
+    run_all: Optional[str] = None
+
+    def affects(self, dependencies: Set[str]) -> bool:
+        if dependencies & self.symbols:
+            return True
+        return any(dependency.split('::', 1)[0] in self.files for dependency in dependencies)
+
+
+_HUNK = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+def parse_diff(diff: str) -> Dict[str, List[Tuple[int, int]]]:
+    """{path: [(first, last) new-side lines]} from `git diff -U0`; deleted files map to []"""
+    changed: Dict[str, List[Tuple[int, int]]] = {}
+    path = None
+    old_path = None
+    for line in diff.splitlines():
+        if line.startswith('--- '):
+            old_path = line[6:] if line.startswith('--- a/') else None
+        elif line.startswith('+++ '):
+            path = line[6:] if line.startswith('+++ b/') else None
+            if path is None and old_path:
+                changed[old_path] = []  # deleted
+            elif path is not None:
+                changed.setdefault(path, [])
+        elif path and (match := _HUNK.match(line)):
+            start, count = int(match.group(1)), int(match.group(2) if match.group(2) is not None else 1)
+            # Pure deletions (count 0) are attributed to the line they were removed after
+            changed[path].append((max(start, 1), max(start, 1) + max(count, 1) - 1))
+    return changed
+
+
+def changes_from_diff(index: SymbolIndex, changed: Dict[str, List[Tuple[int, int]]],
+                      untracked: Iterable[str] = ()) -> ChangeSet:
+    changes = ChangeSet()
+    for path, ranges in changed.items():
+        if path.endswith(IGNORED_SUFFIXES) or Path(path).name in IGNORED_FILES:
+            continue
+        if not path.endswith('.py'):
+            changes.run_all = f"{path} changed"
+            continue
+        if not ranges or path not in index.by_path:
+            changes.files.add(path)  # deleted or unparsable: anything using the file
+            continue
+        for first, last in ranges:
+            for line in range(first, last + 1):
+                symbol = index.symbol_at(path, line)
+                if symbol is None or symbol.endswith(f"::{MODULE}"):
+                    changes.files.add(path)
+                else:
+                    changes.symbols.add(symbol)
+    for path in untracked:
+        if path.endswith('.py'):
+            changes.files.add(path)
+    return changes
+
+
+def git_changes(base: str, root: Path = ROOT,
+                head: Optional[str] = None) -> Tuple[Dict[str, List[Tuple[int, int]]], List[str]]:
+    """Changed lines since base (committed, staged and unstaged) plus untracked files, or base..head"""
+    diff = subprocess.run(['git', 'diff', '-U0', '--no-color', '--no-ext-diff', base, *([head] if head else [])],
+                          cwd=root, capture_output=True, text=True, check=True).stdout
+    if head:
+        return parse_diff(diff), []
+    untracked = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard'],
+                               cwd=root, capture_output=True, text=True, check=True).stdout.split()
+    return parse_diff(diff), untracked
+
+
+def select(impact_map: ImpactMap, nodeids: Iterable[str], changes: ChangeSet) -> List[str]:
+    """Tests affected by the changes; unknown tests are always included"""
+    if changes.run_all:
+        return list(nodeids)
+    selected = []
+    for nodeid in nodeids:
+        dependencies = impact_map.dependencies(nodeid)
+        if dependencies is None or changes.affects(dependencies):
+            selected.append(nodeid)
+    return selected
+
+
+class RuntimeRecorder:
+    """Records which project functions each test calls (sys.setprofile on call events)"""
+
+    def __init__(self, index: SymbolIndex):
+        self.index = index
+        self.root = str(index.root) + os.sep
+        self.current: Optional[Set[str]] = None
+        self.tests: Dict[str, List[str]] = {}
+        self._code_symbols: Dict[object, Optional[str]] = {}
+
+    def _profile(self, frame, event, arg):
+        if event != 'call':
+            return
+        code = frame.f_code
+        try:
+            symbol = self._code_symbols[code]
+        except KeyError:
+            symbol = None
+            if (code.co_filename.startswith(self.root) and 'site-packages' not in code.co_filename
+                    and code.co_filename != __file__):
+                path = code.co_filename[len(self.root):].replace(os.sep, '/')
+                symbol = self.index.function_at(path, code.co_firstlineno)
+            self._code_symbols[code] = symbol
+        if symbol is not None:
+            self.current.add(symbol)
+
+    def start(self):
+        self.current = set()
+        sys.setprofile(self._profile)
+
+    def stop(self, nodeid: str):
+        sys.setprofile(None)
+        if self.current is not None:
+            previous = set(self.tests.get(base_nodeid(nodeid), ()))
+            self.tests[base_nodeid(nodeid)] = sorted(previous | self.current)
+        self.current = None
+
+
+def main(argv: List[str]) -> int:
+    from config import config
+    if len(argv) >= 1 and argv[0] == 'build':
+        index = SymbolIndex.build()
+        impact_map = ImpactMap.load(config.IMPACT_MAP_FILE)
+        impact_map.static = build_static_map(index)
+        impact_map.save(config.IMPACT_MAP_FILE)
+        print(f"Mapped {len(impact_map.static)} tests to {len(index.symbols)} symbols -> {config.IMPACT_MAP_FILE}")
+        return 0
+    if len(argv) == 2 and argv[0] == 'select':
+        index = SymbolIndex.build()
+        impact_map = ImpactMap.load(config.IMPACT_MAP_FILE)
+        impact_map.static = build_static_map(index)
+        changes = changes_from_diff(index, *git_changes(argv[1]))
+        nodeids = sorted(set(impact_map.static) | set(impact_map.runtime))
+        for nodeid in select(impact_map, nodeids, changes):
+            print(nodeid)
+        return 0
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,268 @@
+"""
+Network interception: block third-party noise and serve static assets locally
+
+AssetCache stores response bodies content-addressed (sha256) on disk with an
+LRU size cap. NetworkInterceptor installs a context route that aborts blocked
+resource types/domains, answers cacheable GETs from the cache (or a recorded
+HAR) and only goes to the network on a miss.
+"""
+
+import hashlib
+import json
+import os
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+from urllib.parse import urlsplit
+
+from playwright.sync_api import BrowserContext, Route
+
+# Resource types worth caching between runs (documents and XHR stay live)
+CACHEABLE_RESOURCE_TYPES = ('stylesheet', 'script', 'image', 'font', 'media')
+
+# Response headers that no longer describe a decoded, re-served body
+HOP_BY_HOP_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+# route_from_har's own pattern (matches everything like "**/*"): its handler is internal,
+# so this distinct pattern is what lets uninstall() remove the HAR route and only that
+HAR_ROUTE_URL = "**"
+
+
+class CachedResponse:
+    """Status, headers and body of a cached asset"""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class AssetCache:
+    """Content-addressed asset cache with an LRU size cap
+
+    Parallel workers share one cache directory: save() merges this process's
+    changes into the index on disk instead of overwriting it.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.blob_dir = self.cache_dir / 'blobs'
+        self.index_path = self.cache_dir / 'index.json'
+        self.max_bytes = max_bytes
+        # URLs this process added/used or dropped since the last save
+        self._changed = set()
+        self._removed = set()
+        self._set_index(self._load_index())
+
+    def _load_index(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.index_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _set_index(self, index: Dict[str, dict]):
+        """Replace the index and recount blob references and distinct bytes"""
+        self.index: Dict[str, dict] = {}
+        self._refs: Dict[str, int] = {}
+        self._bytes = 0
+        for url, entry in index.items():
+            self._add(url, entry)
+
+    def _add(self, url: str, entry: dict):
+        if url in self.index:
+            self._remove(url)
+        self.index[url] = entry
+        digest = entry['sha256']
+        if digest not in self._refs:
+            self._refs[digest] = 0
+            self._bytes += entry['size']
+        self._refs[digest] += 1
+
+    def _remove(self, url: str) -> bool:
+        """Drop an index entry; True if it was the last reference to its blob"""
+        entry = self.index.pop(url)
+        digest = entry['sha256']
+        self._refs[digest] -= 1
+        if self._refs[digest]:
+            return False
+        del self._refs[digest]
+        self._bytes -= entry['size']
+        return True
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Cached response for a URL, or None (also when the blob went missing)"""
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        try:
+            body = self._blob_path(entry['sha256']).read_bytes()
+        except FileNotFoundError:
+            self._remove(url)
+            self._removed.add(url)
+            self._changed.discard(url)
+            return None
+        entry['last_used'] = time.time()
+        self._changed.add(url)
+        return CachedResponse(entry['status'], entry['headers'], body)
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """Store a response; identical bodies from different URLs share one blob"""
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(f"{digest}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, blob_path)
+        self._add(url, {
+            'sha256': digest,
+            'status': status,
+            'headers': {
+                name: value for name, value in headers.items()
+                if name.lower() not in HOP_BY_HOP_HEADERS
+            },
+            'size': len(body),
+            'last_used': time.time(),
+        })
+        self._changed.add(url)
+        self._removed.discard(url)
+        self.evict()
+
+    def total_bytes(self) -> int:
+        """Size of all distinct blobs referenced by the index"""
+        return self._bytes
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        if self._bytes <= self.max_bytes:
+            return
+        for url, entry in sorted(self.index.items(), key=lambda item: item[1]['last_used']):
+            if self._remove(url):
+                self._blob_path(entry['sha256']).unlink(missing_ok=True)
+            self._removed.add(url)
+            self._changed.discard(url)
+            if self._bytes <= self.max_bytes:
+                break
+
+    def save(self):
+        """Merge this process's changes into the index on disk (blobs are written as they arrive)
+
+        Other workers' entries are kept; for a URL both touched, the most recently used wins.
+        Eviction then runs over the merged index, so the cap holds for the shared cache.
+        """
+        merged = self._load_index()
+        for url in self._removed:
+            merged.pop(url, None)
+        for url in self._changed:
+            ours, theirs = self.index.get(url), merged.get(url)
+            if ours is not None and (theirs is None or ours['last_used'] >= theirs['last_used']):
+                merged[url] = ours
+        self._set_index(merged)
+        self._changed.clear()
+        self.evict()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f"index.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.index, indent=1, sort_keys=True))
+        os.replace(tmp_path, self.index_path)
+        self._removed.clear()
+
+
+class RouteStats:
+    """Per-test interception counters"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.blocked = 0
+        self.bytes_saved = 0
+
+    def add(self, other: 'RouteStats'):
+        self.hits += other.hits
+        self.misses += other.misses
+        self.blocked += other.blocked
+        self.bytes_saved += other.bytes_saved
+
+    def as_dict(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'blocked': self.blocked,
+            'bytes_saved': self.bytes_saved,
+        }
+
+
+def domain_matches(host: str, domains: Iterable[str]) -> bool:
+    """True if host is one of domains or a subdomain of one"""
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+class NetworkInterceptor:
+    """Routes every request of a context through block / cache / network"""
+
+    def __init__(self, cache: Optional[AssetCache] = None,
+                 blocked_resource_types: Sequence[str] = (),
+                 blocked_domains: Sequence[str] = (),
+                 har_path: Optional[Path] = None,
+                 cacheable_resource_types: Sequence[str] = CACHEABLE_RESOURCE_TYPES):
+        self.cache = cache
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.blocked_domains = tuple(blocked_domains)
+        self.har_path = har_path
+        self.cacheable_resource_types = set(cacheable_resource_types)
+        self.stats = RouteStats()
+        self._installed = weakref.WeakSet()
+
+    def install(self, context: BrowserContext):
+        """Attach the routes to a context (once per context)"""
+        if context in self._installed:
+            return
+        context.route("**/*", self.handle)
+        if self.har_path:
+            # Registered last so it runs first; unmatched requests fall back to handle()
+            context.route_from_har(self.har_path, url=HAR_ROUTE_URL, not_found="fallback")
+        self._installed.add(context)
+
+    def uninstall(self, context: BrowserContext):
+        """Detach from a context that goes back to the pool, so the next acquire re-installs"""
+        if context in self._installed:
+            context.unroute("**/*", self.handle)
+            if self.har_path:
+                context.unroute(HAR_ROUTE_URL)
+            self._installed.discard(context)
+
+    def is_blocked(self, url: str, resource_type: str) -> bool:
+        if resource_type in self.blocked_resource_types:
+            return True
+        return domain_matches(urlsplit(url).hostname or "", self.blocked_domains)
+
+    def handle(self, route: Route):
+        request = route.request
+        if self.is_blocked(request.url, request.resource_type):
+            self.stats.blocked += 1
+            route.abort("blockedbyclient")
+            return
+        if (self.cache is None or request.method != "GET"
+                or request.resource_type not in self.cacheable_resource_types):
+            route.fallback()
+            return
+
+        cached = self.cache.get(request.url)
+        if cached is not None:
+            self.stats.hits += 1
+            self.stats.bytes_saved += len(cached.body)
+            route.fulfill(status=cached.status, headers=cached.headers, body=cached.body)
+            return
+
+        self.stats.misses += 1
+        response = route.fetch()
+        body = response.body()
+        if response.status == 200 and 'no-store' not in response.headers.get('cache-control', ''):
+            self.cache.put(request.url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
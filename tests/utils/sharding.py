@@ -0,0 +1,148 @@
+"""
+Duration-based test sharding for parallel workers
+
+Tests are spread over shards with a longest-processing-time-first greedy
+split using durations from previous runs, so every worker gets roughly the
+same amount of work instead of the same number of tests.
+
+Usage (after a parallel run): python -m tests.utils.sharding report .shard-reports
+"""
+
+import heapq
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from tests.utils.action_timing import DEFAULT_REPORT as ACTION_TIMINGS_REPORT, merge_reports
+
+# Duration assumed for a test that has never run (and no history exists at all)
+DEFAULT_TEST_DURATION = 1.0
+
+
+def uses_browser(item) -> bool:
+    """True for a test that gets a browser (page, context, authenticated_page, ...)"""
+    return "browser" in getattr(item, "fixturenames", ())
+
+
+def load_durations(path: Path) -> Dict[str, float]:
+    """Load {nodeid: seconds} from a durations file, empty if missing or corrupt"""
+    try:
+        return json.loads(Path(path).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_durations(path: Path, durations: Dict[str, float]):
+    """Merge new durations into the durations file (newest measurement wins)"""
+    merged = load_durations(path)
+    merged.update(durations)
+    # Atomic, since concurrent runs (e.g. the browser matrix) may read it meanwhile
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(merged, indent=2, sort_keys=True))
+    os.replace(tmp_path, path)
+
+
+def partition_by_duration(nodeids: Iterable[str], durations: Dict[str, float],
+                          num_shards: int) -> List[List[str]]:
+    """Split tests into num_shards lists with balanced total duration"""
+    nodeids = list(nodeids)
+    known = [durations[nodeid] for nodeid in nodeids if nodeid in durations]
+    fallback = statistics.median(known) if known else DEFAULT_TEST_DURATION
+
+    # Longest first, nodeid as tie-breaker so every worker computes the same split
+    ordered = sorted(nodeids, key=lambda nodeid: (-durations.get(nodeid, fallback), nodeid))
+    shards: List[List[str]] = [[] for _ in range(num_shards)]
+    heap = [(0.0, shard_id) for shard_id in range(num_shards)]
+    for nodeid in ordered:
+        load, shard_id = heapq.heappop(heap)
+        shards[shard_id].append(nodeid)
+        heapq.heappush(heap, (load + durations.get(nodeid, fallback), shard_id))
+    return shards
+
+
+class WorkerStats:
+    """Busy/wall time bookkeeping for one worker process"""
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.started = time.time()
+        self.durations: Dict[str, float] = {}
+
+    def add(self, nodeid: str, seconds: float):
+        """Add the duration of one test phase (setup, call or teardown)"""
+        self.durations[nodeid] = self.durations.get(nodeid, 0.0) + seconds
+
+    def to_dict(self) -> dict:
+        wall = time.time() - self.started
+        busy = sum(self.durations.values())
+        return {
+            'worker_id': self.worker_id,
+            'tests': len(self.durations),
+            'wall_time': wall,
+            'busy_time': busy,
+            'utilisation': busy / wall if wall else 0.0,
+            'durations': self.durations,
+        }
+
+    def write(self, report_dir: Path):
+        report_dir = Path(report_dir)
+        report_dir.mkdir(parents=True, exist_ok=True)
+        path = report_dir / f"worker-{self.worker_id}.json"
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+
+
+def load_worker_reports(report_dir: Path) -> List[dict]:
+    """Read every worker-*.json in report_dir, ordered by worker id"""
+    reports = [json.loads(path.read_text()) for path in Path(report_dir).glob("worker-*.json")]
+    return sorted(reports, key=lambda report: report['worker_id'])
+
+
+def format_utilisation(reports: List[dict]) -> List[str]:
+    """Human-readable per-worker utilisation table plus load imbalance"""
+    if not reports:
+        return ["No worker reports found"]
+    lines = [f"{'worker':>6} {'tests':>6} {'busy s':>8} {'wall s':>8} {'util':>6}"]
+    for report in reports:
+        lines.append(
+            f"{report['worker_id']:>6} {report['tests']:>6} {report['busy_time']:>8.1f} "
+            f"{report['wall_time']:>8.1f} {report['utilisation']:>6.0%}"
+        )
+    busy = [report['busy_time'] for report in reports]
+    mean_busy = statistics.mean(busy)
+    imbalance = max(busy) / mean_busy if mean_busy else 1.0
+    lines.append(f"Load imbalance (max/mean busy): {imbalance:.2f}")
+    return lines
+
+
+def main():
+    """Merge worker durations into the history file and print utilisation"""
+    if len(sys.argv) < 3 or sys.argv[1] != "report":
+        print("Usage: python -m tests.utils.sharding report <report_dir> [durations_file]")
+        sys.exit(1)
+
+    from config import config
+    report_dir = Path(sys.argv[2])
+    durations_file = Path(sys.argv[3]) if len(sys.argv) > 3 else config.TEST_DURATIONS_FILE
+
+    reports = load_worker_reports(report_dir)
+    merged: Dict[str, float] = {}
+    for report in reports:
+        merged.update(report['durations'])
+    if merged:
+        save_durations(durations_file, merged)
+
+    print("\n📊 Per-worker utilisation:")
+    for line in format_utilisation(reports):
+        print(f"  {line}")
+
+    if merge_reports(report_dir, ACTION_TIMINGS_REPORT):
+        print(f"Action timings of all workers: {ACTION_TIMINGS_REPORT}")
+
+
+if __name__ == "__main__":
+    main()
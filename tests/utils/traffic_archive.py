@@ -0,0 +1,191 @@
+"""
+Per-test traffic archives for record/replay runs
+
+Layout (diffable JSON index per test, bodies shared and deduplicated):
+    recordings/
+        blobs/<sha256>                      response bodies, stored once
+        <test-slug>/traffic.json            ordered request/response index
+
+--record fetches every request from the network and appends it to the
+test's archive together with how long the server took; --replay answers every
+request from the archive in-process (after the recorded or a fixed delay, so
+timing is the same on every run) and collects anything that was never
+recorded so the test can fail clearly.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from playwright.sync_api import BrowserContext, Route
+
+ARCHIVE_VERSION = 2
+
+# Headers that change every run and would only add noise to archive diffs
+VOLATILE_HEADERS = ('date', 'age', 'expires', 'last-modified', 'etag', 'x-request-id',
+                    'cf-ray', 'server-timing', 'report-to', 'nel')
+HOP_BY_HOP_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+
+def archive_name(nodeid: str, browser_name: Optional[str] = None) -> str:
+    """Filesystem-safe archive directory name for a test node id
+
+    The browser id is dropped from the parametrization, so a recording made
+    with one engine is replayed by all of them.
+    """
+    if browser_name:
+        base, _, ids = nodeid.partition('[')
+        ids = '-'.join(part for part in ids.rstrip(']').split('-') if part != browser_name)
+        nodeid = f"{base}[{ids}]" if ids else base
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', nodeid).strip('-')
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def request_key(method: str, url: str, post_data: Optional[bytes]) -> Tuple[str, str, Optional[str]]:
+    """What a replayed request must match: method, full URL and body hash"""
+    return (method, url, sha256(post_data) if post_data else None)
+
+
+class TrafficArchive:
+    """Ordered request/response entries of one test plus the shared blob store"""
+
+    def __init__(self, root: Path, name: str):
+        self.root = Path(root)
+        self.name = name
+        self.path = self.root / name / 'traffic.json'
+        self.blob_dir = self.root / 'blobs'
+        self.entries: List[dict] = []
+
+    @classmethod
+    def load(cls, root: Path, name: str) -> 'TrafficArchive':
+        archive = cls(root, name)
+        try:
+            data = json.loads(archive.path.read_text())
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"No recording for '{name}' in {archive.root} - run once with --record"
+            ) from None
+        if data.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"{archive.path} has archive version {data.get('version')}, expected {ARCHIVE_VERSION}")
+        archive.entries = data['entries']
+        return archive
+
+    def add(self, method: str, url: str, post_data: Optional[bytes],
+            status: int, headers: Dict[str, str], body: bytes, elapsed_ms: int = 0):
+        digest = sha256(body)
+        blob_path = self.blob_dir / digest
+        if not blob_path.exists():
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(f"{digest}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, blob_path)
+        self.entries.append({
+            'method': method,
+            'url': url,
+            'post_data_sha256': sha256(post_data) if post_data else None,
+            'status': status,
+            'headers': {
+                name: value for name, value in sorted(headers.items())
+                if name.lower() not in VOLATILE_HEADERS + HOP_BY_HOP_HEADERS
+            },
+            'body_sha256': digest,
+            'elapsed_ms': elapsed_ms,
+        })
+
+    def body(self, entry: dict) -> bytes:
+        return (self.blob_dir / entry['body_sha256']).read_bytes()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'version': ARCHIVE_VERSION, 'entries': self.entries}
+        self.path.write_text(json.dumps(payload, indent=1, sort_keys=True) + "\n")
+
+    def responses_by_request(self) -> Dict[tuple, Deque[dict]]:
+        """Entries grouped by request key, in recorded order"""
+        table: Dict[tuple, Deque[dict]] = defaultdict(deque)
+        for entry in self.entries:
+            table[(entry['method'], entry['url'], entry['post_data_sha256'])].append(entry)
+        return table
+
+
+class TrafficRecorder:
+    """Fetches every request from the network and records it"""
+
+    def __init__(self, archive: TrafficArchive):
+        self.archive = archive
+
+    def install(self, context: BrowserContext):
+        context.route("**/*", self.handle)
+
+    def uninstall(self, context: BrowserContext):
+        context.unroute("**/*", self.handle)
+
+    def handle(self, route: Route):
+        request = route.request
+        # Keep redirects as separate entries so the browser sees the same URL changes on replay
+        started = time.perf_counter()
+        response = route.fetch(max_redirects=0)
+        body = response.body()
+        elapsed_ms = round((time.perf_counter() - started) * 1000)
+        self.archive.add(request.method, request.url, request.post_data_buffer,
+                         response.status, response.headers, body, elapsed_ms)
+        route.fulfill(response=response, body=body)
+
+    def finish(self):
+        self.archive.save()
+
+
+class TrafficReplayer:
+    """Answers requests from an archive; unknown requests are aborted and reported
+
+    latency_ms=None waits each entry's recorded elapsed_ms before answering,
+    a number waits that long for every response. Route handlers of the sync
+    API run one at a time, so delayed responses are served one after another.
+    """
+
+    def __init__(self, archive: TrafficArchive, latency_ms: Optional[float] = 0,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.archive = archive
+        self.latency_ms = latency_ms
+        self.sleep = sleep
+        self.responses = archive.responses_by_request()
+        self.unmatched: List[str] = []
+
+    def install(self, context: BrowserContext):
+        context.route("**/*", self.handle)
+
+    def uninstall(self, context: BrowserContext):
+        context.unroute("**/*", self.handle)
+
+    def handle(self, route: Route):
+        request = route.request
+        queue = self.responses.get(request_key(request.method, request.url, request.post_data_buffer))
+        if not queue:
+            self.unmatched.append(f"{request.method} {request.url}")
+            route.abort("internetdisconnected")
+            return
+        # Serve repeated requests in recorded order; the last response repeats
+        entry = queue.popleft() if len(queue) > 1 else queue[0]
+        delay_ms = entry['elapsed_ms'] if self.latency_ms is None else self.latency_ms
+        if delay_ms:
+            self.sleep(delay_ms / 1000)
+        route.fulfill(status=entry['status'], headers=entry['headers'], body=self.archive.body(entry))
+
+    def missing(self) -> Optional[str]:
+        """Why the test has to fail (requests not in the recording), or None"""
+        if not self.unmatched:
+            return None
+        listed = "\n  ".join(self.unmatched[:20])
+        return (f"{len(self.unmatched)} request(s) not found in recording '{self.archive.name}' "
+                f"(re-record with --record):\n  {listed}")
+
+    def finish(self):
+        """Nothing to save; missing() fails the test from its call report (record_replay plugin)"""